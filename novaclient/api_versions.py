@@ -12,11 +12,15 @@
 #    under the License.
 
 import functools
+import hashlib
+import json
 import logging
 import os
 import pkgutil
 import re
-import traceback
+import sys
+import threading
+import time
 import warnings
 
 from oslo_utils import strutils
@@ -35,8 +39,13 @@ HEADER_NAME = "OpenStack-API-Version"
 SERVICE_TYPE = "compute"
 # key is a deprecated version and value is an alternative version.
 DEPRECATED_VERSIONS = {"1.1": "2"}
+# how long the version range of an endpoint is cached, in seconds
+DEFAULT_VERSION_CACHE_TTL = 24 * 60 * 60
 
 _SUBSTITUTIONS = {}
+# NOTE: implementations of the versioned methods resolved per name and
+#       version by the wraps decorator, reset when a substitution is added
+_RESOLVED_SUBSTITUTIONS = {}
 
 _type_error_msg = _("'%(other)s' should be an instance of '%(cls)s'")
 
@@ -247,16 +256,133 @@ def get_api_version(version_string):
     return api_version
 
 
-def _get_server_version_range(client):
+class VersionCache(object):
+    """Cache of the microversion ranges supported by compute endpoints.
+
+    Ranges are kept in memory and, if ``cache_dir`` is set, in a file per
+    endpoint so that they are shared between processes. Ranges older than
+    ``ttl`` seconds are discovered again. Any object providing the ``get``,
+    ``set`` and ``invalidate`` methods can be used instead of this class.
+
+    :param ttl: lifetime of the cached ranges, in seconds
+    :param cache_dir: directory of the on-disk cache (optional)
+    """
+
+    def __init__(self, ttl=DEFAULT_VERSION_CACHE_TTL, cache_dir=None):
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+        self._ranges = {}
+        self._lock = threading.Lock()
+
+    def _path(self, endpoint):
+        filename = hashlib.md5(endpoint.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, filename)
+
+    def _load(self, endpoint):
+        try:
+            with open(self._path(endpoint)) as f:
+                data = json.load(f)
+            return data['timestamp'], data['min_version'], data['version']
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            # NOTE: a missing, unreadable or corrupted file is just a miss
+            return None
+
+    def get(self, endpoint):
+        """Returns the cached version range of an endpoint.
+
+        :param endpoint: URL of the compute endpoint
+        :returns: a tuple of min and max APIVersion, or None
+        """
+        with self._lock:
+            entry = self._ranges.get(endpoint)
+            if entry is None and self.cache_dir:
+                entry = self._load(endpoint)
+                if entry is not None:
+                    self._ranges[endpoint] = entry
+        if entry is None or not 0 <= time.time() - entry[0] < self.ttl:
+            return None
+        return APIVersion(entry[1]), APIVersion(entry[2])
+
+    def set(self, endpoint, min_version, max_version):
+        """Stores the version range of an endpoint.
+
+        :param endpoint: URL of the compute endpoint
+        :param min_version: minimum APIVersion supported by the endpoint
+        :param max_version: maximum APIVersion supported by the endpoint
+        """
+        entry = (time.time(),
+                 None if min_version.is_null() else min_version.get_string(),
+                 None if max_version.is_null() else max_version.get_string())
+        with self._lock:
+            self._ranges[endpoint] = entry
+            if not self.cache_dir:
+                return
+            try:
+                if not os.path.isdir(self.cache_dir):
+                    os.makedirs(self.cache_dir, 0o755)
+                path = self._path(endpoint)
+                tmp_path = "%s.%d.tmp" % (path, os.getpid())
+                with open(tmp_path, "w") as f:
+                    json.dump({"timestamp": entry[0],
+                               "min_version": entry[1],
+                               "version": entry[2]}, f)
+                getattr(os, 'replace', os.rename)(tmp_path, path)
+            except (IOError, OSError):
+                # NOTE: the in-process cache still works without the disk
+                pass
+
+    def invalidate(self, endpoint=None):
+        """Forgets the version range of an endpoint, or of all endpoints.
+
+        :param endpoint: URL of the compute endpoint (optional)
+        """
+        with self._lock:
+            if endpoint is None:
+                self._ranges.clear()
+                paths = []
+                if self.cache_dir and os.path.isdir(self.cache_dir):
+                    paths = [os.path.join(self.cache_dir, filename)
+                             for filename in os.listdir(self.cache_dir)]
+            else:
+                self._ranges.pop(endpoint, None)
+                paths = [self._path(endpoint)] if self.cache_dir else []
+            for path in paths:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+def _get_server_version_range(client, version_cache=None):
+    """Returns the minimum and maximum versions supported by the server.
+
+    The third item of the returned tuple tells whether the range comes from
+    ``version_cache`` rather than from the server.
+    """
+    endpoint = None
+    if version_cache is not None:
+        endpoint = client.client.get_endpoint()
+        if endpoint:
+            version_range = version_cache.get(endpoint)
+            if version_range is not None:
+                return version_range + (True,)
+
     version = client.versions.get_current()
 
     if not hasattr(version, 'version') or not version.version:
-        return APIVersion(), APIVersion()
+        version_range = APIVersion(), APIVersion()
+    else:
+        version_range = (APIVersion(version.min_version),
+                         APIVersion(version.version))
 
-    return APIVersion(version.min_version), APIVersion(version.version)
+    # NOTE: get_current() returns None if the versioned endpoint can not be
+    #       accessed, which may be temporary, so it is not cached.
+    if endpoint and version is not None:
+        version_cache.set(endpoint, *version_range)
+    return version_range + (False,)
 
 
-def discover_version(client, requested_version):
+def discover_version(client, requested_version, version_cache=None):
     """Discover most recent version supported by API and client.
 
     Checks ``requested_version`` and returns the most recent version
@@ -264,11 +390,29 @@ def discover_version(client, requested_version):
 
     :param client: client object
     :param requested_version: requested version represented by APIVersion obj
+    :param version_cache: :class:`VersionCache` storing the version ranges
+                          of the endpoints (optional)
     :returns: APIVersion
     """
-    server_start_version, server_end_version = _get_server_version_range(
-        client)
-
+    server_start_version, server_end_version, cached = (
+        _get_server_version_range(client, version_cache=version_cache))
+    try:
+        return _select_version(requested_version, server_start_version,
+                               server_end_version)
+    except exceptions.UnsupportedVersion:
+        if not cached:
+            raise
+        # NOTE: the cached range may be outdated, e.g. after an upgrade of
+        #       the server, so make sure the error is not based on it.
+        version_cache.invalidate(client.client.get_endpoint())
+        server_start_version, server_end_version, cached = (
+            _get_server_version_range(client, version_cache=version_cache))
+        return _select_version(requested_version, server_start_version,
+                               server_end_version)
+
+
+def _select_version(requested_version, server_start_version,
+                    server_end_version):
     if (not requested_version.is_latest() and
             requested_version != APIVersion('2.0')):
         if server_start_version.is_null() and server_end_version.is_null():
@@ -344,6 +488,7 @@ def check_headers(response, api_version):
 def _add_substitution(versioned_method):
     _SUBSTITUTIONS.setdefault(versioned_method.name, [])
     _SUBSTITUTIONS[versioned_method.name].append(versioned_method)
+    _RESOLVED_SUBSTITUTIONS.clear()
 
 
 def _get_function_name(func):
@@ -354,13 +499,15 @@ def _get_function_name(func):
     #    ("im_class" property does not exist at that moment)
     #  we need to write own logic to obtain the full function name which
     #  include module name, owner name(optional) and just function name.
-    filename, _lineno, _name, line = traceback.extract_stack()[-4]
-    module, _file_extension = os.path.splitext(filename)
-    module = module.replace("/", ".")
-    if module.endswith(func.__module__):
-        return "%s.[%s].%s" % (func.__module__, line, func.__name__)
-    else:
-        return "%s.%s" % (func.__module__, func.__name__)
+    qualname = getattr(func, "__qualname__", None)
+    if qualname is None:
+        # NOTE: Python 2 does not have __qualname__, but the code object of
+        #  the class body applying the decorator is named after the class.
+        owner = sys._getframe(2).f_code.co_name
+        qualname = func.__name__
+        if owner != "<module>":
+            qualname = "%s.%s" % (owner, qualname)
+    return "%s.%s" % (func.__module__, qualname)
 
 
 def get_substitutions(func_name, api_version=None):
@@ -374,9 +521,6 @@ def get_substitutions(func_name, api_version=None):
     return sorted(substitutions, key=lambda m: m.start_version)
 
 
-# FIXME(mriedem): This breaks any ManagerWithFind.list method that has a
-# 'detailed' kwarg since the ManagerWithFind.findall won't find the correct
-# argspec from the wrapped list method.
 def wraps(start_version, end_version=None):
     start_version = APIVersion(start_version)
     if end_version:
@@ -394,12 +538,20 @@ def wraps(start_version, end_version=None):
 
         @functools.wraps(func)
         def substitution(obj, *args, **kwargs):
-            methods = get_substitutions(name, obj.api_version)
-
-            if not methods:
-                raise exceptions.VersionNotFoundForAPIMethod(
-                    obj.api_version.get_string(), name)
-            return methods[-1].func(obj, *args, **kwargs)
+            api_version = obj.api_version
+            # NOTE: the resolved method is keyed by the version numbers, so
+            #       changing the api_version of a client resolves it again.
+            key = (name, api_version.ver_major, api_version.ver_minor)
+            try:
+                method = _RESOLVED_SUBSTITUTIONS[key]
+            except KeyError:
+                methods = get_substitutions(name, api_version)
+
+                if not methods:
+                    raise exceptions.VersionNotFoundForAPIMethod(
+                        api_version.get_string(), name)
+                method = _RESOLVED_SUBSTITUTIONS[key] = methods[-1].func
+            return method(obj, *args, **kwargs)
 
         # Let's share "arguments" with original method and substitution to
         # allow put cliutils.arg and wraps decorators in any order
@@ -412,6 +564,8 @@ def wraps(start_version, end_version=None):
         #   right versioned method method is used in several places, one object
         #   can have different names. Let's generate name of function one time
         #   and use __id__ property in all other places.
+        # NOTE: the name is now taken from the code object of the class body
+        #   rather than from a traceback, but it is still computed once.
         substitution.__id__ = name
 
         return substitution
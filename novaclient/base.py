@@ -20,6 +20,7 @@ Base utilities to build API operation managers and objects on top of.
 """
 
 import abc
+import collections
 import contextlib
 import copy
 import hashlib
@@ -28,9 +29,11 @@ import threading
 
 from oslo_utils import reflection
 from oslo_utils import strutils
+from oslo_utils import uuidutils
 from requests import Response
 import six
 
+from novaclient import api_versions
 from novaclient import exceptions
 from novaclient import utils
 
@@ -111,37 +114,52 @@ class RequestIdMixin(object):
         else:
             # If resp is of type string or None.
             request_id = resp
-        if request_id not in self.x_openstack_request_ids:
-            self.x_openstack_request_ids.append(request_id)
+        if request_id not in self.request_ids:
+            self.request_ids.append(request_id)
 
 
 class Resource(RequestIdMixin):
     """Base class for OpenStack resources (tenant, user, etc.).
 
     This is pretty much just a bag for attributes.
+
+    A resource created with ``compact=True`` keeps its attributes only in
+    ``_info`` instead of also copying them into the instance ``__dict__``,
+    which roughly halves the memory held by large listings. Attribute
+    access, ``to_dict()`` and comparisons behave the same in both layouts.
+    Resources which override ``_add_details`` to reshape ``info`` do not
+    support the compact layout.
     """
 
+    __slots__ = ('manager', '_info', '_loaded', '_compact',
+                 'x_openstack_request_ids')
+
     HUMAN_ID = False
     NAME_ATTR = 'name'
 
-    def __init__(self, manager, info, loaded=False, resp=None):
+    def __init__(self, manager, info, loaded=False, resp=None,
+                 compact=False):
         """Populate and bind to a manager.
 
         :param manager: BaseManager object
         :param info: dictionary representing resource attributes
         :param loaded: prevent lazy-loading if set to True
         :param resp: Response or list of Response objects
+        :param compact: keep the attributes only in ``info`` (optional)
         """
         self.manager = manager
         self._info = info
-        self._add_details(info)
+        self._compact = compact
+        if not compact:
+            self._add_details(info)
+            self.request_ids_setup()
         self._loaded = loaded
-        self.request_ids_setup()
         self.append_request_ids(resp)
 
     def __repr__(self):
+        keys = self._info.keys() if self._compact else self.__dict__.keys()
         reprkeys = sorted(k
-                          for k in self.__dict__.keys()
+                          for k in keys
                           if k[0] != '_' and
                           k not in ['manager', 'x_openstack_request_ids'])
         info = ", ".join("%s=%s" % (k, getattr(self, k)) for k in reprkeys)
@@ -161,7 +179,20 @@ class Resource(RequestIdMixin):
                 return strutils.to_slug(name)
         return None
 
+    @property
+    def request_ids(self):
+        try:
+            return self.x_openstack_request_ids
+        except AttributeError:
+            # NOTE: compact resources only allocate the list when needed
+            self.request_ids_setup()
+            return self.x_openstack_request_ids
+
     def _add_details(self, info):
+        if self._compact:
+            self._info.update(info)
+            return
+
         for (k, v) in info.items():
             try:
                 setattr(self, k, v)
@@ -171,16 +202,23 @@ class Resource(RequestIdMixin):
                 pass
 
     def __getattr__(self, k):
-        if k not in self.__dict__:
-            # NOTE(bcwaldon): disallow lazy-loading if already loaded once
-            if not self.is_loaded():
-                self.get()
-                return self.__getattr__(k)
-
+        if k in Resource.__slots__:
+            # NOTE: the slot has not been set yet, e.g. while unpickling
             raise AttributeError(k)
-        else:
+
+        if self._compact:
+            if k in self._info:
+                return self._info[k]
+        elif k in self.__dict__:
             return self.__dict__[k]
 
+        # NOTE(bcwaldon): disallow lazy-loading if already loaded once
+        if not self.is_loaded():
+            self.get()
+            return self.__getattr__(k)
+
+        raise AttributeError(k)
+
     def get(self):
         """Support for lazy loading details.
 
@@ -227,6 +265,48 @@ class Resource(RequestIdMixin):
         return copy.deepcopy(self._info)
 
 
+def _write_completion_cache(path, entries, mode, written=None):
+    entries = list(collections.OrderedDict.fromkeys(entries))
+    if written is not None:
+        # NOTE: the entries already written by a listing are kept in memory
+        # rather than read back from the file for each of its pages.
+        entries = [entry for entry in entries if entry not in written]
+        written.update(entries)
+    try:
+        if mode == "a":
+            if written is None and entries:
+                # NOTE: without the entries of a listing, the ones already
+                # cached are read back so that they are not appended again.
+                try:
+                    with open(path) as f:
+                        cached = set(f.read().splitlines())
+                except (IOError, OSError):
+                    cached = set()
+                entries = [entry for entry in entries if entry not in cached]
+            if not entries:
+                return
+            with open(path, "a") as f:
+                f.write("".join("%s\n" % entry for entry in entries))
+        else:
+            # NOTE: write a temporary file first, so that shell completion
+            # never reads a partially written cache.
+            tmp_path = "%s.%d.tmp" % (path, os.getpid())
+            with open(tmp_path, "w") as f:
+                f.write("".join("%s\n" % entry for entry in entries))
+            # NOTE: os.replace() also overwrites atomically on Windows, but
+            #       it is not available on Python 2.
+            getattr(os, 'replace', os.rename)(tmp_path, path)
+    except (IOError, OSError):
+        # NOTE(kiall): This is typically a permission denied while
+        #              attempting to write the cache file.
+        pass
+
+
+def _next_marker_by_id(data):
+    if data:
+        return data[-1]['id']
+
+
 class Manager(HookableMixin):
     """Manager for API service.
 
@@ -235,6 +315,10 @@ class Manager(HookableMixin):
     """
     resource_class = None
     cache_lock = threading.RLock()
+    _completion_cache_dir = None
+    # whether utils.find_resource() keeps the resources of the manager in the
+    # lookup cache of the client
+    cache_lookups = False
 
     def __init__(self, api):
         self.api = api
@@ -247,15 +331,18 @@ class Manager(HookableMixin):
     def api_version(self):
         return self.api.api_version
 
-    def _list(self, url, response_key, obj_class=None, body=None):
+    def _list(self, url, response_key, obj_class=None, body=None,
+              compact=False):
+        resp, data = self._fetch_list(url, response_key, body=body)
+        return self._build_list(resp, data, obj_class, compact=compact)
+
+    def _fetch_list(self, url, response_key, body=None):
+        """Fetch a listing and return the response with its raw items."""
         if body:
             resp, body = self.api.client.post(url, body=body)
         else:
             resp, body = self.api.client.get(url)
 
-        if obj_class is None:
-            obj_class = self.resource_class
-
         data = body[response_key]
         # NOTE(ja): keystone returns values as list as {'values': [ ... ]}
         #           unlike other services which just return the list...
@@ -264,12 +351,138 @@ class Manager(HookableMixin):
                 data = data['values']
             except KeyError:
                 pass
+        return resp, data
+
+    def _list_pages(self, url_for_marker, response_key, marker=None,
+                    prefetch=0, next_marker=None):
+        """Fetch a marker-paginated listing page by page.
+
+        Yields ``(resp, data)`` tuples holding the raw items of each page
+        until ``next_marker`` returns None for a page. The marker of the next
+        page is computed from the raw items, so it is known before the page
+        has been turned into resources. When ``prefetch`` is a positive
+        number the pages are requested by a background thread, which keeps
+        the request for the next page in flight while the caller processes
+        the current one and buffers at most ``prefetch`` pages ahead of it.
+
+        :param url_for_marker: callable returning the URL of the page that
+                               starts after the given marker
+        :param response_key: key of the items in the response body
+        :param marker: marker of the first page (optional)
+        :param prefetch: maximum number of pages fetched ahead (optional)
+        :param next_marker: callable returning the marker of the page that
+                            follows the given raw items, or None if there are
+                            no more pages. Defaults to the ``id`` of the last
+                            item, which stops at the first empty page
+                            (optional)
+        """
+        if next_marker is None:
+            next_marker = _next_marker_by_id
+
+        if not prefetch or prefetch < 0:
+            while True:
+                resp, data = self._fetch_list(url_for_marker(marker),
+                                              response_key)
+                yield resp, data
+                marker = next_marker(data)
+                if marker is None:
+                    return
+
+        pages = six.moves.queue.Queue(maxsize=prefetch)
+        stop = threading.Event()
+
+        def _fetch_pages(marker):
+            error = None
+            done = False
+            try:
+                while not stop.is_set():
+                    resp, data = self._fetch_list(url_for_marker(marker),
+                                                  response_key)
+                    marker = next_marker(data)
+                    pages.put((resp, data, marker, None))
+                    if marker is None:
+                        done = True
+                        return
+            except BaseException as e:
+                error = e
+            finally:
+                # NOTE: the consumer waits for the last page or an error, so
+                # one of them is always queued, even when the fetcher is
+                # stopped by a KeyboardInterrupt or a SystemExit.
+                if not done:
+                    pages.put((None, None, None, error))
+
+        fetcher = threading.Thread(target=_fetch_pages, args=(marker,))
+        fetcher.daemon = True
+        fetcher.start()
+        try:
+            while True:
+                resp, data, marker, error = pages.get()
+                if error is not None:
+                    raise error
+                yield resp, data
+                if marker is None:
+                    return
+        finally:
+            # NOTE: unblock a fetcher waiting for a free slot in the queue
+            # when the caller stops consuming pages early.
+            stop.set()
+            while fetcher.is_alive():
+                try:
+                    pages.get(timeout=0.1)
+                except six.moves.queue.Empty:
+                    pass
+
+    def _iter(self, url_for_marker, response_key, marker=None, obj_class=None,
+              prefetch=0, next_marker=None, compact=False, transform=None):
+        """Iterate over the resources of a marker-paginated listing.
+
+        Only the page being consumed is kept in memory. See
+        :meth:`_list_pages` for the meaning of the arguments. ``transform``
+        is an optional callable returning the raw items to turn into
+        resources from the raw items of a page, which it must not modify as
+        they are also passed to ``next_marker``.
+
+        :returns: :class:`IteratorWithMeta`
+        """
+        def _pages():
+            cache_mode = "w"
+            cache_entries = {}
+            with contextlib.closing(self._list_pages(
+                    url_for_marker, response_key, marker=marker,
+                    prefetch=prefetch, next_marker=next_marker)) as pages:
+                for resp, data in pages:
+                    if transform is not None:
+                        data = transform(data)
+                    yield self._build_list(resp, data, obj_class,
+                                           compact=compact,
+                                           cache_mode=cache_mode,
+                                           cache_entries=cache_entries)
+                    cache_mode = "a"
+
+        return IteratorWithMeta(_pages())
+
+    def _build_list(self, resp, data, obj_class=None, compact=False,
+                    cache_mode="w", cache_entries=None):
+        """Turn the raw items of a listing into a ``ListWithMeta``.
+
+        With ``compact`` the resources are built in the compact layout
+        described in :class:`Resource`. ``cache_mode`` is the mode used to
+        update the completion cache, "w" to replace its content or "a" for
+        the following pages of a listing. ``cache_entries`` is a dict kept
+        by a listing across its pages, holding the entries it has written.
+        """
+        if obj_class is None:
+            obj_class = self.resource_class
 
-        with self.completion_cache('human_id', obj_class, mode="w"):
-            with self.completion_cache('uuid', obj_class, mode="w"):
-                items = [obj_class(self, res, loaded=True)
-                         for res in data if res]
-                return ListWithMeta(items, resp)
+        data = [res for res in data if res]
+        self._update_completion_cache(obj_class, data, cache_mode,
+                                      cache_entries)
+        # NOTE: compact is only passed when set, so that the resource
+        # classes overriding __init__ without it can still be listed.
+        kwargs = {'compact': True} if compact else {}
+        items = [obj_class(self, res, loaded=True, **kwargs) for res in data]
+        return ListWithMeta(items, resp)
 
     @contextlib.contextmanager
     def alternate_service_type(self, default, allowed_types=()):
@@ -283,23 +496,16 @@ class Manager(HookableMixin):
             finally:
                 self.api.client.service_type = original_service_type
 
-    @contextlib.contextmanager
-    def completion_cache(self, cache_type, obj_class, mode):
-        """The completion cache for bash autocompletion.
-
-        The completion cache store items that can be used for bash
-        autocompletion, like UUIDs or human-friendly IDs.
-
-        A resource listing will clear and repopulate the cache.
-
-        A resource create will append to the cache.
+    def _completion_cache_path(self, cache_type, obj_class):
+        """Returns the path of a completion cache file.
 
-        Delete is not handled because listings are assumed to be performed
-        often enough to keep the cache reasonably up-to-date.
+        The cache directory is computed and created once per manager. None
+        is returned when the client has the completion cache disabled.
         """
-        # NOTE(wryan): This lock protects read and write access to the
-        # completion caches
-        with self.cache_lock:
+        if not getattr(self.api, 'completion_cache', True):
+            return None
+
+        if self._completion_cache_dir is None:
             base_dir = utils.env('NOVACLIENT_UUID_CACHE_DIR',
                                  default="~/.novaclient")
 
@@ -320,32 +526,80 @@ class Manager(HookableMixin):
                 #              directory already exists. Either way, don't
                 #              fail.
                 pass
+            self._completion_cache_dir = cache_dir
 
-            resource = obj_class.__name__.lower()
-            filename = "%s-%s-cache" % (resource, cache_type.replace('_', '-'))
-            path = os.path.join(cache_dir, filename)
+        resource = obj_class.__name__.lower()
+        filename = "%s-%s-cache" % (resource, cache_type.replace('_', '-'))
+        return os.path.join(self._completion_cache_dir, filename)
 
-            cache_attr = "_%s_cache" % cache_type
+    def _update_completion_cache(self, obj_class, data, mode,
+                                 cache_entries=None):
+        """Store the UUIDs and human-friendly IDs of raw resources.
 
-            try:
-                setattr(self, cache_attr, open(path, mode))
-            except IOError:
-                # NOTE(kiall): This is typically a permission denied while
-                #              attempting to write the cache file.
-                pass
+        Each cache file is updated with a single write: mode "w" atomically
+        replaces its content, mode "a" appends the entries. The entries
+        already in ``cache_entries``, the entries written by the previous
+        pages of a listing, are skipped. Without ``cache_entries``, the
+        entries already in the cache file are skipped.
+        """
+        caches = {'uuid': []}
+        if obj_class.HUMAN_ID:
+            caches['human_id'] = []
+
+        for info in data:
+            if uuidutils.is_uuid_like(info.get('id')):
+                caches['uuid'].append(info['id'])
+            if obj_class.HUMAN_ID:
+                name = info.get(obj_class.NAME_ATTR)
+                if name is not None:
+                    caches['human_id'].append(strutils.to_slug(name))
+
+        for cache_type, entries in caches.items():
+            if mode != "w" and not entries:
+                continue
+            path = self._completion_cache_path(cache_type, obj_class)
+            if path is not None:
+                written = None
+                if cache_entries is not None:
+                    written = cache_entries.setdefault(cache_type, set())
+                with self.cache_lock:
+                    _write_completion_cache(path, entries, mode, written)
 
+    @contextlib.contextmanager
+    def completion_cache(self, cache_type, obj_class, mode):
+        """The completion cache for bash autocompletion.
+
+        The completion cache store items that can be used for bash
+        autocompletion, like UUIDs or human-friendly IDs.
+
+        A resource listing will clear and repopulate the cache.
+
+        A resource create will append to the cache.
+
+        Delete is not handled because listings are assumed to be performed
+        often enough to keep the cache reasonably up-to-date.
+
+        The items passed to :meth:`write_to_completion_cache` are buffered
+        and written once the context is left.
+        """
+        # NOTE(wryan): This lock protects read and write access to the
+        # completion caches
+        with self.cache_lock:
+            cache_attr = "_%s_cache" % cache_type
+            setattr(self, cache_attr, [])
             try:
                 yield
             finally:
-                cache = getattr(self, cache_attr, None)
-                if cache:
-                    cache.close()
-                    delattr(self, cache_attr)
+                entries = getattr(self, cache_attr)
+                delattr(self, cache_attr)
+                path = self._completion_cache_path(cache_type, obj_class)
+                if path is not None:
+                    _write_completion_cache(path, entries, mode)
 
     def write_to_completion_cache(self, cache_type, val):
         cache = getattr(self, "_%s_cache" % cache_type, None)
-        if cache:
-            cache.write("%s\n" % val)
+        if cache is not None:
+            cache.append(val)
 
     def _get(self, url, response_key):
         resp, body = self.api.client.get(url)
@@ -362,17 +616,32 @@ class Manager(HookableMixin):
         if return_raw:
             return self.convert_into_with_meta(body[response_key], resp)
 
-        with self.completion_cache('human_id', self.resource_class, mode="a"):
-            with self.completion_cache('uuid', self.resource_class, mode="a"):
-                return self.resource_class(self, body[response_key], resp=resp)
+        self._update_completion_cache(self.resource_class,
+                                      [body[response_key]], "a")
+        return self.resource_class(self, body[response_key], resp=resp)
+
+    def _cached_lookup(self, name_or_id, find):
+        """Looks a resource up through the lookup cache of the client."""
+        cache = getattr(self.api, 'lookup_cache', None)
+        if not isinstance(cache, utils.LookupCache):
+            return find(name_or_id)
+        return cache.get_or_find(type(self).__name__, name_or_id, find)
+
+    def _invalidate_lookups(self):
+        """Drops the resources of this manager from the lookup cache."""
+        cache = getattr(self.api, 'lookup_cache', None)
+        if isinstance(cache, utils.LookupCache):
+            cache.invalidate(type(self).__name__)
 
     def _delete(self, url):
         resp, body = self.api.client.delete(url)
+        self._invalidate_lookups()
         return self.convert_into_with_meta(body, resp)
 
     def _update(self, url, body, response_key=None, **kwargs):
         self.run_hooks('modify_body_for_update', body, **kwargs)
         resp, body = self.api.client.put(url, body=body)
+        self._invalidate_lookups()
         if body:
             if response_key:
                 return self.resource_class(self, body[response_key], resp=resp)
@@ -399,14 +668,50 @@ class Manager(HookableMixin):
             return DictWithMeta(item, resp)
 
 
+# The arguments of the list methods of the managers, keyed by function (see
+# ManagerWithFind._list_args)
+_LIST_ARGS = {}
+
+
 @six.add_metaclass(abc.ABCMeta)
 class ManagerWithFind(Manager):
     """Like a `Manager`, but with additional `find()`/`findall()` methods."""
 
+    # Maps the attributes findall() can match to the filters of list(): the
+    # keys of its search_opts if it has some, its arguments otherwise. The
+    # results are still matched client side, since a filter may be broader
+    # than the match (e.g. a regex on the name). A None value disables the
+    # filter and is not matched.
+    find_filters = {}
+    # findall() arguments which are only passed to list() as filters, they
+    # are not attributes of the resources
+    find_options = ()
+
     @abc.abstractmethod
     def list(self):
         pass
 
+    def _list_args(self):
+        """Returns the names of the arguments of the list method.
+
+        They are cached per method, inspecting the definition used with the
+        API version of the client when list is versioned.
+        """
+        func = getattr(self.list, '__func__', self.list)
+        name = getattr(func, '__id__', None)
+        if name is not None:
+            # the signature of a versioned method is the one of its last
+            # definition, not the one used with the API version of the client
+            methods = api_versions.get_substitutions(name, self.api_version)
+            if methods:
+                func = methods[-1].func
+        try:
+            return _LIST_ARGS[func]
+        except KeyError:
+            args = _LIST_ARGS[func] = frozenset(
+                reflection.get_callable_args(func))
+            return args
+
     def find(self, **kwargs):
         """Find a single item with attributes matching ``**kwargs``."""
         matches = self.findall(**kwargs)
@@ -421,49 +726,44 @@ class ManagerWithFind(Manager):
             return matches[0]
 
     def findall(self, **kwargs):
-        """Find all items with attributes matching ``**kwargs``."""
+        """Find all items with attributes matching ``**kwargs``.
+
+        The attributes in ``find_filters`` are filtered server side, the
+        items are then matched client side in a single pass over the
+        listing.
+        """
         found = ListWithMeta([], None)
-        searches = kwargs.items()
+        list_args = self._list_args()
 
         detailed = True
         list_kwargs = {}
-
-        list_argspec = reflection.get_callable_args(self.list)
-        if 'detailed' in list_argspec:
+        if 'detailed' in list_args:
             detailed = ("human_id" not in kwargs and
                         "name" not in kwargs and
                         "display_name" not in kwargs)
             list_kwargs['detailed'] = detailed
 
-        if 'is_public' in list_argspec and 'is_public' in kwargs:
-            is_public = kwargs['is_public']
-            list_kwargs['is_public'] = is_public
-            if is_public is None:
-                tmp_kwargs = kwargs.copy()
-                del tmp_kwargs['is_public']
-                searches = tmp_kwargs.items()
-
-        if 'search_opts' in list_argspec:
-            # pass search_opts in to do server side based filtering.
-            # TODO(jogo) not all search_opts support regex, find way to
-            # identify when to use regex and when to use string matching.
-            # volumes does not support regex while servers does. So when
-            # doing findall on servers some client side filtering is still
-            # needed.
-            if "human_id" in kwargs:
-                list_kwargs['search_opts'] = {"name": kwargs["human_id"]}
-            elif "name" in kwargs:
-                list_kwargs['search_opts'] = {"name": kwargs["name"]}
-            elif "display_name" in kwargs:
-                list_kwargs['search_opts'] = {"name": kwargs["display_name"]}
-            if "all_tenants" in kwargs:
-                all_tenants = kwargs['all_tenants']
-                list_kwargs['search_opts']['all_tenants'] = all_tenants
-                searches = [(k, v) for k, v in searches if k != 'all_tenants']
-            if "deleted" in kwargs:
-                deleted = kwargs['deleted']
-                list_kwargs['search_opts']['deleted'] = deleted
-                searches = [(k, v) for k, v in searches if k != 'deleted']
+        filters = {}
+        searches = []
+        for attr, value in kwargs.items():
+            if attr in self.find_filters:
+                filters[self.find_filters[attr]] = value
+                if value is None:
+                    continue
+            if attr not in self.find_options:
+                searches.append((attr, value))
+        for attr in self.find_options:
+            if attr in kwargs:
+                filters[attr] = kwargs[attr]
+
+        if 'search_opts' in list_args:
+            filters = dict((k, v) for k, v in filters.items()
+                           if v is not None)
+            if filters:
+                list_kwargs['search_opts'] = filters
+        else:
+            list_kwargs.update((k, v) for k, v in filters.items()
+                               if k in list_args)
 
         listing = self.list(**list_kwargs)
         found.append_request_ids(listing.request_ids)
@@ -472,17 +772,36 @@ class ManagerWithFind(Manager):
             try:
                 if all(getattr(obj, attr) == value
                         for (attr, value) in searches):
-                    if detailed:
-                        found.append(obj)
-                    else:
-                        detail = self.get(obj.id)
-                        found.append(detail)
-                        found.append_request_ids(detail.request_ids)
+                    found.append(obj)
             except AttributeError:
                 continue
 
+        if not detailed and found:
+            self._get_details(found, list_kwargs)
+
         return found
 
+    def _get_details(self, found, list_kwargs):
+        """Replaces the items of a summary listing by their details.
+
+        A single item is fetched by ID. Several are taken from a detailed
+        listing with the same filters, rather than fetched one by one.
+        """
+        details = {}
+        if len(found) > 1:
+            list_kwargs = dict(list_kwargs, detailed=True)
+            listing = self.list(**list_kwargs)
+            found.append_request_ids(listing.request_ids)
+            details = dict((obj.id, obj) for obj in listing)
+
+        for i, obj in enumerate(found):
+            detail = details.get(obj.id)
+            if detail is None:
+                # a single match, or one missing from the detailed listing
+                detail = self.get(obj.id)
+                found.append_request_ids(detail.request_ids)
+            found[i] = detail
+
 
 class BootingManagerWithFind(ManagerWithFind):
     """Like a `ManagerWithFind`, but has the ability to boot servers."""
@@ -529,6 +848,37 @@ class ListWithMeta(list, RequestIdMixin):
         self.append_request_ids(resp)
 
 
+class IteratorWithMeta(RequestIdMixin):
+    """Iterator over the resources of a listing fetched page by page.
+
+    The request ids of the pages are collected as the pages are consumed.
+    """
+    def __init__(self, pages):
+        self.request_ids_setup()
+        self._pages = iter(pages)
+        self._items = iter(())
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while True:
+            try:
+                return next(self._items)
+            except StopIteration:
+                page = next(self._pages)
+                self.append_request_ids(page.request_ids)
+                self._items = iter(page)
+
+    next = __next__
+
+    def close(self):
+        """Stop the iteration and release the remaining pages."""
+        close = getattr(self._pages, 'close', None)
+        if close:
+            close()
+
+
 class DictWithMeta(dict, RequestIdMixin):
     def __init__(self, values, resp):
         super(DictWithMeta, self).__init__(values)
@@ -21,14 +21,28 @@ OpenStack Client interface. Handles the REST calls and responses.
 """
 
 import itertools
+import json
+import os
 import pkgutil
+import sys
+import threading
+import time
 import warnings
 
 from keystoneauth1 import adapter
+from keystoneauth1 import exceptions as ksa_exceptions
 from keystoneauth1 import identity
 from keystoneauth1 import session as ksession
 from oslo_utils import importutils
-import pkg_resources
+import requests
+import six
+
+try:
+    from importlib import metadata as importlib_metadata
+except ImportError:
+    # NOTE: importlib.metadata is only available with python 3.8+,
+    # pkg_resources (which is slow to import) is used otherwise.
+    importlib_metadata = None
 
 from novaclient import api_versions
 from novaclient import exceptions
@@ -55,26 +69,142 @@ def _log_request_id(logger, resp, service_name):
                       'response_request_id': request_id})
 
 
+def _get_retry_after(resp):
+    """Returns the Retry-After delay of a response in seconds, or 0."""
+    try:
+        return max(0, int(resp.headers.get('retry-after')))
+    except (TypeError, ValueError):
+        return 0
+
+
 class SessionClient(adapter.LegacyJsonAdapter):
 
+    # methods which can be sent again without side effects
+    IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+    # responses of an API worker or proxy in trouble, worth a retry
+    RETRY_STATUS_CODES = (502, 503, 504)
+    # the retries of a client are capped to 10% of its requests, plus a
+    # reserve of 10 retries, so that a struggling API is not flooded
+    RETRY_BUDGET_RATIO = 0.1
+    RETRY_BUDGET_RESERVE = 10
+
     def __init__(self, *args, **kwargs):
         self.times = []
         self.timings = kwargs.pop('timings', False)
         self.api_version = kwargs.pop('api_version', None)
         self.api_version = self.api_version or api_versions.APIVersion()
+        rate_limit = kwargs.pop('rate_limit', None)
+        if rate_limit and not isinstance(rate_limit, utils.TokenBucket):
+            rate_limit = utils.TokenBucket(rate_limit)
+        self.rate_limiter = rate_limit
+        self.rate_limit_retries = kwargs.pop('rate_limit_retries', 0)
+        self.retries = kwargs.pop('retries', 0)
+        self._retry_budget = self.RETRY_BUDGET_RESERVE
+        self._retry_budget_lock = threading.Lock()
+        self._throttling_lock = threading.Lock()
+        self.reset_throttling()
         super(SessionClient, self).__init__(*args, **kwargs)
 
+    def _may_retry(self, method, retries):
+        """Whether a failed request can be retried, taking from the budget."""
+        if method.upper() not in self.IDEMPOTENT_METHODS:
+            return False
+        if retries >= self.retries:
+            return False
+        with self._retry_budget_lock:
+            if self._retry_budget < 1:
+                return False
+            self._retry_budget -= 1
+            return True
+
+    def _log_retry(self, reason, method, url, delay):
+        if self.logger:
+            self.logger.debug('%(method)s %(url)s failed (%(reason)s), '
+                              'retrying in %(delay).1f seconds',
+                              {'method': method, 'url': url,
+                               'reason': reason, 'delay': delay})
+
+    def _send(self, url, method, **kwargs):
+        """Sends a request, retrying it when allowed.
+
+        The requests wait for the client-side rate limiter, requests refused
+        by the rate limits of the API are retried after the delay it asks
+        for, and idempotent requests are retried with an exponential backoff
+        after a connection error or a 502, 503 or 504 response. The
+        Retry-After delay of these responses is capped to the maximum period
+        of the backoff.
+        """
+        if self.retries:
+            with self._retry_budget_lock:
+                self._retry_budget = min(
+                    self._retry_budget + self.RETRY_BUDGET_RATIO,
+                    self.RETRY_BUDGET_RESERVE)
+
+        backoff = utils.Backoff()
+        attempt = 0
+        rate_limited = 0
+        retries = 0
+        while True:
+            if self.rate_limiter:
+                delay = self.rate_limiter.acquire()
+                if delay:
+                    self._count_throttling('delayed', 'delay', delay)
+
+            attempt += 1
+            label = [method, url]
+            if attempt > 1:
+                label.append('(attempt %d)' % attempt)
+            try:
+                with utils.record_time(self.times, self.timings, *label):
+                    resp, body = super(SessionClient, self).request(
+                        url, method, raise_exc=False, **kwargs)
+            except ksa_exceptions.RetriableConnectionFailure as e:
+                if not self._may_retry(method, retries):
+                    raise
+                retries += 1
+                delay = backoff.next_period()
+                self._log_retry(e, method, url, delay)
+                time.sleep(delay)
+                continue
+
+            if resp.status_code in self.RETRY_STATUS_CODES:
+                if not self._may_retry(method, retries):
+                    return resp, body
+                retries += 1
+                # NOTE: a retry is only worth it if it comes soon, so the
+                #       Retry-After of the API is capped like the backoff.
+                delay = (min(_get_retry_after(resp), backoff.max_period) or
+                         backoff.next_period())
+                self._log_retry(resp.status_code, method, url, delay)
+                time.sleep(delay)
+                continue
+
+            if (resp.status_code not in (413, 429) or
+                    rate_limited >= self.rate_limit_retries):
+                return resp, body
+            retry_after = _get_retry_after(resp)
+            # a 413 without Retry-After is an exceeded quota, which retrying
+            # will not fix
+            if not retry_after and resp.status_code == 413:
+                return resp, body
+
+            delay = retry_after or backoff.next_period()
+            self._log_retry(resp.status_code, method, url, delay)
+            self._count_throttling('retried', 'retry_delay', delay)
+            if self.rate_limiter:
+                # the other threads sharing the client have to wait too
+                self.rate_limiter.hold(delay)
+            else:
+                time.sleep(delay)
+            rate_limited += 1
+
     def request(self, url, method, **kwargs):
         kwargs.setdefault('headers', kwargs.get('headers', {}))
         api_versions.update_headers(kwargs["headers"], self.api_version)
         # NOTE(jamielennox): The standard call raises errors from
         # keystoneauth1, where we need to raise the novaclient errors.
         raise_exc = kwargs.pop('raise_exc', True)
-        with utils.record_time(self.times, self.timings, method, url):
-            resp, body = super(SessionClient, self).request(url,
-                                                            method,
-                                                            raise_exc=False,
-                                                            **kwargs)
+        resp, body = self._send(url, method, **kwargs)
 
         # if service name is None then use service_type for logging
         service = self.service_name or self.service_type
@@ -94,6 +224,38 @@ class SessionClient(adapter.LegacyJsonAdapter):
     def reset_timings(self):
         self.times = []
 
+    def get_throttling(self):
+        """Returns the counters of the requests slowed down by rate limits.
+
+        ``delayed`` requests waited ``delay`` seconds in total for the
+        client-side rate limiter, and ``retried`` requests were refused by
+        the API then retried after ``retry_delay`` seconds in total.
+        """
+        with self._throttling_lock:
+            return dict(self.throttling)
+
+    def reset_throttling(self):
+        with self._throttling_lock:
+            self.throttling = {'delayed': 0, 'delay': 0.0,
+                               'retried': 0, 'retry_delay': 0.0}
+
+    def _count_throttling(self, count_key, delay_key, delay):
+        # NOTE: the client may be shared by threads, and the counters would
+        #       lose their updates without the lock.
+        with self._throttling_lock:
+            self.throttling[count_key] += 1
+            self.throttling[delay_key] += delay
+
+    def get_pool_stats(self):
+        """Returns the counters of the HTTP connection pools.
+
+        ``pools`` is the number of hosts connected to, ``connections`` the
+        number of connections opened (each one costing a TCP and maybe a TLS
+        handshake), ``requests`` the number of requests sent over them and
+        ``idle`` the number of open connections waiting for a request.
+        """
+        return _get_pool_stats(self.session.session)
+
     @property
     def management_url(self):
         self.logger.warning(
@@ -110,6 +272,56 @@ class SessionClient(adapter.LegacyJsonAdapter):
         self.endpoint_override = value
 
 
+def _get_pool_stats(requests_session):
+    """Sums the counters of the urllib3 pools of a requests session."""
+    stats = {'pools': 0, 'connections': 0, 'requests': 0, 'idle': 0}
+    for http_adapter in set(requests_session.adapters.values()):
+        pools = getattr(getattr(http_adapter, 'poolmanager', None), 'pools',
+                        None)
+        if pools is None:
+            continue
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            stats['pools'] += 1
+            stats['connections'] += pool.num_connections
+            stats['requests'] += pool.num_requests
+            if pool.pool is not None:
+                stats['idle'] += sum(1 for conn in list(pool.pool.queue)
+                                     if conn is not None)
+    return stats
+
+
+def _construct_requests_session(pool_connections=None, pool_maxsize=None,
+                                pool_block=False, tcp_keepalive=True):
+    """Builds a requests session with connection pools of the given size.
+
+    :param pool_connections: number of hosts whose connections are kept
+    :param pool_maxsize: number of connections kept per host, which should
+                         be at least the number of threads sharing the client
+                         to avoid reconnecting
+    :param pool_block: whether to wait for a free connection when
+                       ``pool_maxsize`` connections are in use, rather than
+                       opening a connection which is not kept
+    :param tcp_keepalive: whether to enable TCP keep-alive on the connections,
+                          which keeps idle connections from being dropped by
+                          firewalls and load balancers
+    """
+    adapter_class = (ksession.TCPKeepAliveAdapter if tcp_keepalive
+                     else requests.adapters.HTTPAdapter)
+    adapter_kwargs = {'pool_block': pool_block}
+    if pool_connections:
+        adapter_kwargs['pool_connections'] = pool_connections
+    if pool_maxsize:
+        adapter_kwargs['pool_maxsize'] = pool_maxsize
+
+    requests_session = requests.Session()
+    for scheme in ('https://', 'http://'):
+        requests_session.mount(scheme, adapter_class(**adapter_kwargs))
+    return requests_session
+
+
 def _construct_http_client(api_version=None,
                            auth=None,
                            auth_token=None,
@@ -123,14 +335,21 @@ def _construct_http_client(api_version=None,
                            logger=None,
                            os_cache=False,
                            password=None,
+                           pool_block=False,
+                           pool_connections=None,
+                           pool_maxsize=None,
                            project_domain_id=None,
                            project_domain_name=None,
                            project_id=None,
                            project_name=None,
+                           rate_limit=None,
+                           rate_limit_retries=0,
                            region_name=None,
+                           retries=0,
                            service_name=None,
                            service_type='compute',
                            session=None,
+                           tcp_keepalive=True,
                            timeout=None,
                            timings=False,
                            user_agent='python-novaclient',
@@ -154,7 +373,11 @@ def _construct_http_client(api_version=None,
                                      project_domain_name=project_domain_name,
                                      user_domain_id=user_domain_id,
                                      user_domain_name=user_domain_name)
+        requests_session = _construct_requests_session(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+            pool_block=pool_block, tcp_keepalive=tcp_keepalive)
         session = ksession.Session(auth=auth,
+                                   session=requests_session,
                                    verify=(cacert or not insecure),
                                    timeout=timeout,
                                    cert=cert,
@@ -165,7 +388,10 @@ def _construct_http_client(api_version=None,
                          endpoint_override=endpoint_override,
                          interface=endpoint_type,
                          logger=logger,
+                         rate_limit=rate_limit,
+                         rate_limit_retries=rate_limit_retries,
                          region_name=region_name,
+                         retries=retries,
                          service_name=service_name,
                          service_type=service_type,
                          session=session,
@@ -174,7 +400,7 @@ def _construct_http_client(api_version=None,
                          **kwargs)
 
 
-def discover_extensions(version, only_contrib=False):
+def discover_extensions(version, only_contrib=False, cache_dir=None):
     """Returns the list of extensions, which can be discovered by python path,
     contrib path and by entry-point 'novaclient.extension'.
 
@@ -182,18 +408,72 @@ def discover_extensions(version, only_contrib=False):
     :type version: str or novaclient.api_versions.APIVersion
     :param only_contrib: search only in contrib directory or not
     :type only_contrib: bool
+    :param cache_dir: directory where the extensions found by python path and
+                      by entry-point are cached. The cache is refreshed when
+                      sys.path or the content of its directories changes.
+    :type cache_dir: str
     """
     if not isinstance(version, api_versions.APIVersion):
         version = api_versions.get_api_version(version)
     if only_contrib:
         chain = _discover_via_contrib_path(version)
     else:
-        chain = itertools.chain(_discover_via_python_path(),
+        python_path, entry_points = _discover_installed_extensions(cache_dir)
+        chain = itertools.chain(python_path,
                                 _discover_via_contrib_path(version),
-                                _discover_via_entry_points())
+                                entry_points)
     return [ext.Extension(name, module) for name, module in chain]
 
 
+def _get_sys_path_fingerprint():
+    # NOTE: installing or removing a module or a distribution changes the
+    # modification time of the directory it lives in.
+    fingerprint = []
+    for path in sys.path:
+        try:
+            mtime = os.stat(path or os.curdir).st_mtime
+        except OSError:
+            mtime = None
+        fingerprint.append([path, mtime])
+    return fingerprint
+
+
+def _discover_installed_extensions(cache_dir=None):
+    if cache_dir is None:
+        return _discover_via_python_path(), _discover_via_entry_points()
+
+    cache_file = os.path.join(cache_dir, 'extensions.json')
+    fingerprint = _get_sys_path_fingerprint()
+    try:
+        with open(cache_file) as f:
+            cached = json.load(f)
+        if cached['fingerprint'] == fingerprint:
+            return cached['python_path'], cached['entry_points']
+    except (IOError, OSError, ValueError, KeyError):
+        pass
+
+    python_path = list(_discover_via_python_path())
+    entry_points = list(_discover_via_entry_points())
+    # NOTE: only the names of the modules are cached, the modules found on
+    # the python path are imported anyway to read their extension_name.
+    cached_python_path = [(name, getattr(module, '__name__', module))
+                          for name, module in python_path]
+    if all(isinstance(module, six.string_types)
+           for _name, module in cached_python_path + entry_points):
+        tmp_file = '%s.%d.tmp' % (cache_file, os.getpid())
+        try:
+            if not os.path.exists(cache_dir):
+                os.makedirs(cache_dir)
+            with open(tmp_file, 'w') as f:
+                json.dump({'fingerprint': fingerprint,
+                           'python_path': cached_python_path,
+                           'entry_points': entry_points}, f)
+            getattr(os, 'replace', os.rename)(tmp_file, cache_file)
+        except (IOError, OSError):
+            pass
+    return python_path, entry_points
+
+
 def _discover_via_python_path():
     for (module_loader, name, _ispkg) in pkgutil.iter_modules():
         if name.endswith('_python_novaclient_ext'):
@@ -212,16 +492,37 @@ def _discover_via_contrib_path(version):
         modules = {"baremetal": "novaclient.v2.contrib.baremetal",
                    "tenant_networks": "novaclient.v2.contrib.tenant_networks"}
 
+        # NOTE: the modules are imported when the extensions are used.
         for name, module_name in modules.items():
-            module_loader = pkgutil.get_loader(module_name)
-            module = module_loader.load_module(module_name)
-            yield name, module
+            yield name, module_name
+
+
+def _iter_entry_points(group):
+    if importlib_metadata is None:
+        import pkg_resources
+        return pkg_resources.iter_entry_points(group)
+    entry_points = importlib_metadata.entry_points()
+    if hasattr(entry_points, 'select'):
+        return entry_points.select(group=group)
+    return entry_points.get(group, [])
+
+
+def _get_entry_point_module_name(ep):
+    """Returns the module name of an entry-point pointing to a module."""
+    value = getattr(ep, 'value', None)
+    if value is None:
+        # pkg_resources.EntryPoint
+        return None if ep.attrs else ep.module_name
+    module_name, _sep, attr = value.partition(':')
+    return None if attr else module_name.strip()
 
 
 def _discover_via_entry_points():
-    for ep in pkg_resources.iter_entry_points('novaclient.extension'):
+    for ep in _iter_entry_points('novaclient.extension'):
         name = ep.name
-        module = ep.load()
+        # NOTE: the entry-points pointing to a module are imported when the
+        # extensions are used.
+        module = _get_entry_point_module_name(ep) or ep.load()
 
         yield name, module
 
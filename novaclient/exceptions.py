@@ -95,6 +95,42 @@ class ResourceInErrorState(Exception):
         if fault_msg:
             msg += "due to '%s'" % fault_msg
         self.message = "%s." % msg
+        self.resource = obj
+
+
+class ResourceWaitTimeout(Exception):
+    """Resources did not reach the expected state in time."""
+
+    def __init__(self, resources, timeout):
+        self.resources = resources
+        self.timeout = timeout
+        self.message = ("Timed out after %s seconds waiting for %s." %
+                        (timeout, ", ".join(str(r) for r in resources)))
+
+    def __str__(self):
+        return self.message
+
+
+class CreateManyError(Exception):
+    """Some of the servers of a bulk creation failed.
+
+    :param servers: the created servers, in the order of the specs, None for
+                    the specs which failed
+    :param errors: (index of the spec, exception) of each failure
+    """
+
+    def __init__(self, servers, errors):
+        self.servers = servers
+        self.errors = errors
+        self.message = ("Failed to create %s of %s servers: %s" %
+                        (len(errors), len(servers),
+                         "; ".join("%s: %s" % (index,
+                                               getattr(error, 'message',
+                                                       None) or error)
+                                   for index, error in errors)))
+
+    def __str__(self):
+        return self.message
 
 
 class VersionNotFoundForAPIMethod(Exception):
@@ -13,27 +13,85 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import os
+import pkgutil
+
+from oslo_utils import importutils
+import six
+
 from novaclient import base
 from novaclient import utils
 
 
 class Extension(base.HookableMixin):
-    """Extension descriptor."""
+    """Extension descriptor.
+
+    The module of the extension can be given by name, in which case it is
+    only imported when the extension is used.
+    """
 
     SUPPORTED_HOOKS = ('__pre_parse_args__', '__post_parse_args__')
 
     def __init__(self, name, module):
         self.name = name
-        self.module = module
-        self._parse_extension_module()
+        if isinstance(module, six.string_types):
+            self.module_name = module
+            self._module = None
+        else:
+            self.module_name = getattr(module, '__name__', None)
+            self._module = module
+            self._parse_extension_module()
+
+    def _load(self):
+        if self._module is None:
+            self._module = importutils.import_module(self.module_name)
+            self._parse_extension_module()
+        return self._module
+
+    @property
+    def module(self):
+        return self._load()
+
+    @property
+    def manager_class(self):
+        self._load()
+        return self._manager_class
+
+    @property
+    def version(self):
+        """Version of the extension, without importing its module.
+
+        The ``__version__`` of an imported module, the modification time of
+        the module file otherwise, so that it changes when the extension is
+        upgraded.
+        """
+        version = getattr(self._module, '__version__', None)
+        if version is not None:
+            return str(version)
+        path = getattr(self._module, '__file__', None)
+        if path is None:
+            try:
+                path = pkgutil.get_loader(self.module_name).get_filename(
+                    self.module_name)
+            except (AttributeError, ImportError, ValueError):
+                return None
+        try:
+            return str(os.path.getmtime(path))
+        except (OSError, TypeError):
+            return None
 
     def _parse_extension_module(self):
-        self.manager_class = None
-        for attr_name, attr_value in self.module.__dict__.items():
+        self._manager_class = None
+        for attr_name, attr_value in self._module.__dict__.items():
             if attr_name in self.SUPPORTED_HOOKS:
                 self.add_hook(attr_name, attr_value)
             elif utils.safe_issubclass(attr_value, base.Manager):
-                self.manager_class = attr_value
+                self._manager_class = attr_value
+
+    def run_hooks(self, hook_type, *args, **kwargs):
+        # NOTE: the hooks of the module are registered when it is imported.
+        self._load()
+        super(Extension, self).run_hooks(hook_type, *args, **kwargs)
 
     def __repr__(self):
         return "<Extension '%s'>" % self.name
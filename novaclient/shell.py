@@ -21,7 +21,10 @@ Command-line interface to the OpenStack Nova API.
 from __future__ import print_function
 import argparse
 import getpass
+import json
 import logging
+import os
+import shutil
 import sys
 
 from keystoneauth1 import loading
@@ -54,6 +57,9 @@ DEFAULT_MAJOR_OS_COMPUTE_API_VERSION = "2.0"
 DEFAULT_OS_COMPUTE_API_VERSION = '2.latest'
 DEFAULT_NOVA_ENDPOINT_TYPE = 'publicURL'
 DEFAULT_NOVA_SERVICE_TYPE = "compute"
+# seconds the resources looked up by name or ID are cached, a command may
+# resolve the same flavor or image several times
+LOOKUP_CACHE_TTL = 300
 
 HINT_HELP_MSG = (" [hint: use '--os-compute-api-version' flag to show help "
                  "message for proper version]")
@@ -61,6 +67,88 @@ HINT_HELP_MSG = (" [hint: use '--os-compute-api-version' flag to show help "
 logger = logging.getLogger(__name__)
 
 
+def _cache_path(*parts):
+    return os.path.expanduser(os.path.join(
+        utils.env('NOVACLIENT_UUID_CACHE_DIR', default="~/.novaclient"),
+        *parts))
+
+
+def _get_terminal_width():
+    # NOTE: the width argparse wraps the help to, the cached help is only
+    # valid for it.
+    get_terminal_size = getattr(shutil, 'get_terminal_size', None)
+    if get_terminal_size is not None:
+        return get_terminal_size().columns
+    try:
+        return int(os.environ['COLUMNS'])
+    except (KeyError, ValueError):
+        return 80
+
+
+class CommandIndex(object):
+    """On-disk index of the shell commands, their options and help.
+
+    It lets ``nova bash-completion`` and ``nova help <subcommand>`` answer
+    without importing the managers and building the parser of every
+    command. The index is stored along with a fingerprint (novaclient
+    version, API version, installed extensions and their versions, and help
+    width) and is rebuilt whenever the fingerprint changes.
+    """
+
+    def __init__(self, path, fingerprint):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.commands = None
+
+    def load(self):
+        """Load the index, return False if it is missing or outdated."""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return False
+        if data.get('fingerprint') != self.fingerprint:
+            return False
+        self.commands = data.get('commands', {})
+        return True
+
+    def build(self, subcommands):
+        """Build the index from the subparsers of all the commands."""
+        self.commands = dict(
+            (name, {'options': sorted(
+                subparser._optionals._option_string_actions),
+                'help': subparser.format_help()})
+            for name, subparser in subcommands.items())
+
+    def save(self):
+        data = {'fingerprint': self.fingerprint, 'commands': self.commands}
+        tmp_path = '%s.%d.tmp' % (self.path, os.getpid())
+        try:
+            dirname = os.path.dirname(self.path)
+            if not os.path.exists(dirname):
+                os.makedirs(dirname)
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            getattr(os, 'replace', os.rename)(tmp_path, self.path)
+        except (IOError, OSError):
+            # NOTE: the index is only an optimization, a read-only or
+            # missing cache directory must not break the shell.
+            pass
+
+    def completion_words(self):
+        commands = set(self.commands) - set(['bash-completion',
+                                             'bash_completion'])
+        options = set()
+        for command in self.commands.values():
+            options.update(command['options'])
+        return sorted(commands | options)
+
+    def get_help(self, command):
+        if command not in self.commands:
+            return None
+        return self.commands[command]['help']
+
+
 class DeprecatedAction(argparse.Action):
     """An argparse action for deprecated options.
 
@@ -214,6 +302,7 @@ class SecretsHelper(object):
         self.client = client
         self.key = None
         self._password = None
+        self._auth = None
 
     def _validate_string(self, text):
         if text is None or len(text) == 0:
@@ -272,6 +361,7 @@ class SecretsHelper(object):
                           str(management_url),
                           str(tenant_id)])
         keyring.set_password("novaclient_auth", self._make_key(), value)
+        self._auth = (str(auth_token), str(management_url), str(tenant_id))
 
     @property
     def password(self):
@@ -291,18 +381,24 @@ class SecretsHelper(object):
                 'prompted response')
         return self._password
 
+    def _read_keyring(self):
+        # The keyring backend may be slow (e.g. a desktop secret service),
+        # so the cached block is read at most once per helper.
+        if self._auth is None:
+            self._auth = (None, None, None)
+            if HAS_KEYRING and self.args.os_cache:
+                try:
+                    block = keyring.get_password('novaclient_auth',
+                                                 self._make_key())
+                    if block:
+                        self._auth = tuple(block.split('|', 2))
+                except all_errors:
+                    pass
+        return self._auth
+
     @property
     def management_url(self):
-        if not HAS_KEYRING or not self.args.os_cache:
-            return None
-        management_url = None
-        try:
-            block = keyring.get_password('novaclient_auth', self._make_key())
-            if block:
-                _token, management_url, _tenant_id = block.split('|', 2)
-        except all_errors:
-            pass
-        return management_url
+        return self._read_keyring()[1]
 
     @property
     def auth_token(self):
@@ -310,29 +406,11 @@ class SecretsHelper(object):
         # want to look into the keyring module, if it
         # exists and see if anything was provided in that
         # file that we can use.
-        if not HAS_KEYRING or not self.args.os_cache:
-            return None
-        token = None
-        try:
-            block = keyring.get_password('novaclient_auth', self._make_key())
-            if block:
-                token, _management_url, _tenant_id = block.split('|', 2)
-        except all_errors:
-            pass
-        return token
+        return self._read_keyring()[0]
 
     @property
     def tenant_id(self):
-        if not HAS_KEYRING or not self.args.os_cache:
-            return None
-        tenant_id = None
-        try:
-            block = keyring.get_password('novaclient_auth', self._make_key())
-            if block:
-                _token, _management_url, tenant_id = block.split('|', 2)
-        except all_errors:
-            pass
-        return tenant_id
+        return self._read_keyring()[2]
 
 
 class NovaClientArgumentParser(argparse.ArgumentParser):
@@ -446,6 +524,28 @@ class OpenStackComputeShell(object):
             action='store_true',
             help=_("Print call timing info."))
 
+        parser.add_argument(
+            '--format',
+            metavar='<format>',
+            dest='output_format',
+            choices=['table'] + sorted(utils.LIST_FORMATTERS),
+            default=utils.env('NOVACLIENT_FORMAT', default='table'),
+            help=_("Output format of the lists: 'table', 'stream' (a table "
+                   "whose columns are sized on its first rows), 'json' (a "
+                   "JSON object per line) or 'csv'. Unlike 'table', the "
+                   "other formats print the rows as they are received, in "
+                   "the order of the server. Defaults to "
+                   "env[NOVACLIENT_FORMAT] or 'table'."))
+
+        parser.add_argument(
+            '--retries',
+            metavar='<count>',
+            type=int,
+            default=utils.env('OS_COMPUTE_RETRIES', default='0'),
+            help=_("Number of times an idempotent request is retried after "
+                   "a connection error or a 502, 503 or 504 response. "
+                   "Defaults to env[OS_COMPUTE_RETRIES] or 0."))
+
         parser.add_argument(
             '--os-region-name',
             metavar='<region-name>',
@@ -492,6 +592,17 @@ class OpenStackComputeShell(object):
             help=_('Accepts X, X.Y (where X is major and Y is minor part) or '
                    '"X.latest", defaults to env[OS_COMPUTE_API_VERSION].'))
 
+        parser.add_argument(
+            '--version-cache-ttl',
+            metavar='<seconds>',
+            type=int,
+            default=utils.env('NOVACLIENT_VERSION_CACHE_TTL',
+                              default=api_versions.DEFAULT_VERSION_CACHE_TTL),
+            help=_('Number of seconds the API version range discovered for '
+                   'an endpoint is cached, 0 disables the cache. Defaults '
+                   'to env[NOVACLIENT_VERSION_CACHE_TTL] or %d.') %
+            api_versions.DEFAULT_VERSION_CACHE_TTL)
+
         parser.add_argument(
             '--endpoint-override',
             metavar='<bypass-url>',
@@ -516,17 +627,36 @@ class OpenStackComputeShell(object):
     def get_subcommand_parser(self, version, do_help=False, argv=None):
         parser = self.get_base_parser(argv)
 
+        # NOTE: building the subparsers of all the commands is slow, so only
+        # the subparser of the command being run is built, unless all of
+        # them are needed for the help or the bash completion.
+        command = None
+        if argv and not do_help and 'bash-completion' not in argv:
+            _args, args_list = parser.parse_known_args(argv)
+            # NOTE: the commands are named after the do_* functions with
+            # hyphens instead of underscores.
+            if args_list and not args_list[0].startswith('-') and (
+                    '_' not in args_list[0]):
+                command = args_list[0]
+
         self.subcommands = {}
         subparsers = parser.add_subparsers(metavar='<subcommand>')
 
         actions_module = importutils.import_module(
             "novaclient.v%s.shell" % version.ver_major)
-
-        self._find_actions(subparsers, actions_module, version, do_help)
-        self._find_actions(subparsers, self, version, do_help)
-
-        for extension in self.extensions:
-            self._find_actions(subparsers, extension.module, version, do_help)
+        actions_modules = [actions_module, self]
+        actions_modules.extend(extension.module
+                               for extension in self.extensions)
+
+        if command is not None:
+            for module in actions_modules:
+                self._find_actions(subparsers, module, version, do_help,
+                                   command=command)
+        if command not in self.subcommands:
+            # NOTE: an unknown command is reported by argparse along with
+            # the list of all the valid ones.
+            for module in actions_modules:
+                self._find_actions(subparsers, module, version, do_help)
 
         self._add_bash_completion_subparser(subparsers)
 
@@ -541,9 +671,15 @@ class OpenStackComputeShell(object):
         self.subcommands['bash_completion'] = subparser
         subparser.set_defaults(func=self.do_bash_completion)
 
-    def _find_actions(self, subparsers, actions_module, version, do_help):
+    def _find_actions(self, subparsers, actions_module, version, do_help,
+                      command=None):
         msg = _(" (Supported by API versions '%(start)s' - '%(end)s')")
-        for attr in (a for a in dir(actions_module) if a.startswith('do_')):
+        if command is None:
+            attrs = [a for a in dir(actions_module) if a.startswith('do_')]
+        else:
+            attrs = ['do_%s' % command.replace('-', '_')]
+            attrs = [a for a in attrs if hasattr(actions_module, a)]
+        for attr in attrs:
             # I prefer to be hyphen-separated instead of underscores.
             command = attr[3:].replace('_', '-')
             callback = getattr(actions_module, attr)
@@ -749,17 +885,33 @@ class OpenStackComputeShell(object):
                 _("You must provide an auth url "
                   "via either --os-auth-url or env[OS_AUTH_URL]"))
 
-        # This client is just used to discover api version. Version API needn't
-        # microversion, so we just pass version 2 at here.
-        self.cs = client.Client(
-            api_versions.APIVersion("2.0"),
-            os_username, os_password, project_id=os_project_id,
+        # build available extensions based on the major version, which
+        # does not change when the microversion is discovered
+        self.extensions = client.discover_extensions(
+            api_version, cache_dir=_cache_path())
+
+        # NOTE: the extension modules are not even imported when the command
+        # can be answered from the index.
+        if skip_auth and self._run_from_command_index(api_version, argv,
+                                                      args_list):
+            return 0
+
+        self._run_extension_hooks('__pre_parse_args__')
+
+        # NOTE: a single client, and so a single keystoneauth session and
+        # token, is used to discover the api version and to run the command.
+        # Version API needn't microversion, so we just pass version 2 at
+        # here and set the discovered version afterwards.
+        client_kwargs = dict(
+            project_id=os_project_id,
             project_name=os_project_name, user_id=os_user_id,
             auth_url=os_auth_url, insecure=insecure,
             region_name=os_region_name, endpoint_type=endpoint_type,
             extensions=self.extensions, service_type=service_type,
             service_name=service_name, auth_token=auth_token,
-            timings=args.timings, endpoint_override=endpoint_override,
+            timings=args.timings, retries=args.retries,
+            lookup_cache_ttl=LOOKUP_CACHE_TTL,
+            endpoint_override=endpoint_override,
             os_cache=os_cache, http_log_debug=args.debug,
             cacert=cacert, cert=cert, timeout=timeout,
             session=keystone_session, auth=keystone_auth,
@@ -768,6 +920,29 @@ class OpenStackComputeShell(object):
             project_domain_name=os_project_domain_name,
             user_domain_id=os_user_domain_id,
             user_domain_name=os_user_domain_name)
+        self.cs = client.Client(api_versions.APIVersion("2.0"),
+                                os_username, os_password, **client_kwargs)
+
+        # Now check for the password/token of which pieces of the
+        # identifying keyring key can come from the underlying client
+        if must_auth and not skip_auth:
+            helper = SecretsHelper(args, self.cs.client)
+            self.cs.client.keyring_saver = helper
+
+            tenant_id = helper.tenant_id
+            # Allow commandline to override cache
+            if not auth_token:
+                auth_token = helper.auth_token
+            endpoint_override = endpoint_override or helper.management_url
+            if tenant_id and auth_token and endpoint_override:
+                self.cs.client.tenant_id = tenant_id
+                self.cs.client.auth_token = auth_token
+                self.cs.client.management_url = endpoint_override
+                self.cs.client.password_func = lambda: helper.password
+            else:
+                # We're missing something, so auth with user/pass and save
+                # the result in our helper.
+                self.cs.client.password = helper.password
 
         if not skip_auth:
             if not api_version.is_latest():
@@ -781,11 +956,13 @@ class OpenStackComputeShell(object):
                                 "min": novaclient.API_MIN_VERSION.get_string(),
                                 "max": novaclient.API_MAX_VERSION.get_string()}
                         )
-            api_version = api_versions.discover_version(self.cs, api_version)
-
-        # build available subcommands based on version
-        self.extensions = client.discover_extensions(api_version)
-        self._run_extension_hooks('__pre_parse_args__')
+            version_cache = None
+            if args.version_cache_ttl > 0:
+                version_cache = api_versions.VersionCache(
+                    ttl=args.version_cache_ttl,
+                    cache_dir=_cache_path('versions'))
+            api_version = api_versions.discover_version(
+                self.cs, api_version, version_cache=version_cache)
 
         subcommand_parser = self.get_subcommand_parser(
             api_version, do_help=do_help, argv=argv)
@@ -797,6 +974,7 @@ class OpenStackComputeShell(object):
 
         args = subcommand_parser.parse_args(argv)
         self._run_extension_hooks('__post_parse_args__', args)
+        utils.set_output_format(args.output_format)
 
         # Short-circuit and deal with help right away.
         if args.func == self.do_help:
@@ -806,55 +984,20 @@ class OpenStackComputeShell(object):
             self.do_bash_completion(args)
             return 0
 
-        if not args.service_type:
-            service_type = (utils.get_service_type(args.func) or
-                            DEFAULT_NOVA_SERVICE_TYPE)
-
         if utils.isunauthenticated(args.func):
             # NOTE(alex_xu): We need authentication for discover microversion.
             # But the subcommands may needn't it. If the subcommand needn't,
             # we clear the session arguments.
-            keystone_session = None
-            keystone_auth = None
-
-        # Recreate client object with discovered version.
-        self.cs = client.Client(
-            api_version,
-            os_username, os_password, os_project_name,
-            tenant_id=os_project_id, user_id=os_user_id,
-            auth_url=os_auth_url, insecure=insecure,
-            region_name=os_region_name, endpoint_type=endpoint_type,
-            extensions=self.extensions, service_type=service_type,
-            service_name=service_name, auth_token=auth_token,
-            timings=args.timings, endpoint_override=endpoint_override,
-            os_cache=os_cache, http_log_debug=args.debug,
-            cacert=cacert, cert=cert, timeout=timeout,
-            session=keystone_session, auth=keystone_auth,
-            project_domain_id=os_project_domain_id,
-            project_domain_name=os_project_domain_name,
-            user_domain_id=os_user_domain_id,
-            user_domain_name=os_user_domain_name)
-
-        # Now check for the password/token of which pieces of the
-        # identifying keyring key can come from the underlying client
-        if must_auth:
-            helper = SecretsHelper(args, self.cs.client)
-            self.cs.client.keyring_saver = helper
+            client_kwargs.update(session=None, auth=None)
+            self.cs = client.Client(api_version, os_username, os_password,
+                                    **client_kwargs)
 
-            tenant_id = helper.tenant_id
-            # Allow commandline to override cache
-            if not auth_token:
-                auth_token = helper.auth_token
-            endpoint_override = endpoint_override or helper.management_url
-            if tenant_id and auth_token and endpoint_override:
-                self.cs.client.tenant_id = tenant_id
-                self.cs.client.auth_token = auth_token
-                self.cs.client.management_url = endpoint_override
-                self.cs.client.password_func = lambda: helper.password
-            else:
-                # We're missing something, so auth with user/pass and save
-                # the result in our helper.
-                self.cs.client.password = helper.password
+        # Switch the client to the discovered version and to the service
+        # type of the command.
+        self.cs.api_version = api_version
+        if not args.service_type:
+            self.cs.client.service_type = (utils.get_service_type(args.func) or
+                                           DEFAULT_NOVA_SERVICE_TYPE)
 
         args.func(self.cs, args)
 
@@ -873,6 +1016,41 @@ class OpenStackComputeShell(object):
         results.append(Tyme("Total", total))
         utils.print_list(results, ["url", "seconds"], sortby_index=None)
 
+    def _get_command_index(self, version, argv):
+        fingerprint = {
+            'novaclient': novaclient.__version__,
+            'api_version': version.get_string(),
+            'extensions': sorted(
+                [extension.name, extension.module_name, extension.version]
+                for extension in self.extensions),
+            'width': _get_terminal_width(),
+        }
+        index = CommandIndex(
+            _cache_path('commands', '%s.json' % version.get_string()),
+            fingerprint)
+        if not index.load():
+            self.get_subcommand_parser(version, do_help=True, argv=argv)
+            index.build(self.subcommands)
+            index.save()
+        return index
+
+    def _run_from_command_index(self, version, argv, args_list):
+        """Answer bash-completion and help <subcommand> from the index.
+
+        Returns False when the command has to go through the parser.
+        """
+        if args_list == ['bash-completion']:
+            index = self._get_command_index(version, argv)
+            print(' '.join(index.completion_words()))
+            return True
+        if len(args_list) == 2 and args_list[0] == 'help':
+            help_text = self._get_command_index(version, argv).get_help(
+                args_list[1])
+            if help_text is not None:
+                sys.stdout.write(help_text)
+                return True
+        return False
+
     def _run_extension_hooks(self, hook_type, *args, **kwargs):
         """Run hooks for all registered extensions."""
         for extension in self.extensions:
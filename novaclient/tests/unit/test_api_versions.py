@@ -13,6 +13,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import argparse
+import os
+
+import fixtures
 import mock
 
 import novaclient
@@ -330,17 +334,63 @@ class WrapsTestCase(utils.TestCase):
         self.assertEqual(1, A().f())
         self.assertEqual(2, B().f())
 
+    def test_resolved_method_is_cached(self):
+        @api_versions.wraps("2.2", "2.6")
+        def some_func(*args, **kwargs):
+            pass
+
+        obj = self._get_obj_with_vers("2.4")
+        with mock.patch.object(api_versions, "get_substitutions",
+                               wraps=api_versions.get_substitutions) as m:
+            some_func(obj)
+            some_func(obj)
+            self.assertEqual(1, m.call_count)
+
+            obj.api_version = api_versions.APIVersion("2.5")
+            some_func(obj)
+            self.assertEqual(2, m.call_count)
+
+    def test_api_version_change(self):
+
+        class A(object):
+            api_version = api_versions.APIVersion("888.1")
+
+            @api_versions.wraps("888.1", "888.1")
+            def f(self):
+                return 1
+
+            @api_versions.wraps("888.2")
+            def f(self):
+                return 2
+
+        a = A()
+        self.assertEqual(1, a.f())
+        a.api_version = api_versions.APIVersion("888.2")
+        self.assertEqual(2, a.f())
+        a.api_version = api_versions.APIVersion("888.1")
+        self.assertEqual(1, a.f())
+
     def test_generate_function_name(self):
-        expected_name = "novaclient.tests.unit.test_api_versions.fake_func"
 
-        self.assertNotIn(expected_name, api_versions._SUBSTITUTIONS)
+        class Owner(object):
+            @api_versions.wraps("7777777.7777777")
+            def fake_func(self):
+                pass
 
-        @api_versions.wraps("7777777.7777777")
-        def fake_func():
-            pass
+        name = Owner.fake_func.__id__
+        self.assertTrue(name.startswith(
+            "novaclient.tests.unit.test_api_versions."))
+        self.assertTrue(name.endswith("Owner.fake_func"))
+        self.assertIn(name, api_versions._SUBSTITUTIONS)
+
+    def test_generate_function_name_without_qualname(self):
+        func = argparse.Namespace(__module__="fake_module",
+                                  __name__="fake_func")
+
+        class Owner(object):
+            name = (lambda: api_versions._get_function_name(func))()
 
-        self.assertIn(expected_name, api_versions._SUBSTITUTIONS)
-        self.assertEqual(expected_name, fake_func.__id__)
+        self.assertEqual("fake_module.Owner.fake_func", Owner.name)
 
 
 class DiscoverVersionTestCase(utils.TestCase):
@@ -439,6 +489,114 @@ class DiscoverVersionTestCase(utils.TestCase):
                 fake_client,
                 api_versions.APIVersion('2.latest')).get_string())
 
+    def test_version_cache(self):
+        fake_client = mock.MagicMock()
+        fake_client.client.get_endpoint.return_value = 'http://compute'
+        fake_client.versions.get_current.return_value = mock.MagicMock(
+            version="2.7", min_version="2.4")
+        novaclient.API_MAX_VERSION = api_versions.APIVersion("2.11")
+        novaclient.API_MIN_VERSION = api_versions.APIVersion("2.1")
+        cache = api_versions.VersionCache()
+
+        for i in range(2):
+            self.assertEqual(
+                "2.7",
+                api_versions.discover_version(
+                    fake_client, api_versions.APIVersion('2.latest'),
+                    version_cache=cache).get_string())
+        self.assertEqual(1, fake_client.versions.get_current.call_count)
+        self.assertEqual((api_versions.APIVersion("2.4"),
+                          api_versions.APIVersion("2.7")),
+                         cache.get('http://compute'))
+
+    def test_version_cache_outdated(self):
+        fake_client = mock.MagicMock()
+        fake_client.client.get_endpoint.return_value = 'http://compute'
+        fake_client.versions.get_current.return_value = mock.MagicMock(
+            version="2.9", min_version="2.4")
+        cache = api_versions.VersionCache()
+        cache.set('http://compute', api_versions.APIVersion("2.4"),
+                  api_versions.APIVersion("2.7"))
+
+        self.assertEqual(
+            "2.9",
+            api_versions.discover_version(
+                fake_client, api_versions.APIVersion('2.9'),
+                version_cache=cache).get_string())
+        self.assertEqual(1, fake_client.versions.get_current.call_count)
+        self.assertEqual(api_versions.APIVersion("2.9"),
+                         cache.get('http://compute')[1])
+
+    def test_version_cache_miss_unsupported(self):
+        fake_client = mock.MagicMock()
+        fake_client.client.get_endpoint.return_value = 'http://compute'
+        fake_client.versions.get_current.return_value = mock.MagicMock(
+            version="2.7", min_version="2.4")
+        cache = api_versions.VersionCache()
+
+        self.assertRaises(exceptions.UnsupportedVersion,
+                          api_versions.discover_version, fake_client,
+                          api_versions.APIVersion('2.9'),
+                          version_cache=cache)
+        # the range has just been fetched, it is not fetched again
+        self.assertEqual(1, fake_client.versions.get_current.call_count)
+
+
+class VersionCacheTestCase(utils.TestCase):
+    def setUp(self):
+        super(VersionCacheTestCase, self).setUp()
+        self.cache_dir = self.useFixture(fixtures.TempDir()).path
+
+    def test_get_set(self):
+        cache = api_versions.VersionCache()
+        self.assertIsNone(cache.get('http://compute'))
+        cache.set('http://compute', api_versions.APIVersion(),
+                  api_versions.APIVersion())
+        self.assertEqual((api_versions.APIVersion(),
+                          api_versions.APIVersion()),
+                         cache.get('http://compute'))
+        self.assertIsNone(cache.get('http://other'))
+
+    @mock.patch('time.time')
+    def test_ttl(self, mock_time):
+        mock_time.return_value = 1000
+        cache = api_versions.VersionCache(ttl=60)
+        cache.set('http://compute', api_versions.APIVersion("2.1"),
+                  api_versions.APIVersion("2.7"))
+        mock_time.return_value = 1059
+        self.assertIsNotNone(cache.get('http://compute'))
+        mock_time.return_value = 1060
+        self.assertIsNone(cache.get('http://compute'))
+
+    def test_on_disk(self):
+        cache = api_versions.VersionCache(cache_dir=self.cache_dir)
+        cache.set('http://compute', api_versions.APIVersion("2.1"),
+                  api_versions.APIVersion("2.7"))
+        cache.set('http://other', api_versions.APIVersion("2.1"),
+                  api_versions.APIVersion("2.9"))
+
+        other_cache = api_versions.VersionCache(cache_dir=self.cache_dir)
+        self.assertEqual((api_versions.APIVersion("2.1"),
+                          api_versions.APIVersion("2.7")),
+                         other_cache.get('http://compute'))
+
+        other_cache.invalidate('http://compute')
+        self.assertIsNone(other_cache.get('http://compute'))
+        self.assertIsNone(api_versions.VersionCache(
+            cache_dir=self.cache_dir).get('http://compute'))
+        self.assertIsNotNone(api_versions.VersionCache(
+            cache_dir=self.cache_dir).get('http://other'))
+
+        cache.invalidate()
+        self.assertIsNone(cache.get('http://compute'))
+        self.assertEqual([], os.listdir(self.cache_dir))
+
+    def test_corrupted_file(self):
+        cache = api_versions.VersionCache(cache_dir=self.cache_dir)
+        with open(cache._path('http://compute'), 'w') as f:
+            f.write('{')
+        self.assertIsNone(cache.get('http://compute'))
+
 
 class DecoratedAfterTestCase(utils.TestCase):
     def test_decorated_after(self):
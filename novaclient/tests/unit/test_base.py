@@ -11,6 +11,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import os
+
+import fixtures
+import mock
 from requests import Response
 import six
 
@@ -20,6 +24,7 @@ from novaclient import exceptions
 from novaclient.tests.unit import utils
 from novaclient.tests.unit.v2 import fakes
 from novaclient.v2 import flavors
+from novaclient.v2 import servers
 
 
 def create_response_obj_with_header():
@@ -77,6 +82,26 @@ class BaseTest(utils.TestCase):
         r2 = object()
         self.assertNotEqual(r1, r2)
 
+    def test_compact_resource(self):
+        info = {'id': 1, 'name': 'hi', 'OS-EXT-STS:vm_state': 'active'}
+        r = base.Resource(None, info, loaded=True, compact=True)
+        self.assertEqual(1, r.id)
+        self.assertEqual('active', getattr(r, 'OS-EXT-STS:vm_state'))
+        self.assertRaises(AttributeError, getattr, r, 'blahblah')
+        self.assertEqual("<Resource OS-EXT-STS:vm_state=active, id=1, "
+                         "name=hi>", repr(r))
+        self.assertEqual(info, r.to_dict())
+        self.assertEqual(base.Resource(None, dict(info)), r)
+        self.assertEqual([], r.request_ids)
+
+    def test_compact_resource_lazy_getattr(self):
+        cs = fakes.FakeClient(api_versions.APIVersion("2.0"))
+        f = flavors.Flavor(cs.flavors, {'id': 1}, compact=True)
+        self.assertEqual('256 MB Server', f.name)
+        cs.assert_called('GET', '/flavors/1')
+        self.assertEqual('256 MB Server', f.to_dict()['name'])
+        self.assertRaises(AttributeError, getattr, f, 'blahblah')
+
     def test_findall_invalid_attribute(self):
         cs = fakes.FakeClient(api_versions.APIVersion("2.0"))
         # Make sure findall with an invalid attribute doesn't cause errors.
@@ -88,6 +113,126 @@ class BaseTest(utils.TestCase):
                           cs.flavors.find,
                           vegetable='carrot')
 
+    def test_findall_server_side_filters(self):
+        cs = fakes.FakeClient(api_versions.APIVersion("2.0"))
+        found = cs.servers.findall(status='ACTIVE', all_tenants=1)
+        cs.assert_called('GET', '/servers/detail?all_tenants=1&status=ACTIVE')
+        self.assertIn('5678', [s.id for s in found])
+        self.assertEqual({'ACTIVE'}, set(s.status for s in found))
+
+    def test_findall_details_in_bulk(self):
+        cs = fakes.FakeClient(api_versions.APIVersion("2.0"))
+        summary = base.ListWithMeta(
+            [servers.Server(cs.servers, {'id': i, 'name': 'vm'}, loaded=True)
+             for i in ('1', '2', '3')], None)
+        detailed = base.ListWithMeta(
+            [servers.Server(cs.servers, {'id': i, 'name': 'vm',
+                                         'status': 'ACTIVE'}, loaded=True)
+             for i in ('2', '1', '3')], None)
+        with mock.patch.object(cs.servers, 'list', autospec=True,
+                               side_effect=[summary, detailed]) as mock_list:
+            with mock.patch.object(cs.servers, 'get') as mock_get:
+                found = cs.servers.findall(name='vm')
+
+        self.assertEqual(['1', '2', '3'], [s.id for s in found])
+        self.assertEqual(['ACTIVE'] * 3, [s.status for s in found])
+        mock_list.assert_has_calls([
+            mock.call(detailed=False, search_opts={'name': 'vm'}),
+            mock.call(detailed=True, search_opts={'name': 'vm'})])
+        self.assertFalse(mock_get.called)
+
+    def test_findall_list_args_cached(self):
+        cs = fakes.FakeClient(api_versions.APIVersion("2.0"))
+        with mock.patch.dict(base._LIST_ARGS, clear=True):
+            with mock.patch.object(base.reflection, 'get_callable_args',
+                                   return_value=['detailed']) as mock_args:
+                cs.flavors.findall(vegetable='carrot')
+                cs.flavors.findall(vegetable='carrot')
+        self.assertEqual(1, mock_args.call_count)
+
+    def test_findall_list_args_versioned(self):
+        cs = fakes.FakeClient(api_versions.APIVersion("2.0"))
+        self.assertNotIn('limit', cs.hypervisors._list_args())
+        cs.api_version = api_versions.APIVersion("2.33")
+        self.assertIn('limit', cs.hypervisors._list_args())
+
+    def _fake_pages(self, pages):
+        manager = base.Manager(None)
+        urls = []
+
+        def _fetch_list(url, response_key, body=None):
+            urls.append(url)
+            page = pages[url]
+            if isinstance(page, BaseException):
+                raise page
+            return url, page
+
+        manager._fetch_list = _fetch_list
+        return manager, urls
+
+    def test_list_pages(self):
+        pages = {'/a?marker=None': [{'id': 1}, {'id': 2}],
+                 '/a?marker=2': [{'id': 3}],
+                 '/a?marker=3': []}
+        for prefetch in (0, 1, 3):
+            manager, urls = self._fake_pages(pages)
+            result = list(manager._list_pages(lambda m: '/a?marker=%s' % m,
+                                              'items', prefetch=prefetch))
+            self.assertEqual([('/a?marker=None', [{'id': 1}, {'id': 2}]),
+                              ('/a?marker=2', [{'id': 3}]),
+                              ('/a?marker=3', [])], result)
+            self.assertEqual(['/a?marker=None', '/a?marker=2',
+                              '/a?marker=3'], urls)
+
+    def test_list_pages_prefetch_error(self):
+        pages = {'/a?marker=None': [{'id': 1}],
+                 '/a?marker=1': exceptions.ClientException(500)}
+        manager, urls = self._fake_pages(pages)
+        pager = manager._list_pages(lambda m: '/a?marker=%s' % m, 'items',
+                                    prefetch=1)
+        self.assertEqual(('/a?marker=None', [{'id': 1}]), next(pager))
+        self.assertRaises(exceptions.ClientException, next, pager)
+
+    def test_list_pages_prefetch_interrupted(self):
+        pages = {'/a?marker=None': [{'id': 1}],
+                 '/a?marker=1': KeyboardInterrupt()}
+        manager, urls = self._fake_pages(pages)
+        result = manager._list_pages(lambda m: '/a?marker=%s' % m, 'items',
+                                     prefetch=1)
+        self.assertEqual(('/a?marker=None', [{'id': 1}]), next(result))
+        self.assertRaises(KeyboardInterrupt, next, result)
+
+    def test_list_pages_prefetch_stopped_early(self):
+        pages = dict(('/a?marker=%s' % i, [{'id': i + 1}])
+                     for i in range(100))
+        manager, urls = self._fake_pages(pages)
+        pager = manager._list_pages(lambda m: '/a?marker=%s' % m, 'items',
+                                    marker=0, prefetch=2)
+        self.assertEqual(('/a?marker=0', [{'id': 1}]), next(pager))
+        pager.close()
+        # the fetcher never runs further ahead than the prefetch limit
+        self.assertTrue(len(urls) <= 5)
+
+    def test_list_pages_next_marker(self):
+        pages = {'/a?marker=None': [{'name': 'x'}],
+                 '/a?marker=x': [{'name': 'y'}]}
+        manager, urls = self._fake_pages(pages)
+        result = list(manager._list_pages(
+            lambda m: '/a?marker=%s' % m, 'items',
+            next_marker=lambda data: None if data[-1]['name'] == 'y'
+            else data[-1]['name']))
+        self.assertEqual([('/a?marker=None', [{'name': 'x'}]),
+                          ('/a?marker=x', [{'name': 'y'}])], result)
+
+    def test_build_list_resource_without_compact(self):
+        class LegacyResource(base.Resource):
+            def __init__(self, manager, info, loaded=False):
+                super(LegacyResource, self).__init__(manager, info, loaded)
+
+        manager = base.Manager(None)
+        items = manager._build_list(None, [{'id': 1}], LegacyResource)
+        self.assertEqual([1], [item.id for item in items])
+
     def test_resource_object_with_request_ids(self):
         resp_obj = create_response_obj_with_header()
         r = base.Resource(None, {"name": "1"}, resp=resp_obj)
@@ -99,6 +244,77 @@ class BaseTest(utils.TestCase):
         self.assertEqual(fakes.FAKE_REQUEST_ID_LIST, r.request_ids)
 
 
+class CompletionCacheTest(utils.TestCase):
+    def setUp(self):
+        super(CompletionCacheTest, self).setUp()
+        self.cache_dir = self.useFixture(fixtures.TempDir()).path
+        self.useFixture(fixtures.EnvironmentVariable(
+            'NOVACLIENT_UUID_CACHE_DIR', self.cache_dir))
+        self.manager = flavors.FlavorManager(mock.Mock(completion_cache=True))
+
+    def _read_cache(self, cache_type):
+        path = self.manager._completion_cache_path(cache_type, flavors.Flavor)
+        self.assertEqual(self.cache_dir,
+                         os.path.dirname(os.path.dirname(path)))
+        with open(path) as f:
+            return f.read().splitlines()
+
+    def test_build_list(self):
+        uuid1 = 'c1d0a4e6-4d23-4f41-b5a4-2a2c7e0e3d1a'
+        uuid2 = 'a6a4b2de-8f0d-4cb8-a0f5-5a0e8a1a5d2b'
+        self.manager._build_list(None, [{'id': uuid1, 'name': 'A b'},
+                                        {'id': 1, 'name': 'c'}])
+        self.assertEqual([uuid1], self._read_cache('uuid'))
+        self.assertEqual(['a-b', 'c'], self._read_cache('human_id'))
+
+        cache_entries = {}
+        self.manager._build_list(None, [{'id': uuid2, 'name': 'd'}],
+                                 cache_entries=cache_entries)
+        self.assertEqual([uuid2], self._read_cache('uuid'))
+        self.assertEqual(['d'], self._read_cache('human_id'))
+
+        # the following pages skip the entries written by the previous ones
+        with mock.patch('six.moves.builtins.open',
+                        wraps=open) as mock_open:
+            self.manager._build_list(None, [{'id': uuid1, 'name': 'd'},
+                                            {'id': uuid1, 'name': 'e'}],
+                                     cache_mode="a",
+                                     cache_entries=cache_entries)
+        self.assertEqual(['a', 'a'],
+                         [c[0][1] for c in mock_open.call_args_list])
+        self.assertEqual([uuid2, uuid1], self._read_cache('uuid'))
+        self.assertEqual(['d', 'e'], self._read_cache('human_id'))
+        self.assertEqual(2, len(os.listdir(os.path.dirname(
+            self.manager._completion_cache_path('uuid', flavors.Flavor)))))
+
+    def test_create(self):
+        uuid1 = 'c1d0a4e6-4d23-4f41-b5a4-2a2c7e0e3d1a'
+        uuid2 = 'a6a4b2de-8f0d-4cb8-a0f5-5a0e8a1a5d2b'
+        self.manager._build_list(None, [{'id': uuid1, 'name': 'a'}])
+        self.manager.api.client.post.side_effect = [
+            (None, {'flavor': {'id': uuid1, 'name': 'a'}}),
+            (None, {'flavor': {'id': uuid2, 'name': 'b'}}),
+            (None, {'flavor': {'id': uuid2, 'name': 'b'}})]
+        for i in range(3):
+            self.manager._create('/flavors', {}, 'flavor')
+        self.assertEqual([uuid1, uuid2], self._read_cache('uuid'))
+        self.assertEqual(['a', 'b'], self._read_cache('human_id'))
+
+    def test_disabled(self):
+        manager = flavors.FlavorManager(mock.Mock(completion_cache=False))
+        manager._build_list(None, [{'id': 1, 'name': 'a'}])
+        self.assertIsNone(manager._completion_cache_path('uuid',
+                                                         flavors.Flavor))
+        self.assertEqual([], os.listdir(self.cache_dir))
+
+    def test_write_to_completion_cache(self):
+        with self.manager.completion_cache('human_id', flavors.Flavor, "w"):
+            self.manager.write_to_completion_cache('human_id', 'a')
+            self.manager.write_to_completion_cache('human_id', 'a')
+            self.manager.write_to_completion_cache('human_id', 'b')
+        self.assertEqual(['a', 'b'], self._read_cache('human_id'))
+
+
 class ListWithMetaTest(utils.TestCase):
     def test_list_with_meta(self):
         resp = create_response_obj_with_header()
@@ -109,6 +325,36 @@ class ListWithMetaTest(utils.TestCase):
         self.assertEqual(fakes.FAKE_REQUEST_ID_LIST, obj.request_ids)
 
 
+class IteratorWithMetaTest(utils.TestCase):
+    def test_iterator_with_meta(self):
+        resp = create_response_obj_with_header()
+        pages = [base.ListWithMeta([1, 2], resp),
+                 base.ListWithMeta([], None),
+                 base.ListWithMeta([3], "req-2")]
+        obj = base.IteratorWithMeta(pages)
+        self.assertEqual([], obj.request_ids)
+        self.assertEqual(1, next(obj))
+        self.assertEqual(fakes.FAKE_REQUEST_ID_LIST, obj.request_ids)
+        self.assertEqual([2, 3], list(obj))
+        self.assertEqual(fakes.FAKE_REQUEST_ID_LIST + ["req-2"],
+                         obj.request_ids)
+
+    def test_iterator_with_meta_close(self):
+        closed = []
+
+        def pages():
+            try:
+                yield base.ListWithMeta([1], None)
+                yield base.ListWithMeta([2], None)
+            finally:
+                closed.append(True)
+
+        obj = base.IteratorWithMeta(pages())
+        self.assertEqual(1, next(obj))
+        obj.close()
+        self.assertEqual([True], closed)
+
+
 class DictWithMetaTest(utils.TestCase):
     def test_dict_with_meta(self):
         resp = create_response_obj_with_header()
@@ -14,13 +14,18 @@
 #    under the License.
 
 import copy
+import threading
 
+import fixtures
 from keystoneauth1 import session
 import mock
+import requests
+import six
 
 import novaclient.api_versions
 import novaclient.client
 import novaclient.extension
+import novaclient.utils
 from novaclient.tests.unit import utils
 import novaclient.v2.client
 
@@ -84,6 +89,187 @@ class SessionClientTest(utils.TestCase):
         mock_log_request_id.assert_called_once_with(client.logger, mock.ANY,
                                                     'compute')
 
+    @mock.patch.object(novaclient.client.time, 'sleep')
+    def test_rate_limited_retry(self, mock_sleep):
+        self.requests_mock.get('http://no.where', [
+            {'status_code': 429, 'headers': {'Retry-After': '3'}},
+            {'status_code': 200, 'json': {}}])
+        client = novaclient.client.SessionClient(session=session.Session(),
+                                                 rate_limit_retries=2)
+
+        resp, _body = client.request("http://no.where", 'GET')
+
+        self.assertEqual(200, resp.status_code)
+        mock_sleep.assert_called_once_with(3)
+        self.assertEqual({'delayed': 0, 'delay': 0.0,
+                          'retried': 1, 'retry_delay': 3},
+                         client.get_throttling())
+
+    @mock.patch.object(novaclient.client.time, 'sleep')
+    def test_rate_limited_retries_exhausted(self, mock_sleep):
+        self.requests_mock.get('http://no.where', status_code=429,
+                               headers={'Retry-After': '1'})
+        client = novaclient.client.SessionClient(session=session.Session(),
+                                                 rate_limit_retries=2)
+
+        e = self.assertRaises(novaclient.exceptions.RateLimit,
+                              client.request, "http://no.where", 'GET')
+
+        self.assertEqual(1, e.retry_after)
+        self.assertEqual(3, self.requests_mock.call_count)
+        self.assertEqual(2, mock_sleep.call_count)
+
+    @mock.patch.object(novaclient.client.time, 'sleep')
+    def test_over_quota_not_retried(self, mock_sleep):
+        self.requests_mock.get('http://no.where', status_code=413)
+        client = novaclient.client.SessionClient(session=session.Session(),
+                                                 rate_limit_retries=2)
+
+        self.assertRaises(novaclient.exceptions.OverLimit,
+                          client.request, "http://no.where", 'GET')
+
+        self.assertEqual(1, self.requests_mock.call_count)
+        self.assertFalse(mock_sleep.called)
+
+    def test_rate_limit(self):
+        self.requests_mock.get('http://no.where')
+        client = novaclient.client.SessionClient(session=session.Session(),
+                                                 rate_limit=10)
+        self.assertIsInstance(client.rate_limiter,
+                              novaclient.utils.TokenBucket)
+
+        with mock.patch.object(client.rate_limiter, 'acquire',
+                               return_value=0.5):
+            client.request("http://no.where", 'GET')
+
+        self.assertEqual({'delayed': 1, 'delay': 0.5,
+                          'retried': 0, 'retry_delay': 0.0},
+                         client.get_throttling())
+        client.reset_throttling()
+        self.assertEqual(0, client.get_throttling()['delayed'])
+
+    def test_rate_limit_threads(self):
+        self.requests_mock.get('http://no.where')
+        client = novaclient.client.SessionClient(session=session.Session(),
+                                                 rate_limit=10)
+
+        def requests():
+            for i in range(20):
+                client.request("http://no.where", 'GET')
+
+        with mock.patch.object(client.rate_limiter, 'acquire',
+                               return_value=0.5):
+            threads = [threading.Thread(target=requests) for i in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual({'delayed': 100, 'delay': 50.0,
+                          'retried': 0, 'retry_delay': 0.0},
+                         client.get_throttling())
+
+    @mock.patch.object(novaclient.client.time, 'sleep')
+    def test_retry_idempotent_request(self, mock_sleep):
+        self.requests_mock.get('http://no.where', [
+            {'status_code': 503},
+            {'exc': requests.exceptions.ConnectionError},
+            {'status_code': 200, 'json': {}}])
+        client = novaclient.client.SessionClient(session=session.Session(),
+                                                 retries=3, timings=True)
+
+        resp, _body = client.request("http://no.where", 'GET')
+
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(2, mock_sleep.call_count)
+        # every attempt is timed
+        self.assertEqual(['GET http://no.where',
+                          'GET http://no.where (attempt 2)',
+                          'GET http://no.where (attempt 3)'],
+                         [t[0] for t in client.get_timings()])
+
+    @mock.patch.object(novaclient.client.time, 'sleep')
+    def test_retry_after_capped(self, mock_sleep):
+        self.requests_mock.get('http://no.where', [
+            {'status_code': 503, 'headers': {'Retry-After': '3600'}},
+            {'status_code': 503, 'headers': {'Retry-After': '2'}},
+            {'status_code': 200, 'json': {}}])
+        client = novaclient.client.SessionClient(session=session.Session(),
+                                                 retries=3)
+
+        resp, _body = client.request("http://no.where", 'GET')
+
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual([mock.call(20), mock.call(2)],
+                         mock_sleep.call_args_list)
+
+    @mock.patch.object(novaclient.client.time, 'sleep')
+    def test_retries_exhausted(self, mock_sleep):
+        self.requests_mock.get('http://no.where', status_code=502)
+        client = novaclient.client.SessionClient(session=session.Session(),
+                                                 retries=2)
+
+        self.assertRaises(novaclient.exceptions.ClientException,
+                          client.request, "http://no.where", 'GET')
+        self.assertEqual(3, self.requests_mock.call_count)
+
+    @mock.patch.object(novaclient.client.time, 'sleep')
+    def test_no_retry_non_idempotent_request(self, mock_sleep):
+        self.requests_mock.post('http://no.where', status_code=503)
+        client = novaclient.client.SessionClient(session=session.Session(),
+                                                 retries=2)
+
+        self.assertRaises(novaclient.exceptions.ClientException,
+                          client.request, "http://no.where", 'POST')
+        self.assertEqual(1, self.requests_mock.call_count)
+        self.assertFalse(mock_sleep.called)
+
+    @mock.patch.object(novaclient.client.time, 'sleep')
+    def test_retry_budget(self, mock_sleep):
+        self.requests_mock.get('http://no.where', status_code=503)
+        client = novaclient.client.SessionClient(session=session.Session(),
+                                                 retries=5)
+        client._retry_budget = 1.5
+
+        self.assertRaises(novaclient.exceptions.ClientException,
+                          client.request, "http://no.where", 'GET')
+        # the budget allowed a single retry
+        self.assertEqual(2, self.requests_mock.call_count)
+
+    def test_connection_pool(self):
+        cs = novaclient.client._construct_http_client(
+            auth_token='token', auth_url='http://no.where',
+            pool_connections=2, pool_maxsize=64, pool_block=True)
+
+        http_adapter = cs.session.session.get_adapter('https://no.where')
+        self.assertIsInstance(http_adapter, session.TCPKeepAliveAdapter)
+        self.assertEqual(2, http_adapter._pool_connections)
+        self.assertEqual(64, http_adapter._pool_maxsize)
+        self.assertTrue(http_adapter._pool_block)
+
+    def test_connection_pool_without_tcp_keepalive(self):
+        cs = novaclient.client._construct_http_client(
+            auth_token='token', auth_url='http://no.where',
+            tcp_keepalive=False)
+
+        http_adapter = cs.session.session.get_adapter('http://no.where')
+        self.assertIs(requests.adapters.HTTPAdapter, type(http_adapter))
+
+    def test_get_pool_stats(self):
+        idle = six.moves.queue.LifoQueue()
+        idle.put(None)
+        idle.put(mock.sentinel.connection)
+        pool = mock.Mock(num_connections=2, num_requests=30, pool=idle)
+        http_adapter = mock.Mock()
+        http_adapter.poolmanager.pools = {'no.where': pool}
+        cs = novaclient.client.SessionClient(session=session.Session())
+        cs.session.session.adapters = {'https://': http_adapter,
+                                       'http://': http_adapter}
+
+        self.assertEqual({'pools': 1, 'connections': 2, 'requests': 30,
+                          'idle': 1},
+                         cs.get_pool_stats())
+
 
 class ClientsUtilsTest(utils.TestCase):
 
@@ -116,6 +302,42 @@ class ClientsUtilsTest(utils.TestCase):
         mock_discover_via_entry_points.assert_called_once_with()
         self.assertEqual([mock_extension()] * 6, result)
 
+    @mock.patch("novaclient.client._get_sys_path_fingerprint")
+    @mock.patch("novaclient.client._discover_via_entry_points")
+    @mock.patch("novaclient.client._discover_via_python_path")
+    def test_discover_extensions_cache(self, mock_discover_via_python_path,
+                                       mock_discover_via_entry_points,
+                                       mock_fingerprint):
+        cache_dir = self.useFixture(fixtures.TempDir()).path
+        module = mock.Mock(__name__="foo_python_novaclient_ext")
+        mock_discover_via_python_path.side_effect = lambda: iter(
+            [("foo", module)])
+        mock_discover_via_entry_points.side_effect = lambda: iter(
+            [("bar", "bar_ext")])
+        mock_fingerprint.return_value = [["/fake/site-packages", 1.0]]
+        version = novaclient.api_versions.APIVersion("2.0")
+
+        result = novaclient.client.discover_extensions(version,
+                                                       cache_dir=cache_dir)
+        self.assertEqual(1, mock_discover_via_python_path.call_count)
+        self.assertEqual(1, mock_discover_via_entry_points.call_count)
+        self.assertIs(module, result[0].module)
+
+        # the extensions are read from the cache and imported lazily
+        result = novaclient.client.discover_extensions(version,
+                                                       cache_dir=cache_dir)
+        self.assertEqual(1, mock_discover_via_python_path.call_count)
+        self.assertEqual(1, mock_discover_via_entry_points.call_count)
+        self.assertEqual(["foo", "bar"], [result[0].name, result[-1].name])
+        self.assertEqual("foo_python_novaclient_ext", result[0].module_name)
+        self.assertIsNone(result[0]._module)
+
+        # the cache is refreshed once a distribution is installed
+        mock_fingerprint.return_value = [["/fake/site-packages", 2.0]]
+        novaclient.client.discover_extensions(version, cache_dir=cache_dir)
+        self.assertEqual(2, mock_discover_via_python_path.call_count)
+        self.assertEqual(2, mock_discover_via_entry_points.call_count)
+
     @mock.patch("novaclient.client._discover_via_entry_points")
     @mock.patch("novaclient.client._discover_via_contrib_path")
     @mock.patch("novaclient.client._discover_via_python_path")
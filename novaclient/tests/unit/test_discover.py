@@ -15,11 +15,13 @@
 
 import imp
 import inspect
+import os
 
 import mock
 import pkg_resources
 
 from novaclient import client
+import novaclient.extension
 from novaclient.tests.unit import utils
 
 
@@ -29,13 +31,13 @@ class DiscoverTest(utils.TestCase):
 
         def mock_iter_entry_points(group):
             if group == 'novaclient.extension':
-                fake_ep = mock.Mock()
+                fake_ep = mock.Mock(value='foo:extension')
                 fake_ep.name = 'foo'
                 fake_ep.module = imp.new_module('foo')
                 fake_ep.load.return_value = fake_ep.module
                 return [fake_ep]
 
-        @mock.patch.object(pkg_resources, 'iter_entry_points',
+        @mock.patch.object(client, '_iter_entry_points',
                            mock_iter_entry_points)
         def test():
             for name, module in client._discover_via_entry_points():
@@ -44,6 +46,61 @@ class DiscoverTest(utils.TestCase):
 
         test()
 
+    def test_discover_via_entry_points_lazy(self):
+        fake_ep = mock.Mock(value='foo_python_novaclient_ext')
+        fake_ep.name = 'foo'
+
+        with mock.patch.object(client, '_iter_entry_points',
+                               return_value=[fake_ep]):
+            self.assertEqual([('foo', 'foo_python_novaclient_ext')],
+                             list(client._discover_via_entry_points()))
+        self.assertFalse(fake_ep.load.called)
+
+    @mock.patch.object(client, 'importlib_metadata', None)
+    def test_discover_via_entry_points_pkg_resources(self):
+
+        def mock_iter_entry_points(group):
+            if group == 'novaclient.extension':
+                fake_ep = mock.Mock(spec=['name', 'module_name', 'attrs'],
+                                    module_name='foo_python_novaclient_ext',
+                                    attrs=())
+                fake_ep.name = 'foo'
+                return [fake_ep]
+
+        with mock.patch.object(pkg_resources, 'iter_entry_points',
+                               mock_iter_entry_points):
+            self.assertEqual([('foo', 'foo_python_novaclient_ext')],
+                             list(client._discover_via_entry_points()))
+
+    def test_lazy_extension(self):
+        extension = novaclient.extension.Extension(
+            'tenant_networks', 'novaclient.v2.contrib.tenant_networks')
+        self.assertIsNone(extension._module)
+        from novaclient.v2.contrib import tenant_networks
+        self.assertEqual(tenant_networks.TenantNetworkManager,
+                         extension.manager_class)
+        self.assertIs(tenant_networks, extension.module)
+
+    @mock.patch('os.path.getmtime', return_value=1234.5)
+    def test_lazy_extension_version(self, mock_getmtime):
+        extension = novaclient.extension.Extension(
+            'baremetal', 'novaclient.v2.contrib.baremetal')
+        self.assertEqual('1234.5', extension.version)
+        self.assertIsNone(extension._module)
+        self.assertTrue(mock_getmtime.call_args[0][0].endswith(
+            os.path.join('contrib', 'baremetal.py')))
+
+    def test_extension_version(self):
+        module = imp.new_module('foo')
+        module.__version__ = '1.2'
+        extension = novaclient.extension.Extension('foo', module)
+        self.assertEqual('1.2', extension.version)
+
+    def test_extension_version_unknown_module(self):
+        extension = novaclient.extension.Extension(
+            'foo', 'foo_python_novaclient_ext')
+        self.assertIsNone(extension.version)
+
     def test_discover_extensions(self):
 
         def mock_discover_via_python_path():
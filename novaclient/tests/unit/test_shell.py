@@ -13,6 +13,7 @@
 
 import argparse
 import distutils.version as dist_version
+import os
 import re
 import sys
 
@@ -372,11 +373,15 @@ class ShellTest(utils.TestCase):
             'novaclient.api_versions._get_server_version_range').start()
         self.mock_server_version_range.return_value = (
             novaclient.API_MIN_VERSION,
-            novaclient.API_MIN_VERSION)
+            novaclient.API_MIN_VERSION, False)
         self.orig_max_ver = novaclient.API_MAX_VERSION
         self.orig_min_ver = novaclient.API_MIN_VERSION
         self.addCleanup(self._clear_fake_version)
         self.addCleanup(mock.patch.stopall)
+        self.cache_dir = self.useFixture(fixtures.TempDir()).path
+        self.useFixture(fixtures.MonkeyPatch(
+            'novaclient.shell._cache_path',
+            lambda *parts: os.path.join(self.cache_dir, *parts)))
 
     def _clear_fake_version(self):
         novaclient.API_MAX_VERSION = self.orig_max_ver
@@ -465,6 +470,51 @@ class ShellTest(utils.TestCase):
             self.assertThat((stdout + stderr),
                             matchers.MatchesRegex(r, re.DOTALL | re.MULTILINE))
 
+    def test_bash_completion_from_command_index(self):
+        expected = self.shell('bash-completion')
+        with mock.patch.object(novaclient.shell.OpenStackComputeShell,
+                               'get_subcommand_parser') as mock_parser:
+            self.assertEqual(expected, self.shell('bash-completion'))
+        self.assertFalse(mock_parser.called)
+
+    def test_help_on_subcommand_from_command_index(self):
+        expected = self.shell('help list')
+        with mock.patch.object(novaclient.shell.OpenStackComputeShell,
+                               'get_subcommand_parser') as mock_parser:
+            self.assertEqual(expected, self.shell('help list'))
+        self.assertFalse(mock_parser.called)
+
+    @mock.patch.object(novaclient.shell.OpenStackComputeShell,
+                       'get_subcommand_parser', autospec=True)
+    def test_command_index_rebuilt_on_new_version(self, mock_parser):
+        mock_parser.side_effect = self._build_subcommands
+        self.shell('bash-completion')
+        self.shell('bash-completion')
+        self.assertEqual(1, mock_parser.call_count)
+
+        with mock.patch.object(novaclient, '__version__', 'x.y.z'):
+            self.shell('bash-completion')
+        self.assertEqual(2, mock_parser.call_count)
+
+    @mock.patch.object(novaclient.shell.OpenStackComputeShell,
+                       'get_subcommand_parser', autospec=True)
+    def test_command_index_rebuilt_on_upgraded_extension(self, mock_parser):
+        mock_parser.side_effect = self._build_subcommands
+        with mock.patch.object(novaclient.extension.Extension, 'version',
+                               '1.0'):
+            self.shell('bash-completion')
+            self.shell('bash-completion')
+        self.assertEqual(1, mock_parser.call_count)
+
+        with mock.patch.object(novaclient.extension.Extension, 'version',
+                               '1.1'):
+            self.shell('bash-completion')
+        self.assertEqual(2, mock_parser.call_count)
+
+    @staticmethod
+    def _build_subcommands(shell, version, do_help=False, argv=None):
+        shell.subcommands = {'list': argparse.ArgumentParser()}
+
     def test_no_username(self):
         required = ('You must provide a username or user ID'
                     ' via --os-username, --os-user-id,'
@@ -554,6 +604,28 @@ class ShellTest(utils.TestCase):
         client_kwargs = mock_client.call_args_list[0][1]
         self.assertEqual(client_kwargs['endpoint_type'], 'publicURL')
 
+    @mock.patch('novaclient.client.Client')
+    def test_retries(self, mock_client):
+        self.make_env()
+        self.shell('--retries 3 list')
+        client_kwargs = mock_client.call_args_list[0][1]
+        self.assertEqual(3, client_kwargs['retries'])
+
+    @mock.patch('novaclient.client.Client')
+    def test_retries_from_env(self, mock_client):
+        self.make_env(fake_env=dict(FAKE_ENV, OS_COMPUTE_RETRIES='2'))
+        self.shell('list')
+        client_kwargs = mock_client.call_args_list[0][1]
+        self.assertEqual(2, client_kwargs['retries'])
+
+    @mock.patch('novaclient.client.Client')
+    def test_retries_override_invalid_env(self, mock_client):
+        # the default from the environment is only parsed when it is used
+        self.make_env(fake_env=dict(FAKE_ENV, OS_COMPUTE_RETRIES='many'))
+        self.shell('--retries 3 list')
+        client_kwargs = mock_client.call_args_list[0][1]
+        self.assertEqual(3, client_kwargs['retries'])
+
     @mock.patch('sys.stdin', side_effect=mock.MagicMock)
     @mock.patch('getpass.getpass', return_value='password')
     @requests_mock.Mocker()
@@ -675,45 +747,86 @@ class ShellTest(utils.TestCase):
         keyring_saver = mock_client_instance.client.keyring_saver
         self.assertIsInstance(keyring_saver, novaclient.shell.SecretsHelper)
 
+    @mock.patch.object(novaclient.shell, 'HAS_KEYRING', True)
+    @mock.patch.object(novaclient.shell, 'keyring', create=True)
+    def test_secrets_helper_reads_keyring_once(self, mock_keyring):
+        mock_keyring.get_password.return_value = 'token|http://nova|tenant'
+        args = mock.Mock(os_cache=True)
+        helper = novaclient.shell.SecretsHelper(args, mock.MagicMock())
+        self.assertEqual('token', helper.auth_token)
+        self.assertEqual('http://nova', helper.management_url)
+        self.assertEqual('tenant', helper.tenant_id)
+        self.assertEqual(1, mock_keyring.get_password.call_count)
+
+        helper.save('new-token', 'http://nova', 'tenant')
+        self.assertEqual(1, mock_keyring.set_password.call_count)
+        self.assertEqual('new-token', helper.auth_token)
+        self.assertEqual(1, mock_keyring.get_password.call_count)
+
     @mock.patch('novaclient.client.Client')
     def test_microversion_with_default_behaviour(self, mock_client):
         self.make_env(fake_env=FAKE_ENV5)
         self.mock_server_version_range.return_value = (
-            api_versions.APIVersion("2.1"), api_versions.APIVersion("2.3"))
+            api_versions.APIVersion("2.1"), api_versions.APIVersion("2.3"),
+            False)
         self.shell('list')
-        client_args = mock_client.call_args_list[1][0]
-        self.assertEqual(api_versions.APIVersion("2.3"), client_args[0])
+        self.assertEqual(1, mock_client.call_count)
+        self.assertEqual(api_versions.APIVersion("2.3"),
+                         mock_client.return_value.api_version)
+
+    @mock.patch('novaclient.client.Client')
+    def test_unauthenticated_command(self, mock_client):
+        self.make_env(fake_env=FAKE_ENV5)
+        self.nc_util.return_value = True
+        self.mock_server_version_range.return_value = (
+            api_versions.APIVersion("2.1"), api_versions.APIVersion("2.3"),
+            False)
+        self.shell('list')
+        # the version is discovered with the session, the command is run
+        # without it
+        self.assertEqual(2, mock_client.call_count)
+        self.assertIsNotNone(mock_client.call_args_list[0][1]['auth'])
+        self.assertEqual(api_versions.APIVersion("2.3"),
+                         mock_client.call_args_list[1][0][0])
+        self.assertIsNone(mock_client.call_args_list[1][1]['session'])
+        self.assertIsNone(mock_client.call_args_list[1][1]['auth'])
 
     @mock.patch('novaclient.client.Client')
     def test_microversion_with_default_behaviour_with_legacy_server(
             self, mock_client):
         self.make_env(fake_env=FAKE_ENV5)
         self.mock_server_version_range.return_value = (
-            api_versions.APIVersion(), api_versions.APIVersion())
+            api_versions.APIVersion(), api_versions.APIVersion(),
+            False)
         self.shell('list')
-        client_args = mock_client.call_args_list[1][0]
-        self.assertEqual(api_versions.APIVersion("2.0"), client_args[0])
+        self.assertEqual(1, mock_client.call_count)
+        self.assertEqual(api_versions.APIVersion("2.0"),
+                         mock_client.return_value.api_version)
 
     @mock.patch('novaclient.client.Client')
     def test_microversion_with_latest(self, mock_client):
         self.make_env()
         novaclient.API_MAX_VERSION = api_versions.APIVersion('2.3')
         self.mock_server_version_range.return_value = (
-            api_versions.APIVersion("2.1"), api_versions.APIVersion("2.3"))
+            api_versions.APIVersion("2.1"), api_versions.APIVersion("2.3"),
+            False)
         self.shell('--os-compute-api-version 2.latest list')
-        client_args = mock_client.call_args_list[1][0]
-        self.assertEqual(api_versions.APIVersion("2.3"), client_args[0])
+        self.assertEqual(1, mock_client.call_count)
+        self.assertEqual(api_versions.APIVersion("2.3"),
+                         mock_client.return_value.api_version)
 
     @mock.patch('novaclient.client.Client')
     def test_microversion_with_specified_version(self, mock_client):
         self.make_env()
         self.mock_server_version_range.return_value = (
-            api_versions.APIVersion("2.10"), api_versions.APIVersion("2.100"))
+            api_versions.APIVersion("2.10"), api_versions.APIVersion("2.100"),
+            False)
         novaclient.API_MAX_VERSION = api_versions.APIVersion("2.100")
         novaclient.API_MIN_VERSION = api_versions.APIVersion("2.90")
         self.shell('--os-compute-api-version 2.99 list')
-        client_args = mock_client.call_args_list[1][0]
-        self.assertEqual(api_versions.APIVersion("2.99"), client_args[0])
+        self.assertEqual(1, mock_client.call_count)
+        self.assertEqual(api_versions.APIVersion("2.99"),
+                         mock_client.return_value.api_version)
 
     @mock.patch('novaclient.client.Client')
     def test_microversion_with_specified_version_out_of_range(self,
@@ -727,29 +840,34 @@ class ShellTest(utils.TestCase):
     def test_microversion_with_v2_and_v2_1_server(self, mock_client):
         self.make_env()
         self.mock_server_version_range.return_value = (
-            api_versions.APIVersion('2.1'), api_versions.APIVersion('2.3'))
+            api_versions.APIVersion('2.1'), api_versions.APIVersion('2.3'),
+            False)
         novaclient.API_MAX_VERSION = api_versions.APIVersion("2.100")
         novaclient.API_MIN_VERSION = api_versions.APIVersion("2.1")
         self.shell('--os-compute-api-version 2 list')
-        client_args = mock_client.call_args_list[1][0]
-        self.assertEqual(api_versions.APIVersion("2.0"), client_args[0])
+        self.assertEqual(1, mock_client.call_count)
+        self.assertEqual(api_versions.APIVersion("2.0"),
+                         mock_client.return_value.api_version)
 
     @mock.patch('novaclient.client.Client')
     def test_microversion_with_v2_and_v2_server(self, mock_client):
         self.make_env()
         self.mock_server_version_range.return_value = (
-            api_versions.APIVersion(), api_versions.APIVersion())
+            api_versions.APIVersion(), api_versions.APIVersion(),
+            False)
         novaclient.API_MAX_VERSION = api_versions.APIVersion("2.100")
         novaclient.API_MIN_VERSION = api_versions.APIVersion("2.1")
         self.shell('--os-compute-api-version 2 list')
-        client_args = mock_client.call_args_list[1][0]
-        self.assertEqual(api_versions.APIVersion("2.0"), client_args[0])
+        self.assertEqual(1, mock_client.call_count)
+        self.assertEqual(api_versions.APIVersion("2.0"),
+                         mock_client.return_value.api_version)
 
     @mock.patch('novaclient.client.Client')
     def test_microversion_with_v2_without_server_compatible(self, mock_client):
         self.make_env()
         self.mock_server_version_range.return_value = (
-            api_versions.APIVersion('2.2'), api_versions.APIVersion('2.3'))
+            api_versions.APIVersion('2.2'), api_versions.APIVersion('2.3'),
+            False)
         novaclient.API_MAX_VERSION = api_versions.APIVersion("2.100")
         novaclient.API_MIN_VERSION = api_versions.APIVersion("2.1")
         self.assertRaises(
@@ -759,7 +877,8 @@ class ShellTest(utils.TestCase):
     def test_microversion_with_specific_version_without_microversions(self):
         self.make_env()
         self.mock_server_version_range.return_value = (
-            api_versions.APIVersion(), api_versions.APIVersion())
+            api_versions.APIVersion(), api_versions.APIVersion(),
+            False)
         novaclient.API_MAX_VERSION = api_versions.APIVersion("2.100")
         novaclient.API_MIN_VERSION = api_versions.APIVersion("2.1")
         self.assertRaises(
@@ -767,6 +886,20 @@ class ShellTest(utils.TestCase):
             self.shell,
             '--os-compute-api-version 2.3 list')
 
+    @mock.patch('novaclient.client.Client')
+    def test_microversion_version_cache(self, mock_client):
+        self.make_env()
+        self.shell('--version-cache-ttl 60 list')
+        version_cache = (
+            self.mock_server_version_range.call_args[1]['version_cache'])
+        self.assertEqual(60, version_cache.ttl)
+        self.assertEqual(os.path.join(self.cache_dir, 'versions'),
+                         version_cache.cache_dir)
+
+        self.shell('--version-cache-ttl 0 list')
+        self.assertIsNone(
+            self.mock_server_version_range.call_args[1]['version_cache'])
+
     @mock.patch.object(novaclient.shell.OpenStackComputeShell, 'main')
     def test_main_error_handling(self, mock_compute_shell):
         class MyException(Exception):
@@ -920,6 +1053,39 @@ class TestLoadVersionedActions(utils.TestCase):
                       mock_add_arg.call_args_list)
 
 
+class TestSubcommandParser(utils.TestCase):
+
+    def setUp(self):
+        super(TestSubcommandParser, self).setUp()
+        self.shell = novaclient.shell.OpenStackComputeShell()
+        self.shell.extensions = []
+        self.version = api_versions.APIVersion("2.1")
+
+    def test_only_selected_command(self):
+        parser = self.shell.get_subcommand_parser(
+            self.version, argv=['--debug', 'list', '--all-tenants'])
+        self.assertEqual(set(['list', 'bash_completion']),
+                         set(self.shell.subcommands))
+        args = parser.parse_args(['list', '--all-tenants'])
+        self.assertEqual('list', args.func.__name__[3:])
+
+    def test_all_commands_for_help(self):
+        self.shell.get_subcommand_parser(self.version, do_help=True,
+                                         argv=['help', 'list'])
+        self.assertIn('show', self.shell.subcommands)
+        self.assertIn('help', self.shell.subcommands)
+
+    def test_all_commands_for_bash_completion(self):
+        self.shell.get_subcommand_parser(self.version,
+                                         argv=['bash-completion'])
+        self.assertIn('show', self.shell.subcommands)
+
+    def test_all_commands_for_unknown_command(self):
+        self.shell.get_subcommand_parser(self.version, argv=['lst'])
+        self.assertIn('list', self.shell.subcommands)
+        self.assertNotIn('lst', self.shell.subcommands)
+
+
 class ShellTestKeystoneV3(ShellTest):
     def make_env(self, exclude=None, fake_env=FAKE_ENV):
         if 'OS_AUTH_URL' in fake_env:
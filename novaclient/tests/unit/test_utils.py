@@ -12,6 +12,7 @@
 #    under the License.
 
 import sys
+import threading
 
 import mock
 from oslo_utils import encodeutils
@@ -23,6 +24,7 @@ from novaclient import exceptions
 from novaclient.tests.unit import fakes
 from novaclient.tests.unit import utils as test_utils
 from novaclient import utils
+from novaclient.v2 import limits
 
 UUID = '8e8ec658-c7b0-4243-bdf8-6f7f2952c0d0'
 
@@ -168,6 +170,28 @@ class FindResourceTestCase(test_utils.TestCase):
         self.assertRaises(exceptions.NoUniqueMatch, utils.find_resource,
                           alphanum_manager, res.name, wrap_exception=False)
 
+    def test_find_cached(self):
+        self.manager.api = mock.Mock(lookup_cache=utils.LookupCache(ttl=60))
+        self.manager.cache_lookups = True
+        with mock.patch.object(self.manager, 'list',
+                               wraps=self.manager.list) as mock_list:
+            output = utils.find_resource(self.manager, 'entity_two')
+            # the resource is cached by name and by ID
+            self.assertIs(output,
+                          utils.find_resource(self.manager, 'entity_two'))
+            self.assertIs(output, utils.find_resource(self.manager, UUID))
+        self.assertEqual(1, mock_list.call_count)
+        self.assertEqual({'hits': 2, 'misses': 1, 'entries': 2},
+                         self.manager.api.lookup_cache.stats())
+
+    def test_find_not_cached(self):
+        self.manager.api = mock.Mock(lookup_cache=utils.LookupCache(ttl=60))
+        with mock.patch.object(self.manager, 'list',
+                               wraps=self.manager.list) as mock_list:
+            utils.find_resource(self.manager, 'entity_two')
+            utils.find_resource(self.manager, 'entity_two')
+        self.assertEqual(2, mock_list.call_count)
+
 
 class _FakeResult(object):
     def __init__(self, name, value):
@@ -268,6 +292,83 @@ class PrintResultTestCase(test_utils.TestCase):
                          '+------+-------+\n',
                          sys.stdout.getvalue())
 
+    def _set_output_format(self, output_format):
+        utils.set_output_format(output_format)
+        self.addCleanup(utils.set_output_format, 'table')
+
+    @mock.patch('sys.stdout', six.StringIO())
+    def test_print_list_json(self):
+        self._set_output_format('json')
+        objs = [_FakeResult("k3", 3), _FakeResult("k1", None)]
+
+        utils.print_list(objs, ["Name", "Value"], sortby_index=0)
+
+        self.assertEqual('{"Name": "k3", "Value": 3}\n'
+                         '{"Name": "k1", "Value": null}\n',
+                         sys.stdout.getvalue())
+
+    @mock.patch('sys.stdout', six.StringIO())
+    def test_print_list_csv(self):
+        self._set_output_format('csv')
+        objs = [_FakeResult("k3", 'a,b'), _FakeResult("k1", None)]
+
+        utils.print_list(objs, ["Name", "Value"],
+                         formatters={'Name': lambda o: o.name.upper()})
+
+        self.assertEqual('Name,Value\n'
+                         'K3,"a,b"\n'
+                         'K1,-\n',
+                         sys.stdout.getvalue())
+
+    @mock.patch('sys.stdout', six.StringIO())
+    def test_print_list_stream(self):
+        self._set_output_format('stream')
+        objs = [_FakeResult("k1", 1),
+                _FakeResult("k2", 'two\nlines'),
+                _FakeResult("key3", 3)]
+
+        with mock.patch.object(utils.StreamingTableFormatter,
+                               'sample_size', 2):
+            utils.print_list(objs, ["Name", "Value"])
+
+        # the last row is not in the sample sizing the columns
+        self.assertEqual('+------+-------+\n'
+                         '| Name | Value |\n'
+                         '+------+-------+\n'
+                         '| k1   | 1     |\n'
+                         '| k2   | two   |\n'
+                         '|      | lines |\n'
+                         '| key3 | 3     |\n'
+                         '+------+-------+\n',
+                         sys.stdout.getvalue())
+
+    @mock.patch('sys.stdout', six.StringIO())
+    def test_print_list_stream_iterator(self):
+        self._set_output_format('stream')
+        printed = []
+
+        def _objs():
+            for obj in [_FakeResult("k1", 1), _FakeResult("k2", 2)]:
+                printed.append(sys.stdout.getvalue())
+                yield obj
+
+        with mock.patch.object(utils.StreamingTableFormatter,
+                               'sample_size', 1):
+            utils.print_list(_objs(), ["Name", "Value"])
+
+        # the first row is printed before the second object is produced
+        self.assertEqual(['', '+------+-------+\n'
+                              '| Name | Value |\n'
+                              '+------+-------+\n'
+                              '| k1   | 1     |\n'], printed)
+
+    def test_list_formatter_abstract(self):
+        self.assertRaises(TypeError, utils.ListFormatter, ["Name"])
+
+    def test_set_output_format_invalid(self):
+        self.assertRaises(exceptions.CommandError,
+                          utils.set_output_format, 'yaml')
+
     @mock.patch('sys.stdout', six.StringIO())
     def test_print_dict_dictionary(self):
         dict = {'k': {'foo': 'bar'}}
@@ -422,6 +523,130 @@ class DoActionOnManyTestCase(test_utils.TestCase):
     def test_do_action_on_many_last_fails(self):
         self._test_do_action_on_many([None, Exception()], fail=True)
 
+    @mock.patch('sys.stdout', new_callable=six.StringIO)
+    def test_do_action_on_many_parallel(self, mock_stdout):
+        started = []
+        barrier = threading.Event()
+
+        def action(resource):
+            started.append(resource)
+            if len(started) == 3:
+                barrier.set()
+            # all the resources are processed at the same time
+            if not barrier.wait(5):
+                raise Exception('not concurrent')
+            if resource == 2:
+                raise Exception('failed with %s' % resource)
+
+        self.assertRaises(exceptions.CommandError,
+                          utils.do_action_on_many,
+                          action, [1, 2, 3], 'success with %s', 'error',
+                          parallel=3)
+        self.assertEqual(set([1, 2, 3]), set(started))
+        # the results are reported in the order of the resources
+        self.assertEqual(
+            ['success with 1',
+             str(encodeutils.safe_encode('failed with 2')),
+             'success with 3'],
+            mock_stdout.getvalue().splitlines())
+
+
+class BackoffTestCase(test_utils.TestCase):
+
+    def test_next_period(self):
+        backoff = utils.Backoff(min_period=1, max_period=5, factor=2,
+                                jitter=0)
+        self.assertEqual([1, 2, 4, 5, 5],
+                         [backoff.next_period() for i in range(5)])
+        backoff.reset()
+        self.assertEqual(1, backoff.next_period())
+
+    def test_jitter(self):
+        backoff = utils.Backoff(min_period=10, jitter=0.5)
+        with mock.patch('random.uniform', return_value=1.3) as mock_uniform:
+            self.assertEqual(13, backoff.next_period())
+        mock_uniform.assert_called_once_with(0.5, 1.5)
+
+
+class TokenBucketTestCase(test_utils.TestCase):
+
+    @mock.patch.object(utils.time, 'sleep')
+    @mock.patch.object(utils.time, 'time', return_value=100.0)
+    def test_acquire(self, mock_time, mock_sleep):
+        bucket = utils.TokenBucket(2)
+        # the burst goes through, then the requests are spaced out
+        self.assertEqual([0, 0, 0.5, 1.0],
+                         [bucket.acquire() for i in range(4)])
+        mock_time.return_value = 102.0
+        self.assertEqual(0, bucket.acquire())
+        self.assertEqual([mock.call(0.5), mock.call(1.0)],
+                         mock_sleep.call_args_list)
+
+    @mock.patch.object(utils.time, 'sleep')
+    @mock.patch.object(utils.time, 'time', return_value=100.0)
+    def test_hold(self, mock_time, mock_sleep):
+        bucket = utils.TokenBucket(1)
+        bucket.hold(3)
+        self.assertEqual(4, bucket.acquire())
+
+    def test_from_rate_limits(self):
+        rate_limits = [
+            limits.RateLimit('POST', '*', '.*', 10, 2, 'MINUTE', None),
+            limits.RateLimit('GET', '*', '.*', 120, 2, 'MINUTE', None)]
+        bucket = utils.TokenBucket.from_rate_limits(rate_limits)
+        self.assertAlmostEqual(10 / 60.0, bucket.rate)
+        self.assertIsNone(utils.TokenBucket.from_rate_limits([]))
+
+
+class LookupCacheTestCase(test_utils.TestCase):
+
+    def setUp(self):
+        super(LookupCacheTestCase, self).setUp()
+        self.find = mock.Mock(side_effect=lambda name: mock.Mock(id='42'))
+
+    @mock.patch.object(utils.time, 'time', return_value=100.0)
+    def test_ttl(self, mock_time):
+        cache = utils.LookupCache(ttl=10)
+        found = cache.get_or_find('Flavor', 'tiny', self.find)
+        self.assertIs(found, cache.get_or_find('Flavor', 'tiny', self.find))
+        self.assertIs(found, cache.get_or_find('Flavor', '42', self.find))
+        self.assertEqual(1, self.find.call_count)
+
+        mock_time.return_value = 111.0
+        self.assertIsNot(found, cache.get_or_find('Flavor', 'tiny',
+                                                  self.find))
+        self.assertEqual(2, self.find.call_count)
+        self.assertEqual({'hits': 2, 'misses': 2, 'entries': 2},
+                         cache.stats())
+
+    def test_disabled(self):
+        cache = utils.LookupCache()
+        cache.get_or_find('Flavor', 'tiny', self.find)
+        cache.get_or_find('Flavor', 'tiny', self.find)
+        self.assertEqual(2, self.find.call_count)
+        self.assertEqual(0, cache.stats()['entries'])
+
+    def test_invalidate(self):
+        cache = utils.LookupCache(ttl=60)
+        cache.get_or_find('Flavor', 'tiny', self.find)
+        cache.get_or_find('Image', 'cirros', self.find)
+
+        cache.invalidate('Flavor')
+        cache.get_or_find('Flavor', 'tiny', self.find)
+        cache.get_or_find('Image', 'cirros', self.find)
+        self.assertEqual(3, self.find.call_count)
+
+        cache.invalidate()
+        self.assertEqual(0, cache.stats()['entries'])
+
+    def test_errors_not_cached(self):
+        cache = utils.LookupCache(ttl=60)
+        self.find.side_effect = exceptions.NotFound(404)
+        for i in range(2):
+            self.assertRaises(exceptions.NotFound, cache.get_or_find,
+                              'Flavor', 'tiny', self.find)
+        self.assertEqual(2, self.find.call_count)
+
 
 class RecordTimeTestCase(test_utils.TestCase):
 
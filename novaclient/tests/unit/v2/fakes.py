@@ -60,7 +60,9 @@ class FakeClient(fakes.FakeClient, client.Client):
         client.Client.__init__(self, username='username', password='password',
                                project_id='project_id', auth_url='auth_url',
                                extensions=kwargs.get('extensions'),
-                               direct_use=False, api_version=api_version)
+                               direct_use=False, api_version=api_version,
+                               lookup_cache_ttl=kwargs.pop(
+                                   'lookup_cache_ttl', 0))
         self.client = FakeSessionClient(api_version=api_version, **kwargs)
 
 
@@ -956,6 +958,9 @@ class FakeSessionClient(base_client.SessionClient):
             200, {},
             {'extra_specs': {"k3": "v3"}})
 
+    def get_flavors_3_os_extra_specs(self, **kw):
+        raise exceptions.NotFound('404')
+
     def get_flavors_4_os_extra_specs(self, **kw):
         return (
             200,
@@ -1148,6 +1153,13 @@ class FakeSessionClient(base_client.SessionClient):
             }
         ]})
 
+    def get_images(self, **kw):
+        images = self.get_images_detail()[2]['images']
+        if kw.get('id', '').startswith('in:'):
+            image_ids = kw['id'][3:].split(',')
+            images = [i for i in images if i['id'] in image_ids]
+        return (200, {}, {'images': images})
+
     def get_images_555cae93_fb41_4145_9c52_f5b923538a26(self, **kw):
         return (200, {}, {'image': self.get_images_detail()[2]['images'][0]})
 
@@ -246,6 +246,38 @@ class FlavorsTest(utils.TestCase):
         for key in invalid_keys:
             self.assertRaises(exceptions.CommandError, f.set_keys, {key: 'v1'})
 
+    def test_get_extra_specs(self):
+        fl = self.cs.flavors.list()
+        missing = self.flavor_type(self.cs.flavors, {'id': 3}, loaded=True)
+        with mock.patch.object(
+                flavors.utils, 'imap_concurrently',
+                wraps=flavors.utils.imap_concurrently) as mock_imap:
+            extra_specs = self.cs.flavors.get_extra_specs(fl + [missing])
+
+        self.assertEqual({1: {'k1': 'v1'}, 4: {'k4': 'v4'},
+                          'aa1': {'k3': 'v3'}}, extra_specs)
+        self.assertEqual(10, mock_imap.call_args[0][2])
+        self.assertEqual(
+            sorted(['/flavors/1/os-extra_specs', '/flavors/3/os-extra_specs',
+                    '/flavors/4/os-extra_specs',
+                    '/flavors/aa1/os-extra_specs']),
+            sorted(url for _method, url, _body in self.cs.client.callstack
+                   if url.endswith('os-extra_specs')))
+
+    def test_get_extra_specs_not_kept(self):
+        f = self.cs.flavors.get(1)
+        # a flavor given twice is fetched once
+        self.assertEqual({1: {'k1': 'v1'}},
+                         self.cs.flavors.get_extra_specs([f, f]))
+        self.assertEqual(1, [url for _method, url, _body
+                             in self.cs.client.callstack].count(
+                                 '/flavors/1/os-extra_specs'))
+
+        # the extra specs are fetched again by the next call
+        self.cs.client.callstack = []
+        self.cs.flavors.get_extra_specs([f])
+        self.cs.assert_called('GET', '/flavors/1/os-extra_specs')
+
     @mock.patch.object(flavors.FlavorManager, '_delete')
     def test_unset_keys(self, mock_delete):
         f = self.cs.flavors.get(1)
@@ -41,6 +41,13 @@ class HypervisorsTest(utils.FixturedTestCase):
         for idx, hyper in enumerate(result):
             self.compare_to_expected(expected[idx], hyper)
 
+    def test_hypervisor_iter_unpaginated(self):
+        self.cs.api_version = api_versions.APIVersion('2.32')
+        result = self.cs.hypervisors.iter(False)
+        self.assertEqual([1234, 5678], [h.id for h in result])
+        self.assert_request_id(result, fakes.FAKE_REQUEST_ID_LIST)
+        self.assert_called('GET', '/os-hypervisors')
+
     def test_hypervisor_detail(self):
         expected = [
             dict(id=1234,
@@ -193,6 +200,19 @@ class HypervisorsV233Test(HypervisorsTest):
         super(HypervisorsV233Test, self).setUp()
         self.cs.api_version = api_versions.APIVersion("2.33")
 
+    def test_hypervisor_iter(self):
+        self.requests_mock.get(
+            self.data_fixture.url('detail', marker=2),
+            json={'hypervisors': []}, headers=self.data_fixture.json_headers,
+            complete_qs=True)
+
+        result = self.cs.hypervisors.iter()
+        self.assertEqual([1234, 2], [h.id for h in result])
+        self.assert_request_id(result, fakes.FAKE_REQUEST_ID_LIST)
+        self.assertEqual('/os-hypervisors/detail',
+                         self.requests_mock.request_history[-2].path_url)
+        self.assert_called('GET', '/os-hypervisors/detail?marker=2')
+
     def test_use_limit_marker_params(self):
         params = {'limit': '10', 'marker': 'fake-marker'}
         self.cs.hypervisors.list(**params)
@@ -121,3 +121,28 @@ class ImagesTest(utils.FixturedTestCase):
         self.assertRaises(exceptions.VersionNotFoundForAPIMethod,
                           self.cs.images.set_meta, 1,
                           {'test_key': 'test_value'})
+
+
+class GlanceManagerTest(utils.TestCase):
+
+    def setUp(self):
+        super(GlanceManagerTest, self).setUp()
+        self.cs = fakes.FakeClient(api_versions.APIVersion("2.1"))
+
+    def test_list_by_ids(self):
+        missing_id = '3e861307-73a6-4d1f-8d68-f68b03223032'
+        with mock.patch.object(self.cs.glance, '_list_max_ids_filter', 2):
+            il = self.cs.glance.list_by_ids([fakes.FAKE_IMAGE_UUID_2,
+                                             fakes.FAKE_IMAGE_UUID_1,
+                                             missing_id,
+                                             fakes.FAKE_IMAGE_UUID_2])
+
+        self.assertEqual(
+            [('GET', '/v2/images?id=in:%s,%s&limit=2' % (
+                missing_id, fakes.FAKE_IMAGE_UUID_1), None),
+             ('GET', '/v2/images?id=in:%s&limit=1' % fakes.FAKE_IMAGE_UUID_2,
+              None)],
+            self.cs.client.callstack)
+        self.assertEqual(
+            sorted([fakes.FAKE_IMAGE_UUID_1, fakes.FAKE_IMAGE_UUID_2]),
+            sorted(i.id for i in il))
@@ -35,6 +35,13 @@ class KeypairsTest(utils.FixturedTestCase):
     def _get_keypair_prefix(self):
         return keypairs.KeypairManager.keypair_prefix
 
+    def test_iter_keypairs_unpaginated(self):
+        self.cs.api_version = api_versions.APIVersion('2.34')
+        kps = self.cs.keypairs.iter()
+        self.assertEqual(['test'], [kp.name for kp in kps])
+        self.assert_request_id(kps, fakes.FAKE_REQUEST_ID_LIST)
+        self.assert_called('GET', '/%s' % self.keypair_prefix)
+
     def test_get_keypair(self):
         kp = self.cs.keypairs.get('test')
         self.assert_request_id(kp, fakes.FAKE_REQUEST_ID_LIST)
@@ -127,3 +134,17 @@ class KeypairsV35TestCase(KeypairsTest):
                            % self.keypair_prefix)
         for kp in kps:
             self.assertIsInstance(kp, keypairs.Keypair)
+
+    def test_iter_keypairs(self):
+        self.requests_mock.get(
+            self.data_fixture.url(marker='test', limit=1),
+            json={'keypairs': []}, headers=self.data_fixture.json_headers,
+            complete_qs=True)
+
+        kps = self.cs.keypairs.iter(limit=1)
+        self.assertEqual(['test'], [kp.name for kp in kps])
+        self.assert_request_id(kps, fakes.FAKE_REQUEST_ID_LIST)
+        self.assertEqual('/%s?limit=1' % self.keypair_prefix,
+                         self.requests_mock.request_history[-2].path_url)
+        self.assert_called('GET',
+                           '/%s?limit=1&marker=test' % self.keypair_prefix)
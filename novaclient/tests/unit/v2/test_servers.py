@@ -13,6 +13,7 @@
 #    under the License.
 
 import base64
+import itertools
 import os
 import tempfile
 
@@ -75,6 +76,44 @@ class ServersTest(utils.FixturedTestCase):
         for s in sl:
             self.assertIsInstance(s, servers.Server)
 
+    def test_list_all_servers_with_prefetch(self):
+        sl = self.cs.servers.list(limit=-1, marker=1234, prefetch=1)
+        self.assert_request_id(sl, fakes.FAKE_REQUEST_ID_LIST)
+
+        self.assertEqual([1234, 5678], [s.id for s in sl])
+
+        self.assertEqual(self.requests_mock.request_history[-2].path_url,
+                         '/servers/detail?marker=1234')
+        self.assert_called('GET', '/servers/detail?marker=5678')
+
+        for s in sl:
+            self.assertIsInstance(s, servers.Server)
+
+    def test_iter_servers(self):
+        sl = self.cs.servers.iter(marker=1234)
+        self.assertEqual([], sl.request_ids)
+
+        self.assertEqual([1234, 5678], [s.id for s in sl])
+        self.assert_request_id(sl, fakes.FAKE_REQUEST_ID_LIST)
+        self.assertEqual(self.requests_mock.request_history[-2].path_url,
+                         '/servers/detail?marker=1234')
+        self.assert_called('GET', '/servers/detail?marker=5678')
+
+    def test_iter_servers_with_prefetch(self):
+        sl = self.cs.servers.iter(marker=1234, prefetch=1)
+        self.assertEqual([1234, 5678], [s.id for s in sl])
+        self.assert_called('GET', '/servers/detail?marker=5678')
+
+    def test_list_servers_compact(self):
+        sl = self.cs.servers.list(compact=True)
+        self.assert_request_id(sl, fakes.FAKE_REQUEST_ID_LIST)
+        self.assert_called('GET', '/servers/detail')
+        self.assertEqual([1234, 5678, 9012], [s.id for s in sl])
+        self.assertEqual(self.cs.servers.list(), sl)
+        for s in sl:
+            self.assertIsInstance(s, servers.Server)
+            self.assertEqual(s._info, s.to_dict())
+
     def test_list_servers_undetailed(self):
         sl = self.cs.servers.list(detailed=False)
         self.assert_request_id(sl, fakes.FAKE_REQUEST_ID_LIST)
@@ -110,6 +149,132 @@ class ServersTest(utils.FixturedTestCase):
         for s in sl:
             self.assertIsInstance(s, servers.Server)
 
+    def _mock_server_polls(self, *polls):
+        # each poll pages through the listing, until an empty page
+        self.requests_mock.get(
+            self.data_fixture.url('detail'),
+            [{'json': {'servers': servers},
+              'headers': self.data_fixture.json_headers}
+             for poll in polls for servers in (poll, [])])
+
+    def _mock_server_gets(self, server_id, *statuses):
+        # a None status is a server which no longer exists
+        self.requests_mock.get(
+            self.data_fixture.url(server_id),
+            [{'json': {'server': {'id': server_id, 'status': status,
+                                  'updated': '2016-01-01T00:00:00Z'}},
+              'headers': self.data_fixture.json_headers}
+             if status else {'status_code': 404}
+             for status in statuses])
+
+    @mock.patch.object(servers.time, 'sleep')
+    def test_wait_for_status(self, mock_sleep):
+        self.cs.servers._wait_max_gets = 0
+        self._mock_server_polls(
+            [{'id': '1234', 'status': 'BUILD',
+              'updated': '2016-01-01T00:00:10Z'},
+             {'id': '5678', 'status': 'ACTIVE'},
+             {'id': '9012', 'status': 'BUILD'}],
+            [{'id': '1234', 'status': 'ACTIVE'}])
+        waited = [servers.Server(self.cs.servers,
+                                 {'id': '1234',
+                                  'updated': '2016-01-01T00:00:00Z'}),
+                  servers.Server(self.cs.servers,
+                                 {'id': '5678',
+                                  'updated': '2016-01-01T00:00:05Z'})]
+
+        done = self.cs.servers.wait_for_status(waited, ['active'])
+
+        self.assertEqual(['5678', '1234'], [s.id for s in done])
+        self.assertEqual(2, mock_sleep.call_count)
+        # the first poll looks for the changes since the oldest update, the
+        # second one since the last update of the server still pending; the
+        # listings are filtered client side
+        first, second = [request for request
+                         in self.requests_mock.request_history
+                         if 'changes-since' in request.qs and
+                         'marker' not in request.qs]
+        self.assertNotIn('uuid', first.qs)
+        self.assertEqual(['2016-01-01t00:00:00z'], first.qs['changes-since'])
+        self.assertNotIn('uuid', second.qs)
+        self.assertEqual(['2016-01-01t00:00:10z'], second.qs['changes-since'])
+
+    @mock.patch.object(servers.time, 'sleep')
+    def test_wait_for_status_by_id(self, mock_sleep):
+        self._mock_server_gets('1234', 'BUILD', 'BUILD', 'ACTIVE')
+
+        done = list(self.cs.servers.wait_for_status(['1234'], ['active']))
+
+        self.assertEqual(['1234'], [s.id for s in done])
+        # a few servers are polled with a GET each, not with a listing
+        self.assertEqual(2, mock_sleep.call_count)
+        paths = [request.path for request
+                 in self.requests_mock.request_history]
+        self.assertEqual(3, paths.count('/servers/1234'))
+        self.assertNotIn('/servers/detail', paths)
+
+    @mock.patch.object(servers.time, 'sleep')
+    def test_wait_for_status_already_active(self, mock_sleep):
+        # the server changed longer than clock_skew ago
+        self._mock_server_gets('1234', 'ACTIVE')
+
+        done = list(self.cs.servers.wait_for_status(['1234'], ['active']))
+
+        self.assertEqual(['1234'], [s.id for s in done])
+        self.assertFalse(mock_sleep.called)
+
+    @mock.patch.object(servers.time, 'sleep')
+    def test_wait_for_status_error(self, mock_sleep):
+        self._mock_server_gets('1234', 'ERROR')
+        self._mock_server_gets('5678', 'BUILD')
+
+        done = self.cs.servers.wait_for_status(['1234', '5678'], ['active'])
+
+        e = self.assertRaises(exceptions.ResourceInErrorState, list, done)
+        self.assertEqual('1234', e.resource.id)
+
+    @mock.patch.object(servers.time, 'sleep')
+    def test_wait_for_status_not_raise_on_error(self, mock_sleep):
+        self._mock_server_gets('1234', 'ERROR')
+        self._mock_server_gets('5678', 'BUILD', 'ACTIVE')
+
+        done = self.cs.servers.wait_for_status(['1234', '5678'], ['active'],
+                                               raise_on_error=False)
+
+        self.assertEqual([('1234', 'ERROR'), ('5678', 'ACTIVE')],
+                         [(s.id, s.status) for s in done])
+
+    @mock.patch.object(servers.time, 'sleep')
+    @mock.patch.object(servers.time, 'time')
+    def test_wait_for_status_timeout(self, mock_time, mock_sleep):
+        mock_time.side_effect = itertools.count(step=2)
+        self._mock_server_gets('1234', 'BUILD')
+
+        done = self.cs.servers.wait_for_status(['1234'], ['active'],
+                                               timeout=5, poll_period=2)
+
+        e = self.assertRaises(exceptions.ResourceWaitTimeout, list, done)
+        self.assertEqual(['1234'], e.resources)
+
+    @mock.patch.object(servers.time, 'sleep')
+    def test_wait_for_delete(self, mock_sleep):
+        self._mock_server_gets('1234', 'ACTIVE', None)
+
+        done = list(self.cs.servers.wait_for_delete(['1234']))
+
+        self.assertEqual(['1234'], [s.id for s in done])
+        self.assertEqual(1, mock_sleep.call_count)
+
+    @mock.patch.object(servers.time, 'sleep')
+    def test_wait_for_delete_already_gone(self, mock_sleep):
+        self._mock_server_gets('1234', None)
+
+        done = list(self.cs.servers.wait_for_delete(['1234']))
+
+        self.assertEqual([('1234', 'DELETED')],
+                         [(s.id, s.status) for s in done])
+        self.assertFalse(mock_sleep.called)
+
     def test_get_server_details(self):
         s = self.cs.servers.get(1234)
         self.assert_request_id(s, fakes.FAKE_REQUEST_ID_LIST)
@@ -143,6 +308,141 @@ class ServersTest(utils.FixturedTestCase):
         self.assert_called('POST', '/servers')
         self.assertIsInstance(s, servers.Server)
 
+    @mock.patch.object(servers.utils, 'find_resource')
+    def test_create_many_resolves_resources_once(self, mock_find):
+        mock_find.return_value = mock.Mock(id='1')
+        image = mock.Mock(id=fakes.FAKE_IMAGE_UUID_1)
+        network = mock.Mock(id='11111111-1111-1111-1111-111111111111')
+        specs = [{'name': name, 'image': 'cirros', 'flavor': 'm1.tiny',
+                  'nics': [{'net-name': 'private'}]}
+                 for name in ('foo', 'bar', 'baz')]
+
+        find_image = mock.patch.object(self.cs.glance, 'find_image',
+                                       return_value=image)
+        find_network = mock.patch.object(self.cs.neutron, 'find_network',
+                                         return_value=network)
+        create = mock.patch.object(self.cs.servers, 'create',
+                                   side_effect=lambda **spec: spec['name'])
+        with find_image as mock_find_image, \
+                find_network as mock_find_network, create as mock_create:
+            created = self.cs.servers.create_many(specs, concurrency=2)
+
+        self.assertEqual(['foo', 'bar', 'baz'], created)
+        mock_find_image.assert_called_once_with('cirros')
+        mock_find_network.assert_called_once_with('private')
+        mock_find.assert_called_once_with(self.cs.flavors, 'm1.tiny',
+                                          wrap_exception=False)
+        mock_create.assert_any_call(
+            name='foo', image=image, flavor=mock_find.return_value,
+            nics=[{'net-id': network.id}])
+
+    @mock.patch.object(servers.time, 'sleep')
+    def test_create_many_rate_limited(self, mock_sleep):
+        server = servers.Server(self.cs.servers, {'id': '1234'})
+        with mock.patch.object(
+                self.cs.servers, 'create',
+                side_effect=[exceptions.RateLimit(429, retry_after=3),
+                             server]) as mock_create:
+            created = self.cs.servers.create_many(
+                [{'name': 'foo', 'image': 1, 'flavor': 1}])
+
+        self.assertEqual([server], created)
+        self.assertEqual(2, mock_create.call_count)
+        mock_sleep.assert_called_once_with(3)
+
+    def test_create_many_rate_limited_retried_by_client(self):
+        error = exceptions.RateLimit(429, retry_after=3)
+        with mock.patch.object(self.cs.client, 'rate_limit_retries', 2,
+                               create=True), \
+                mock.patch.object(self.cs.servers, 'create',
+                                  side_effect=error) as mock_create:
+            e = self.assertRaises(exceptions.CreateManyError,
+                                  self.cs.servers.create_many,
+                                  [{'name': 'foo', 'image': 1, 'flavor': 1}])
+        # the requests are not retried on top of the retries of the client
+        self.assertEqual(1, mock_create.call_count)
+        self.assertEqual([(0, error)], e.errors)
+
+    def test_create_many_partial_failure(self):
+        server = servers.Server(self.cs.servers, {'id': '1234'})
+        error = exceptions.OverLimit(413, message='Quota exceeded')
+        with mock.patch.object(self.cs.servers, 'create',
+                               side_effect=[server, error]) as mock_create:
+            e = self.assertRaises(exceptions.CreateManyError,
+                                  self.cs.servers.create_many,
+                                  [{'name': 'foo', 'image': 1, 'flavor': 1},
+                                   {'name': 'bar', 'image': 1, 'flavor': 1}])
+        # the failure of a spec is not retried and does not lose the servers
+        # created for the others
+        self.assertEqual(2, mock_create.call_count)
+        self.assertEqual([server, None], e.servers)
+        self.assertEqual([(1, error)], e.errors)
+
+    def test_create_many_wait(self):
+        server = servers.Server(self.cs.servers,
+                                {'id': '1234', 'adminPass': 'secret'})
+        active = servers.Server(self.cs.servers,
+                                {'id': '1234', 'status': 'ACTIVE'})
+        wait = mock.patch.object(self.cs.servers, 'wait_for_status',
+                                 return_value=iter([active]))
+        with mock.patch.object(self.cs.servers, 'create',
+                               return_value=server), wait as mock_wait:
+            created = self.cs.servers.create_many(
+                [{'name': 'foo', 'image': 1, 'flavor': 1}], wait=True,
+                timeout=60)
+
+        mock_wait.assert_called_once_with([server], ['active'], timeout=60,
+                                          raise_on_error=False)
+        self.assertEqual('ACTIVE', created[0].status)
+        self.assertEqual('secret', created[0].adminPass)
+
+    def test_create_many_wait_timeout(self):
+        created = [servers.Server(self.cs.servers, {'id': server_id})
+                   for server_id in ('1234', '5678')]
+
+        def wait_for_status(waited, states, timeout, raise_on_error):
+            yield servers.Server(self.cs.servers,
+                                 {'id': '1234', 'status': 'ACTIVE'})
+            raise exceptions.ResourceWaitTimeout(['5678'], timeout)
+
+        with mock.patch.object(self.cs.servers, 'create',
+                               side_effect=created), \
+                mock.patch.object(self.cs.servers, 'wait_for_status',
+                                  side_effect=wait_for_status):
+            e = self.assertRaises(exceptions.CreateManyError,
+                                  self.cs.servers.create_many,
+                                  [{'name': 'foo', 'image': 1, 'flavor': 1},
+                                   {'name': 'bar', 'image': 1, 'flavor': 1}],
+                                  wait=True, timeout=60)
+
+        # the servers are kept, the one still building is reported
+        self.assertEqual(created, e.servers)
+        self.assertEqual([1], [index for index, _error in e.errors])
+        self.assertIsInstance(e.errors[0][1], exceptions.ResourceWaitTimeout)
+        self.assertEqual(['5678'], e.errors[0][1].resources)
+
+    def test_create_many_wait_error(self):
+        created = [servers.Server(self.cs.servers, {'id': server_id})
+                   for server_id in ('1234', '5678')]
+        done = [servers.Server(self.cs.servers,
+                               {'id': '5678', 'status': 'ERROR'}),
+                servers.Server(self.cs.servers,
+                               {'id': '1234', 'status': 'ACTIVE'})]
+        wait = mock.patch.object(self.cs.servers, 'wait_for_status',
+                                 return_value=iter(done))
+        with mock.patch.object(self.cs.servers, 'create',
+                               side_effect=created), wait:
+            e = self.assertRaises(exceptions.CreateManyError,
+                                  self.cs.servers.create_many,
+                                  [{'name': 'foo', 'image': 1, 'flavor': 1},
+                                   {'name': 'bar', 'image': 1, 'flavor': 1}],
+                                  wait=True)
+
+        self.assertEqual(created, e.servers)
+        self.assertEqual([1], [index for index, _error in e.errors])
+        self.assertIsInstance(e.errors[0][1], exceptions.ResourceInErrorState)
+        self.assertEqual('ACTIVE', created[0].status)
+
     def test_create_server_boot_from_volume_with_nics(self):
         old_boot = self.cs.servers._boot
 
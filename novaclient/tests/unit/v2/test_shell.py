@@ -19,7 +19,9 @@
 import argparse
 import base64
 import datetime
+import itertools
 import os
+import threading
 
 import fixtures
 import mock
@@ -36,8 +38,12 @@ from novaclient import exceptions
 import novaclient.shell
 from novaclient.tests.unit import utils
 from novaclient.tests.unit.v2 import fakes
+import novaclient.utils
+from novaclient.v2 import servers
 import novaclient.v2.shell
 
+_discover_version = api_versions.discover_version
+
 FAKE_UUID_1 = fakes.FAKE_IMAGE_UUID_1
 FAKE_UUID_2 = fakes.FAKE_IMAGE_UUID_2
 
@@ -65,6 +71,7 @@ class ShellTest(utils.TestCase):
         'OS_COMPUTE_API_VERSION': '2',
         'NOVA_URL': 'http://no.where',
         'OS_AUTH_URL': 'http://no.where/v2.0',
+        'NOVACLIENT_VERSION_CACHE_TTL': '0',
     }
 
     def setUp(self):
@@ -77,6 +84,17 @@ class ShellTest(utils.TestCase):
         self.shell = self.useFixture(ShellFixture()).shell
         self.useFixture(fixtures.MonkeyPatch(
             'novaclient.client.Client', fakes.FakeClient))
+        self.useFixture(fixtures.MonkeyPatch(
+            'novaclient.api_versions.discover_version',
+            self._discover_version))
+
+    @staticmethod
+    def _discover_version(cs, *args, **kwargs):
+        # The shell discovers the version with the same client it then uses
+        # for the command, so only keep the calls made by the command itself.
+        version = _discover_version(cs, *args, **kwargs)
+        cs.clear_callstack()
+        return version
 
     @mock.patch('sys.stdout', new_callable=six.StringIO)
     @mock.patch('sys.stderr', new_callable=six.StringIO)
@@ -143,6 +161,17 @@ class ShellTest(utils.TestCase):
             }},
         )
 
+    def test_boot_lookups_cached(self):
+        # the fake server is booted from FAKE_UUID_2
+        self.run_command('boot --flavor 1 --image %s '
+                         'some-server' % FAKE_UUID_2)
+        urls = [url for _method, url, _body in self.shell.cs.client.callstack]
+        # the image and flavor resolved for the request are not fetched
+        # again to print the new server
+        self.assertEqual(1, urls.count('/v2/images/%s' % FAKE_UUID_2))
+        self.assertEqual(1, urls.count('/flavors/1'))
+        self.assertEqual(2, self.shell.cs.lookup_cache.stats()['hits'])
+
     def test_boot_image_with(self):
         self.run_command("boot --flavor 1"
                          " --image-with test_key=test_value some-server")
@@ -1381,6 +1410,59 @@ class ShellTest(utils.TestCase):
         self.assertIn('OS-EXT-MOD: Some Thing', output)
         self.assertIn('mod_some_thing_value', output)
 
+    def test_list_fields_flavor_image(self):
+        output, _err = self.run_command('list --fields name,flavor,image')
+        callstack = self.shell.cs.client.callstack
+        self.assertEqual([('GET', '/servers/detail', None),
+                          ('GET', '/flavors/detail?is_public=None', None)],
+                         callstack[:2])
+        # the flavor missing from the listing is then looked up by ID
+        self.assertEqual(
+            ('GET', '/v2/images?id=in:3e861307-73a6-4d1f-8d68-f68b03223032,'
+                    'c99d7632-bd66-4be9-aed5-3dd14b223a76,'
+                    'f27f479a-ddda-419a-9bbc-d6b56b210161&limit=3', None),
+            callstack[-1])
+        self.assertIn('256 MB Server (1)', output)
+        self.assertIn('My Server Backup (%s)' % fakes.FAKE_IMAGE_UUID_2,
+                      output)
+
+    def test_list_fields_image_bulk_listing_failed(self):
+        with mock.patch('novaclient.v2.images.GlanceManager.list_by_ids',
+                        side_effect=exceptions.BadRequest(400)):
+            output, _err = self.run_command('list --fields name,image')
+        # the images are then looked up one by one
+        self.assert_called_anytime('GET', '/v2/images/%s' %
+                                   fakes.FAKE_IMAGE_UUID_2)
+        self.assertIn('My Server Backup (%s)' % fakes.FAKE_IMAGE_UUID_2,
+                      output)
+
+    def test_list_format_csv(self):
+        self.addCleanup(novaclient.utils.set_output_format, 'table')
+        output, _err = self.run_command('--format csv list --fields name')
+        self.assert_called('GET', '/servers/detail')
+        # the servers are printed in the order of the server
+        self.assertEqual(['ID,Name', '1234,sample-server',
+                          '5678,sample-server2', '9012,sample-server3',
+                          '9013,sample-server4', '9014,help'],
+                         output.splitlines())
+
+    @mock.patch.object(servers.ServerManager, 'iter')
+    def test_list_format_json_all_servers(self, mock_iter):
+        self.addCleanup(novaclient.utils.set_output_format, 'table')
+        mock_iter.return_value = iter([
+            servers.Server(None, {'id': '1234', 'name': 'sample-server',
+                                  'OS-EXT-STS:power_state': 1},
+                           loaded=True)])
+
+        output, _err = self.run_command(
+            '--format json list --limit -1 --fields name,power_state')
+
+        mock_iter.assert_called_once_with(
+            detailed=True, search_opts=mock.ANY, sort_keys=[], sort_dirs=[],
+            marker=None)
+        self.assertEqual('{"ID": "1234", "Name": "sample-server", '
+                         '"Power State": "Running"}\n', output)
+
     def test_list_invalid_fields(self):
         self.assertRaises(exceptions.CommandError,
                           self.run_command,
@@ -1428,10 +1510,71 @@ class ShellTest(utils.TestCase):
     def test_reboot_many(self):
         self.run_command('reboot sample-server sample-server2')
         self.assert_called('POST', '/servers/1234/action',
-                           {'reboot': {'type': 'SOFT'}}, pos=-2)
+                           {'reboot': {'type': 'SOFT'}}, pos=2)
         self.assert_called('POST', '/servers/5678/action',
                            {'reboot': {'type': 'SOFT'}}, pos=-1)
 
+    def test_reboot_parallel(self):
+        found = []
+        barrier = threading.Event()
+        find_server = novaclient.v2.shell._find_server
+
+        def concurrent_find_server(cs, server, **find_args):
+            found.append(server)
+            if len(found) == 2:
+                barrier.set()
+            # the two servers are looked up at the same time
+            if not barrier.wait(5):
+                raise Exception('not concurrent')
+            return find_server(cs, server, **find_args)
+
+        with mock.patch('novaclient.v2.shell._find_server',
+                        side_effect=concurrent_find_server):
+            self.run_command(
+                'reboot --parallel 2 sample-server sample-server2')
+        self.assertEqual(2, len(found))
+        calls = set(call[:2] for call in self.shell.cs.client.callstack)
+        self.assertIn(('POST', '/servers/1234/action'), calls)
+        self.assertIn(('POST', '/servers/5678/action'), calls)
+
+    def _mock_server_polls(self, **statuses):
+        """Mocks the polls of the servers, with a status per poll."""
+        polls = dict((server_id, iter(server_statuses))
+                     for server_id, server_statuses in statuses.items())
+
+        def get_for_wait(manager, server_id):
+            return servers.Server(manager, {'id': server_id,
+                                            'status': next(polls[server_id])})
+
+        return mock.patch.object(servers.ServerManager, '_get_for_wait',
+                                 get_for_wait)
+
+    @mock.patch.object(novaclient.v2.shell.time, 'sleep')
+    def test_reboot_poll(self, mock_sleep):
+        with self._mock_server_polls(**{'1234': ['REBOOT', 'ACTIVE'],
+                                        '5678': ['REBOOT', 'ACTIVE']}):
+            out, _err = self.run_command('reboot --poll sample-server 5678')
+        self.assert_called('POST', '/servers/5678/action',
+                           {'reboot': {'type': 'SOFT'}})
+        self.assertEqual(1, mock_sleep.call_count)
+        self.assertIn('Server 1234 rebooting finished.', out)
+        self.assertIn('Server 5678 rebooting finished.', out)
+
+    @mock.patch.object(novaclient.v2.shell.time, 'sleep')
+    def test_reboot_poll_error(self, mock_sleep):
+        polls = self._mock_server_polls(**{'1234': ['ERROR'],
+                                           '5678': ['REBOOT', 'ACTIVE']})
+        with polls:
+            with mock.patch('sys.stdout',
+                            new_callable=six.StringIO) as mock_stdout:
+                self.assertRaises(exceptions.CommandError, self.shell.main,
+                                  ['reboot', '--poll', 'sample-server',
+                                   '5678'])
+        # the failure of a server does not stop the wait for the other one
+        out = mock_stdout.getvalue()
+        self.assertIn('Error rebooting server 1234: ERROR', out)
+        self.assertIn('Server 5678 rebooting finished.', out)
+
     def test_rebuild(self):
         output, _err = self.run_command('rebuild sample-server %s'
                                         % FAKE_UUID_1)
@@ -1641,6 +1784,29 @@ class ShellTest(utils.TestCase):
         self.run_command('delete sample-server')
         self.assert_called('DELETE', '/servers/1234')
 
+    def test_delete_parallel(self):
+        deleted = []
+        barrier = threading.Event()
+        delete = servers.ServerManager.delete
+
+        def concurrent_delete(manager, server):
+            deleted.append(server)
+            if len(deleted) == 2:
+                barrier.set()
+            # the two servers are deleted at the same time
+            if not barrier.wait(5):
+                raise Exception('not concurrent')
+            return delete(manager, server)
+
+        with mock.patch.object(servers.ServerManager, 'delete',
+                               autospec=True, side_effect=concurrent_delete):
+            self.run_command(
+                'delete --parallel 2 sample-server sample-server2')
+        self.assertEqual(2, len(deleted))
+        calls = set(call[:2] for call in self.shell.cs.client.callstack)
+        self.assertIn(('DELETE', '/servers/1234'), calls)
+        self.assertIn(('DELETE', '/servers/5678'), calls)
+
     def test_force_delete(self):
         self.run_command('force-delete 1234')
         self.assert_called('POST', '/servers/1234/action',
@@ -2227,6 +2393,11 @@ class ShellTest(utils.TestCase):
                                    'disk_over_commit': False}}
         self.assert_called('POST', '/servers/uuid1/action', body, pos=1)
 
+    def test_host_evacuate_live_max_servers_across_hypervisors(self):
+        self.run_command('host-evacuate-live --max-servers 3 hyper')
+        self.assert_called('POST', '/servers/uuid3/action', pos=3)
+        self.assertEqual(4, len(self.shell.cs.client.callstack))
+
     def test_reset_state(self):
         self.run_command('reset-state sample-server')
         self.assert_called('POST', '/servers/1234/action',
@@ -2380,6 +2551,54 @@ class ShellTest(utils.TestCase):
                            {'evacuate': {'host': 'target_hyper',
                                          'onSharedStorage': False}}, pos=4)
 
+    def test_host_evacuate_parallel(self):
+        self.run_command('host-evacuate hyper --target target_hyper '
+                         '--parallel 4')
+        calls = self.shell.cs.client.callstack
+        self.assertEqual(('GET', '/os-hypervisors/hyper/servers'),
+                         calls[0][:2])
+        self.assertEqual(
+            set(['/servers/uuid%d/action' % i for i in range(1, 5)]),
+            set(call[1] for call in calls[1:]))
+
+    @mock.patch.object(novaclient.v2.shell.time, 'sleep')
+    def test_host_evacuate_wait(self, mock_sleep):
+        statuses = {}
+
+        def get(manager, server_uuid):
+            # the first poll finds the server still being evacuated
+            migrating = server_uuid not in statuses
+            statuses[server_uuid] = 'ACTIVE'
+            return servers.Server(manager, {
+                'id': server_uuid, 'status': 'ACTIVE',
+                'OS-EXT-STS:task_state': 'rebuilding' if migrating else None,
+                'OS-EXT-SRV-ATTR:host': 'target_hyper'})
+
+        with mock.patch.object(servers.ServerManager, 'get', get):
+            out, _err = self.run_command(
+                'host-evacuate hyper --target target_hyper --wait')
+        self.assertEqual(4, mock_sleep.call_count)
+        self.assertIn('Status', out)
+        self.assertEqual(4, out.count('| ACTIVE | target_hyper |'))
+
+    @mock.patch.object(novaclient.v2.shell.time, 'sleep')
+    @mock.patch.object(novaclient.v2.shell.time, 'time',
+                       side_effect=itertools.count(step=3))
+    def test_host_evacuate_wait_timeout(self, mock_time, mock_sleep):
+        def get(manager, server_uuid):
+            return servers.Server(manager, {
+                'id': server_uuid, 'status': 'ACTIVE',
+                'OS-EXT-STS:task_state': 'rebuilding'})
+
+        with mock.patch.object(servers.ServerManager, 'get', get):
+            out, _err = self.run_command(
+                'host-evacuate hyper --target target_hyper --wait '
+                '--wait-timeout 10')
+        self.assertTrue(mock_sleep.called)
+        self.assertTrue(all(call[0][0] <= 10
+                            for call in mock_sleep.call_args_list))
+        self.assertEqual(4, out.count('Timed out after 10 seconds'))
+
     def test_host_evacuate_v2_29(self):
         self.run_command('host-evacuate hyper --target target_hyper --force',
                          api_version='2.29')
@@ -3367,6 +3586,49 @@ class PollForStatusTestCase(utils.TestCase):
                          mock_time.sleep.call_args_list)
         self.assertEqual([mock.call(some_id)] * 2, poll_fn.call_args_list)
 
+    @mock.patch("novaclient.v2.shell.time")
+    def test_adaptive_poll_period(self, mock_time):
+        updated_objects = (
+            base.Resource(None, info={"status": "BUILD", "progress": 0}),
+            base.Resource(None, info={"status": "BUILD", "progress": 0}),
+            base.Resource(None, info={"status": "BUILD", "progress": 0}),
+            base.Resource(None, info={"status": "BUILD", "progress": 50}),
+            base.Resource(None, info={"status": "ACTIVE", "progress": 100}))
+        poll_fn = mock.MagicMock(side_effect=updated_objects)
+
+        with mock.patch('random.uniform', return_value=1):
+            novaclient.v2.shell._poll_for_status(
+                poll_fn=poll_fn,
+                obj_id="uuuuuuuuuuuiiiiiiiii",
+                final_ok_states=["active"],
+                action="some",
+                silent=True)
+
+        # the period grows while nothing changes and is reset on progress
+        self.assertEqual([mock.call(1), mock.call(1.5), mock.call(2.25),
+                          mock.call(1)],
+                         mock_time.sleep.call_args_list)
+
+    @mock.patch("novaclient.v2.shell.time")
+    def test_adaptive_poll_period_capped(self, mock_time):
+        updated_objects = (
+            [base.Resource(None, info={"status": "BUILD", "progress": 0})] *
+            7 + [base.Resource(None, info={"status": "ACTIVE"})])
+        poll_fn = mock.MagicMock(side_effect=updated_objects)
+
+        with mock.patch('random.uniform', return_value=1):
+            novaclient.v2.shell._poll_for_status(
+                poll_fn=poll_fn,
+                obj_id="uuuuuuuuuuuiiiiiiiii",
+                final_ok_states=["active"],
+                action="some",
+                silent=True)
+
+        self.assertEqual([mock.call(1), mock.call(1.5), mock.call(2.25),
+                          mock.call(3.375), mock.call(5), mock.call(5),
+                          mock.call(5)],
+                         mock_time.sleep.call_args_list)
+
     @mock.patch("novaclient.v2.shell.sys.stdout")
     @mock.patch("novaclient.v2.shell.time")
     def test_print_progress(self, mock_time, mock_stdout):
@@ -47,6 +47,19 @@ class UsageTest(utils.TestCase):
     def test_usage_list_detailed(self):
         self.test_usage_list(True)
 
+    def test_usage_iter(self):
+        now = datetime.datetime.now()
+        usages = self.cs.usage.iter(now, now, detailed=True)
+
+        self.assertEqual(1, len(list(usages)))
+        self.assert_request_id(usages, fakes.FAKE_REQUEST_ID_LIST)
+        self.cs.assert_called(
+            'GET',
+            "/os-simple-tenant-usage?" +
+            ("start=%s&" % now.isoformat()) +
+            ("end=%s&" % now.isoformat()) +
+            "detailed=1")
+
     def test_usage_get(self):
         now = datetime.datetime.now()
         u = self.cs.usage.get("tenantfoo", now, now)
@@ -109,6 +122,46 @@ class UsageV40Test(UsageTest):
         for u in usages:
             self.assertIsInstance(u, usage.Usage)
 
+    def test_usage_iter(self):
+        now = datetime.datetime.now()
+        usages = self.cs.usage.iter(now, now, detailed=True)
+
+        self.assertEqual(
+            ['f079e394-1111-457b-b350-bb5ecc685cdd',
+             'f079e394-2222-457b-b350-bb5ecc685cdd'],
+            [u.server_usages[0]['instance_id'] for u in usages])
+        self.assert_request_id(usages, fakes.FAKE_REQUEST_ID_LIST)
+        self.assertEqual(3, len(self.cs.client.callstack))
+        self.cs.assert_called(
+            'GET',
+            '/os-simple-tenant-usage?' +
+            ('start=%s&' % now.isoformat()) +
+            ('end=%s&' % now.isoformat()) +
+            ('marker=f079e394-2222-457b-b350-bb5ecc685cdd&detailed=1'))
+
+    def test_usage_iter_not_detailed(self):
+        now = datetime.datetime.now()
+        usages = list(self.cs.usage.iter(now, now))
+
+        # the instances are needed to locate the next pages
+        self.assertEqual(3, len(self.cs.client.callstack))
+        self.cs.assert_called(
+            'GET',
+            '/os-simple-tenant-usage?' +
+            ('start=%s&' % now.isoformat()) +
+            ('end=%s&' % now.isoformat()) +
+            ('marker=f079e394-2222-457b-b350-bb5ecc685cdd&detailed=1'))
+        self.assertEqual(2, len(usages))
+        self.assertFalse(any('server_usages' in u.to_dict() for u in usages))
+
+    def test_usage_iter_not_detailed_prefetch(self):
+        now = datetime.datetime.now()
+        usages = list(self.cs.usage.iter(now, now, prefetch=1))
+
+        self.assertEqual(3, len(self.cs.client.callstack))
+        self.assertEqual(2, len(usages))
+        self.assertFalse(any('server_usages' in u.to_dict() for u in usages))
+
     def test_usage_get_with_paging(self):
         now = datetime.datetime.now()
         u = self.cs.usage.get(
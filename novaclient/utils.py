@@ -11,11 +11,17 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import abc
+import collections
 import contextlib
+import csv
 import json
+from multiprocessing import pool
 import os
+import random
 import re
 import textwrap
+import threading
 import time
 import uuid
 
@@ -161,42 +167,200 @@ def pretty_choice_dict(d):
     return pretty_choice_list(['%s=%s' % (k, d[k]) for k in sorted(d.keys())])
 
 
+def _get_list_row(obj, fields, formatters, raw=False):
+    """Get the cells of the row of an object printed by print_list.
+
+    Unless raw is set, the attributes are converted to text, with '-' for
+    None.
+    """
+    mixed_case_fields = ['serverId']
+    row = []
+    for field in fields:
+        if field in formatters:
+            row.append(formatters[field](obj))
+        else:
+            if field in mixed_case_fields:
+                field_name = field.replace(' ', '_')
+            else:
+                field_name = field.lower().replace(' ', '_')
+            data = getattr(obj, field_name, '')
+            if not raw:
+                if data is None:
+                    data = '-'
+                # '\r' would break the table, so remove it.
+                data = six.text_type(data).replace("\r", "")
+            row.append(data)
+    return row
+
+
+def _print_text(text):
+    result = encodeutils.safe_encode(text)
+    if six.PY3:
+        result = result.decode()
+    print(result)
+
+
+@six.add_metaclass(abc.ABCMeta)
+class ListFormatter(object):
+    """Prints the rows of a list one by one, as they are produced.
+
+    Unlike the default table format, which needs all the rows to size its
+    columns, the formatters print each row before the next object is
+    fetched, so a long listing is printed page by page, without being kept
+    in memory.
+
+    :param fields: names of the columns
+    """
+
+    #: whether the rows are made of the raw attributes rather than of text
+    raw = False
+
+    def __init__(self, fields):
+        self.fields = fields
+
+    @abc.abstractmethod
+    def add_row(self, row):
+        """Prints a row, with a cell per field."""
+        pass
+
+    def end(self):
+        """Prints the end of the list, after its last row."""
+        pass
+
+
+class JSONLinesFormatter(ListFormatter):
+    """Prints each row as a JSON object on its own line."""
+
+    raw = True
+
+    def add_row(self, row):
+        _print_text(json.dumps(
+            collections.OrderedDict(zip(self.fields, row)),
+            default=six.text_type))
+
+
+class CSVFormatter(ListFormatter):
+    """Prints the rows as CSV, after a header row."""
+
+    def __init__(self, fields):
+        super(CSVFormatter, self).__init__(fields)
+        self._buffer = six.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator='')
+        self.add_row(fields)
+
+    def add_row(self, row):
+        if six.PY2:
+            row = [encodeutils.safe_encode(six.text_type(cell))
+                   for cell in row]
+        self._writer.writerow(row)
+        _print_text(self._buffer.getvalue())
+        self._buffer.seek(0)
+        self._buffer.truncate()
+
+
+class StreamingTableFormatter(ListFormatter):
+    """Prints the rows as a table, sizing its columns on the first rows.
+
+    The first ``sample_size`` rows are kept to size the columns, the next
+    ones are printed as they come. A longer cell in one of them widens its
+    column on that row only.
+    """
+
+    sample_size = 100
+
+    def __init__(self, fields):
+        super(StreamingTableFormatter, self).__init__(fields)
+        self._sample = []
+        self._widths = None
+
+    def add_row(self, row):
+        row = [six.text_type(cell).split('\n') for cell in row]
+        if self._widths is not None:
+            self._print_row(row)
+            return
+        self._sample.append(row)
+        if len(self._sample) >= self.sample_size:
+            self._print_sample()
+
+    def end(self):
+        if self._widths is None:
+            self._print_sample()
+        _print_text(self._border())
+
+    def _print_sample(self):
+        header = [[field] for field in self.fields]
+        self._widths = [max(len(line) for cell in column for line in cell)
+                        for column in zip(header, *self._sample)]
+        _print_text(self._border())
+        self._print_row(header)
+        _print_text(self._border())
+        for row in self._sample:
+            self._print_row(row)
+        self._sample = []
+
+    def _border(self):
+        return '+%s+' % '+'.join('-' * (width + 2) for width in self._widths)
+
+    def _print_row(self, row):
+        for i in range(max(len(cell) for cell in row)):
+            _print_text('| %s |' % ' | '.join(
+                (cell[i] if i < len(cell) else '').ljust(width)
+                for cell, width in zip(row, self._widths)))
+
+
+# formatters of print_list by output format, besides the default table
+LIST_FORMATTERS = {
+    'csv': CSVFormatter,
+    'json': JSONLinesFormatter,
+    'stream': StreamingTableFormatter,
+}
+
+# output format of print_list, see set_output_format
+_output_format = 'table'
+
+
+def set_output_format(output_format):
+    """Sets the output format of print_list.
+
+    :param output_format: 'table' for the default table, or one of the
+                          formats of LIST_FORMATTERS
+    """
+    global _output_format
+    if output_format != 'table' and output_format not in LIST_FORMATTERS:
+        raise exceptions.CommandError(
+            _("Unknown output format: %s") % output_format)
+    _output_format = output_format
+
+
 def print_list(objs, fields, formatters={}, sortby_index=None):
+    """Prints objects as a list, in the output format which is set.
+
+    The default table is sorted by the field at sortby_index, when it is
+    set. The other formats print the objects in the order they are
+    iterated, as they come.
+    """
+    if _output_format != 'table':
+        formatter = LIST_FORMATTERS[_output_format](fields)
+        for o in objs:
+            formatter.add_row(_get_list_row(o, fields, formatters,
+                                            raw=formatter.raw))
+        formatter.end()
+        return
+
     if sortby_index is None:
         sortby = None
     else:
         sortby = fields[sortby_index]
-    mixed_case_fields = ['serverId']
     pt = prettytable.PrettyTable([f for f in fields], caching=False)
     pt.align = 'l'
 
     for o in objs:
-        row = []
-        for field in fields:
-            if field in formatters:
-                row.append(formatters[field](o))
-            else:
-                if field in mixed_case_fields:
-                    field_name = field.replace(' ', '_')
-                else:
-                    field_name = field.lower().replace(' ', '_')
-                data = getattr(o, field_name, '')
-                if data is None:
-                    data = '-'
-                # '\r' would break the table, so remove it.
-                data = six.text_type(data).replace("\r", "")
-                row.append(data)
-        pt.add_row(row)
+        pt.add_row(_get_list_row(o, fields, formatters))
 
     if sortby is not None:
-        result = encodeutils.safe_encode(pt.get_string(sortby=sortby))
+        _print_text(pt.get_string(sortby=sortby))
     else:
-        result = encodeutils.safe_encode(pt.get_string())
-
-    if six.PY3:
-        result = result.decode()
-
-    print(result)
+        _print_text(pt.get_string())
 
 
 def _flatten(data, prefix=None):
@@ -274,7 +438,22 @@ def print_dict(d, dict_property="Property", dict_value="Value", wrap=0):
 
 
 def find_resource(manager, name_or_id, wrap_exception=True, **find_args):
-    """Helper for the _find_* methods."""
+    """Helper for the _find_* methods.
+
+    The resources of the managers with ``cache_lookups`` set are kept in the
+    lookup cache of the client, see :class:`LookupCache`.
+    """
+    cache = getattr(getattr(manager, 'api', None), 'lookup_cache', None)
+    if (isinstance(cache, LookupCache) and
+            getattr(manager, 'cache_lookups', False) is True):
+        return cache.get_or_find(
+            type(manager).__name__, name_or_id,
+            lambda n: _find_resource(manager, n, wrap_exception, **find_args),
+            tuple(sorted(find_args.items())), wrap_exception)
+    return _find_resource(manager, name_or_id, wrap_exception, **find_args)
+
+
+def _find_resource(manager, name_or_id, wrap_exception=True, **find_args):
     # for str id which is not uuid (for Flavor, Keypair and hypervsior in cells
     # environments search currently)
     if getattr(manager, 'is_alphanum_id_allowed', False):
@@ -396,17 +575,206 @@ def safe_issubclass(*args):
     return False
 
 
-def do_action_on_many(action, resources, success_msg, error_msg):
-    """Helper to run an action on many resources."""
+def imap_concurrently(func, items, parallel=1):
+    """Like map(), but calls func on up to `parallel` items at the same time.
+
+    The results are yielded in the order of the items.
+    """
+    items = list(items)
+    if not parallel or parallel <= 1 or len(items) <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    workers = pool.ThreadPool(min(parallel, len(items)))
+    try:
+        for result in workers.imap(func, items):
+            yield result
+    finally:
+        workers.terminate()
+
+
+class Backoff(object):
+    """Exponential backoff with jitter, used to space status polls out.
+
+    :param min_period: first interval, and interval after reset()
+    :param max_period: upper bound of the intervals
+    :param factor: growth of the interval after each poll
+    :param jitter: relative random variation of the intervals, so that many
+                   clients polling at the same time spread their requests
+    """
+
+    def __init__(self, min_period=1, max_period=20, factor=1.5, jitter=0.2):
+        self.min_period = min_period
+        self.max_period = max_period
+        self.factor = factor
+        self.jitter = jitter
+        self.period = min_period
+
+    def reset(self):
+        """Poll sooner again, e.g. because the watched resource changed."""
+        self.period = self.min_period
+
+    def next_period(self):
+        """Returns the number of seconds to wait before the next poll."""
+        period = self.period
+        self.period = min(self.period * self.factor, self.max_period)
+        return period * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+class TokenBucket(object):
+    """Token bucket limiting the rate of the requests sent to the API.
+
+    Up to ``burst`` requests go through at once, then the requests are
+    spaced out to ``rate`` per second. The bucket is shared by all the
+    threads using a client.
+
+    :param rate: number of requests allowed per second
+    :param burst: number of requests allowed at once (defaults to one second
+                  worth of requests)
+    """
+
+    # seconds in the units of the rate limits reported by the API
+    UNITS = {'SECOND': 1, 'MINUTE': 60, 'HOUR': 3600, 'DAY': 86400}
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.burst = burst or max(1, int(self.rate))
+        self._tokens = float(self.burst)
+        self._last = time.time()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_rate_limits(cls, rate_limits):
+        """Builds a bucket for the strictest of the API rate limits.
+
+        :param rate_limits: the :class:`novaclient.v2.limits.RateLimit` list,
+                            e.g. ``client.limits.get().rate``
+        :returns: a :class:`TokenBucket` or None if there is no rate limit
+        """
+        rates = [float(limit.value) / cls.UNITS[limit.unit.upper()]
+                 for limit in rate_limits
+                 if limit.value and limit.unit.upper() in cls.UNITS]
+        if rates:
+            return cls(min(rates))
+
+    def _refill(self):
+        now = time.time()
+        self._tokens = min(self.burst,
+                           self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self):
+        """Takes a token, waiting for it if needed.
+
+        :returns: the number of seconds waited
+        """
+        with self._lock:
+            self._refill()
+            # the token is taken right away, so that the threads waiting at
+            # the same time are queued one after the other
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    def hold(self, delay):
+        """Makes the next requests wait, e.g. after a Retry-After answer."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0) - delay * self.rate
+
+
+class LookupCache(object):
+    """Cache of the resources looked up by name or ID.
+
+    The resources found by :func:`find_resource` (for the managers with
+    ``cache_lookups`` set) and by the image and network name lookups are kept
+    for ``ttl`` seconds, under both the name or ID they were looked up with
+    and their ID. The entries of a manager are dropped when it deletes or
+    updates a resource.
+
+    :param ttl: seconds the resources are kept, 0 disables the cache
+    """
+
+    def __init__(self, ttl=0):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get_or_find(self, kind, name_or_id, find, *args):
+        """Returns the cached resource, or the one found by find().
+
+        :param kind: namespace of the resources, e.g. the manager class name
+        :param name_or_id: the name or ID looked up
+        :param find: callable looking the resource up, called with
+                     ``name_or_id``
+        :param args: other values the lookup depends on, part of the key
+        """
+        if not self.ttl:
+            return find(name_or_id)
+
+        key = (kind, six.text_type(name_or_id)) + args
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        resource = find(name_or_id)
+        with self._lock:
+            expires = now + self.ttl
+            self._entries[key] = (expires, resource)
+            resource_id = getattr(resource, 'id', None)
+            if resource_id is not None:
+                id_key = (kind, six.text_type(resource_id)) + args
+                self._entries[id_key] = (expires, resource)
+        return resource
+
+    def invalidate(self, kind=None):
+        """Drops the entries of a kind of resources, or all of them."""
+        with self._lock:
+            if kind is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == kind]:
+                    del self._entries[key]
+
+    def stats(self):
+        """Returns the number of hits, misses and entries of the cache."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'entries': len(self._entries)}
+
+
+def do_action_on_many(action, resources, success_msg, error_msg, parallel=1):
+    """Helper to run an action on many resources.
+
+    :param parallel: number of resources the action is run on concurrently,
+                     the results are still reported in the order of the
+                     resources
+    """
     failure_flag = False
 
-    for resource in resources:
+    def _run(resource):
         try:
             action(resource)
-            print(success_msg % resource)
         except Exception as e:
+            return e
+
+    resources = list(resources)
+    results = imap_concurrently(_run, resources, parallel)
+    for resource, error in six.moves.zip(resources, results):
+        if error is None:
+            print(success_msg % resource)
+        else:
             failure_flag = True
-            print(encodeutils.safe_encode(six.text_type(e)))
+            print(encodeutils.safe_encode(six.text_type(error)))
 
     if failure_flag:
         raise exceptions.CommandError(error_msg)
@@ -446,9 +814,11 @@ def record_time(times, enabled, *args):
         yield
     else:
         start = time.time()
-        yield
-        end = time.time()
-        times.append((' '.join(args), start, end))
+        try:
+            yield
+        finally:
+            end = time.time()
+            times.append((' '.join(args), start, end))
 
 
 def prepare_query_string(params):
@@ -20,6 +20,7 @@ from keystoneauth1.exceptions import catalog as key_ex
 from novaclient import client
 from novaclient import exceptions
 from novaclient.i18n import _LE, _LW
+from novaclient import utils
 from novaclient.v2 import agents
 from novaclient.v2 import aggregates
 from novaclient.v2 import assisted_volume_snapshots
@@ -75,6 +76,7 @@ class Client(object):
                  auth_url=None,
                  cacert=None,
                  cert=None,
+                 completion_cache=True,
                  direct_use=True,
                  endpoint_override=None,
                  endpoint_type='publicURL',
@@ -82,16 +84,24 @@ class Client(object):
                  http_log_debug=False,
                  insecure=False,
                  logger=None,
+                 lookup_cache_ttl=0,
                  os_cache=False,
                  password=None,
+                 pool_block=False,
+                 pool_connections=None,
+                 pool_maxsize=None,
                  project_domain_id=None,
                  project_domain_name=None,
                  project_id=None,
                  project_name=None,
+                 rate_limit=None,
+                 rate_limit_retries=0,
                  region_name=None,
+                 retries=0,
                  service_name=None,
                  service_type='compute',
                  session=None,
+                 tcp_keepalive=True,
                  timeout=None,
                  timings=False,
                  user_domain_id=None,
@@ -108,6 +118,8 @@ class Client(object):
         :param str auth_url: Auth URL
         :param str cacert: ca-certificate
         :param str cert: certificate
+        :param bool completion_cache: Store the UUIDs and human-friendly IDs
+            of listed and created resources for shell autocompletion
         :param bool direct_use: Inner variable of novaclient. Do not use it
             outside novaclient. It's restricted.
         :param str endpoint_override: Bypass URL
@@ -117,16 +129,39 @@ class Client(object):
         :param bool insecure: Allow insecure
         :param logging.Logger logger: Logger instance to be used for all
             logging stuff
+        :param int lookup_cache_ttl: Seconds the flavors, images, networks,
+            keypairs and server groups looked up by name or ID are cached,
+            see ``lookup_cache``. 0 disables the cache
         :param str password: User password
         :param bool os_cache: OS cache
+        :param bool pool_block: Wait for a free connection when
+            ``pool_maxsize`` connections to the host are in use, instead of
+            opening a connection which is not kept afterwards
+        :param int pool_connections: Number of hosts whose connections are
+            kept open (requests defaults to 10)
+        :param int pool_maxsize: Number of connections kept open per host
+            (requests defaults to 10). Set it to at least the number of
+            threads sharing the client, so that they do not reconnect
         :param str project_domain_id: ID of project domain
         :param str project_domain_name: Name of project domain
         :param str project_id: Project/Tenant ID
         :param str project_name: Project/Tenant name
+        :param rate_limit: Maximum number of requests per second, or a
+            :class:`novaclient.utils.TokenBucket` shared with other clients.
+            None disables the client-side rate limiting
+        :param int rate_limit_retries: Number of times a request refused with
+            a 429 (or a 413 with a Retry-After header) is retried after the
+            delay requested by the API
         :param str region_name: Region Name
+        :param int retries: Number of times an idempotent request (GET, PUT,
+            DELETE...) is retried after a connection error or a 502, 503 or
+            504 response, waiting longer before each retry. Each attempt is
+            recorded in the timings
         :param str service_name: Service Name
         :param str service_type: Service Type
-        :param str session: Session
+        :param str session: Session. The connection pool arguments only
+            apply when the client creates its own session
+        :param bool tcp_keepalive: Enable TCP keep-alive on the connections
         :param float timeout: API timeout, None or 0 disables
         :param bool timings: Timings
         :param str user_domain_id: ID of user domain
@@ -151,6 +186,8 @@ class Client(object):
         self.project_id = project_id
         self.project_name = project_name
         self.user_id = user_id
+        self.completion_cache = completion_cache
+        self.lookup_cache = utils.LookupCache(ttl=lookup_cache_ttl)
         self.flavors = flavors.FlavorManager(self)
         self.flavor_access = flavor_access.FlavorAccessManager(self)
         self.images = images.ImageManager(self)
@@ -240,14 +277,21 @@ class Client(object):
             logger=self.logger,
             os_cache=self.os_cache,
             password=password,
+            pool_block=pool_block,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
             project_domain_id=project_domain_id,
             project_domain_name=project_domain_name,
             project_id=project_id,
             project_name=project_name,
+            rate_limit=rate_limit,
+            rate_limit_retries=rate_limit_retries,
             region_name=region_name,
+            retries=retries,
             service_name=service_name,
             service_type=service_type,
             session=session,
+            tcp_keepalive=tcp_keepalive,
             timeout=timeout,
             timings=timings,
             user_domain_id=user_domain_id,
@@ -300,6 +344,15 @@ class Client(object):
     def reset_timings(self):
         self.client.reset_timings()
 
+    def get_throttling(self):
+        return self.client.get_throttling()
+
+    def reset_throttling(self):
+        self.client.reset_throttling()
+
+    def get_pool_stats(self):
+        return self.client.get_pool_stats()
+
     def has_neutron(self):
         """Check the service catalog to figure out if we have neutron.
 
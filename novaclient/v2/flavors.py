@@ -16,7 +16,10 @@
 Flavor interface.
 """
 
+import collections
+
 from oslo_utils import strutils
+import six
 from six.moves.urllib import parse
 
 from novaclient import base
@@ -90,6 +93,8 @@ class Flavor(base.Resource):
 class FlavorManager(base.ManagerWithFind):
     """Manage :class:`Flavor` resources."""
     resource_class = Flavor
+    cache_lookups = True
+    find_filters = {'is_public': 'is_public'}
     is_alphanum_id_allowed = True
 
     def list(self, detailed=True, is_public=True, marker=None, min_disk=None,
@@ -110,32 +115,65 @@ class FlavorManager(base.ManagerWithFind):
         :param sort_dir: Flavors list sort direction (optional).
         :returns: list of :class:`Flavor`.
         """
-        qparams = {}
-        # is_public is ternary - None means give all flavors.
-        # By default Nova assumes True and gives admins public flavors
-        # and flavors from their own projects only.
-        if marker:
-            qparams['marker'] = str(marker)
-        if min_disk:
-            qparams['minDisk'] = int(min_disk)
-        if min_ram:
-            qparams['minRam'] = int(min_ram)
-        if limit:
-            qparams['limit'] = int(limit)
-        if sort_key:
-            qparams['sort_key'] = str(sort_key)
-        if sort_dir:
-            qparams['sort_dir'] = str(sort_dir)
-        if not is_public:
-            qparams['is_public'] = is_public
-        qparams = sorted(qparams.items(), key=lambda x: x[0])
-        query_string = "?%s" % parse.urlencode(qparams) if qparams else ""
-
-        detail = ""
-        if detailed:
-            detail = "/detail"
-
-        return self._list("/flavors%s%s" % (detail, query_string), "flavors")
+        url_for_marker = self._list_url(detailed, is_public, min_disk,
+                                        min_ram, limit, sort_key, sort_dir)
+        return self._list(url_for_marker(marker), "flavors")
+
+    def iter(self, detailed=True, is_public=True, marker=None, min_disk=None,
+             min_ram=None, limit=None, sort_key=None, sort_dir=None,
+             prefetch=0):
+        """Iterate over all flavors, fetching them page by page.
+
+        Only the page being consumed is kept in memory. The request ids of
+        the fetched pages are collected in the ``request_ids`` attribute of
+        the returned iterator.
+
+        :param limit: maximum number of flavors to fetch per page (optional).
+        :param prefetch: number of pages to request ahead while the current
+                         page is being consumed (optional).
+
+        See :meth:`list` for the other arguments.
+
+        :returns: :class:`novaclient.base.IteratorWithMeta` of
+                  :class:`Flavor`.
+        """
+        url_for_marker = self._list_url(detailed, is_public, min_disk,
+                                        min_ram, limit, sort_key, sort_dir)
+        return self._iter(url_for_marker, "flavors", marker=marker,
+                          prefetch=prefetch)
+
+    def _list_url(self, detailed, is_public, min_disk, min_ram, limit,
+                  sort_key, sort_dir):
+        """Returns a callable building the listing URL for a marker."""
+        def _url_for_marker(marker):
+            qparams = {}
+            # is_public is ternary - None means give all flavors.
+            # By default Nova assumes True and gives admins public flavors
+            # and flavors from their own projects only.
+            if marker:
+                qparams['marker'] = str(marker)
+            if min_disk:
+                qparams['minDisk'] = int(min_disk)
+            if min_ram:
+                qparams['minRam'] = int(min_ram)
+            if limit:
+                qparams['limit'] = int(limit)
+            if sort_key:
+                qparams['sort_key'] = str(sort_key)
+            if sort_dir:
+                qparams['sort_dir'] = str(sort_dir)
+            if not is_public:
+                qparams['is_public'] = is_public
+            qparams = sorted(qparams.items(), key=lambda x: x[0])
+            query_string = "?%s" % parse.urlencode(qparams) if qparams else ""
+
+            detail = ""
+            if detailed:
+                detail = "/detail"
+
+            return "/flavors%s%s" % (detail, query_string)
+
+        return _url_for_marker
 
     def get(self, flavor):
         """Get a specific flavor.
@@ -153,6 +191,32 @@ class FlavorManager(base.ManagerWithFind):
         """
         return self._delete("/flavors/%s" % base.getid(flavor))
 
+    def get_extra_specs(self, flavors, concurrency=10):
+        """Get the extra specs of several flavors.
+
+        The extra specs are fetched with up to ``concurrency`` requests at
+        the same time instead of one flavor after the other, and once per
+        flavor even if it is listed several times. Nothing is kept between
+        the calls, so the extra specs are always current.
+
+        :param flavors: list of :class:`Flavor`
+        :param concurrency: maximum number of requests sent at the same time
+        :returns: dict of the extra specs keyed by flavor ID, without the
+                  flavors which no longer exist
+        """
+        def _get_keys(flavor):
+            try:
+                return flavor.get_keys()
+            except exceptions.NotFound:
+                return None
+
+        unique = collections.OrderedDict((base.getid(f), f) for f in flavors)
+        results = utils.imap_concurrently(_get_keys, unique.values(),
+                                          concurrency)
+        return dict((flavor_id, extra_specs) for flavor_id, extra_specs
+                    in six.moves.zip(unique, results)
+                    if extra_specs is not None)
+
     def _build_body(self, name, ram, vcpus, disk, id, swap,
                     ephemeral, rxtx_factor, is_public):
         return {
@@ -35,17 +35,25 @@ class HypervisorManager(base.ManagerWithFind):
     resource_class = Hypervisor
     is_alphanum_id_allowed = True
 
+    def _list_url(self, detailed=True, limit=None):
+        """Returns a callable building the listing URL for a marker."""
+        def _url_for_marker(marker):
+            path = '/os-hypervisors'
+            if detailed:
+                path += '/detail'
+            params = {}
+            if limit is not None:
+                params['limit'] = int(limit)
+            if marker is not None:
+                params['marker'] = str(marker)
+            path += utils.prepare_query_string(params)
+            return path
+
+        return _url_for_marker
+
     def _list_base(self, detailed=True, marker=None, limit=None):
-        path = '/os-hypervisors'
-        if detailed:
-            path += '/detail'
-        params = {}
-        if limit is not None:
-            params['limit'] = int(limit)
-        if marker is not None:
-            params['marker'] = str(marker)
-        path += utils.prepare_query_string(params)
-        return self._list(path, 'hypervisors')
+        url_for_marker = self._list_url(detailed=detailed, limit=limit)
+        return self._list(url_for_marker(marker), 'hypervisors')
 
     @api_versions.wraps("2.0", "2.32")
     def list(self, detailed=True):
@@ -66,6 +74,33 @@ class HypervisorManager(base.ManagerWithFind):
         """
         return self._list_base(detailed=detailed, marker=marker, limit=limit)
 
+    @api_versions.wraps("2.0", "2.32")
+    def iter(self, detailed=True):
+        """
+        Iterate over hypervisors.
+
+        Hypervisors are not paginated before microversion 2.33, so they are
+        fetched with a single request.
+        """
+        return self._iter(self._list_url(detailed=detailed), 'hypervisors',
+                          next_marker=lambda data: None)
+
+    @api_versions.wraps("2.33")
+    def iter(self, detailed=True, marker=None, limit=None, prefetch=0):
+        """
+        Iterate over all hypervisors, fetching them page by page.
+
+        :param marker: Begin returning hypervisor that appear later in the
+                       hypervisor list than that represented by this
+                       hypervisor id (optional).
+        :param limit: maximum number of hypervisors to fetch per page
+                      (optional).
+        :param prefetch: number of pages to request ahead while the current
+                         page is being consumed (optional).
+        """
+        return self._iter(self._list_url(detailed=detailed, limit=limit),
+                          'hypervisors', marker=marker, prefetch=prefetch)
+
     def search(self, hypervisor_match, servers=False):
         """
         Get a list of matching hypervisors.
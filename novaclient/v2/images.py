@@ -55,10 +55,15 @@ class GlanceManager(base.Manager):
     """
 
     resource_class = Image
+    # images filtered by id in a single listing, more would risk an overlong
+    # URL
+    _list_max_ids_filter = 50
 
     def find_image(self, name_or_id):
         """Find an image by name or id (user provided input)."""
+        return self._cached_lookup(name_or_id, self._find_image)
 
+    def _find_image(self, name_or_id):
         with self.alternate_service_type(
                 'image', allowed_types=('image',)):
             # glance catalog entries are the unversioned endpoint, so
@@ -85,6 +90,26 @@ class GlanceManager(base.Manager):
                     matches[0].append_request_ids(matches.request_ids)
                     return matches[0]
 
+    def list_by_ids(self, image_ids):
+        """Get the images with the given IDs, in a listing per 50 IDs.
+
+        The images which do not exist or are not visible are left out.
+
+        :param image_ids: IDs of the images
+        :returns: list of :class:`Image`
+        """
+        image_ids = sorted(set(image_ids))
+        images = base.ListWithMeta([], None)
+        with self.alternate_service_type(
+                'image', allowed_types=('image',)):
+            for i in range(0, len(image_ids), self._list_max_ids_filter):
+                chunk = image_ids[i:i + self._list_max_ids_filter]
+                listing = self._list('/v2/images?id=in:%s&limit=%d' % (
+                    ','.join(chunk), len(chunk)), 'images')
+                images.extend(listing)
+                images.append_request_ids(listing.request_ids)
+        return images
+
 
 class ImageManager(base.ManagerWithFind):
     """
@@ -59,6 +59,7 @@ class Keypair(base.Resource):
 
 class KeypairManager(base.ManagerWithFind):
     resource_class = Keypair
+    cache_lookups = True
     keypair_prefix = "os-keypairs"
     is_alphanum_id_allowed = True
 
@@ -185,13 +186,68 @@ class KeypairManager(base.ManagerWithFind):
                        (optional).
         :param limit: maximum number of keypairs to return (optional).
         """
-        params = {}
-        if user_id:
-            params['user_id'] = user_id
-        if limit:
-            params['limit'] = int(limit)
-        if marker:
-            params['marker'] = str(marker)
-        query_string = utils.prepare_query_string(params)
-        url = '/%s%s' % (self.keypair_prefix, query_string)
-        return self._list(url, 'keypairs')
+        url_for_marker = self._list_url(user_id=user_id, limit=limit)
+        return self._list(url_for_marker(marker), 'keypairs')
+
+    @api_versions.wraps("2.0", "2.9")
+    def iter(self):
+        """
+        Iterate over keypairs.
+
+        Keypairs are not paginated before microversion 2.35, so they are
+        fetched with a single request.
+        """
+        return self._iter(self._list_url(), 'keypairs',
+                          next_marker=lambda data: None)
+
+    @api_versions.wraps("2.10", "2.34")
+    def iter(self, user_id=None):
+        """
+        Iterate over keypairs.
+
+        Keypairs are not paginated before microversion 2.35, so they are
+        fetched with a single request.
+
+        :param user_id: Id of key-pairs owner (Admin only).
+        """
+        return self._iter(self._list_url(user_id=user_id), 'keypairs',
+                          next_marker=lambda data: None)
+
+    @api_versions.wraps("2.35")
+    def iter(self, user_id=None, marker=None, limit=None, prefetch=0):
+        """
+        Iterate over all keypairs, fetching them page by page.
+
+        :param user_id: Id of key-pairs owner (Admin only).
+        :param marker: Begin returning keypairs that appear later in the
+                       keypair list than that represented by this keypair name
+                       (optional).
+        :param limit: maximum number of keypairs to fetch per page (optional).
+        :param prefetch: number of pages to request ahead while the current
+                         page is being consumed (optional).
+        """
+        return self._iter(self._list_url(user_id=user_id, limit=limit),
+                          'keypairs', marker=marker, prefetch=prefetch,
+                          next_marker=_next_keypair_marker)
+
+    def _list_url(self, user_id=None, limit=None):
+        """Returns a callable building the listing URL for a marker."""
+        def _url_for_marker(marker):
+            params = {}
+            if user_id:
+                params['user_id'] = user_id
+            if limit:
+                params['limit'] = int(limit)
+            if marker:
+                params['marker'] = str(marker)
+            query_string = utils.prepare_query_string(params)
+            return '/%s%s' % (self.keypair_prefix, query_string)
+
+        return _url_for_marker
+
+
+def _next_keypair_marker(data):
+    # NOTE: keypairs are paginated by name and every listed item is wrapped
+    # into a 'keypair' key.
+    if data:
+        return data[-1].get('keypair', data[-1])['name']
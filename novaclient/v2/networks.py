@@ -52,7 +52,9 @@ class NeutronManager(base.Manager):
 
     def find_network(self, name):
         """Find a network by name (user provided input)."""
+        return self._cached_lookup(name, self._find_network)
 
+    def _find_network(self, name):
         with self.alternate_service_type(
                 'network', allowed_types=('network',)):
 
@@ -79,6 +81,7 @@ class NetworkManager(base.ManagerWithFind):
     DEPRECATED: Manage :class:`Network` resources.
     """
     resource_class = Network
+    cache_lookups = True
 
     @api_versions.deprecated_after('2.35')
     def list(self):
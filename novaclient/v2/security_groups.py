@@ -50,6 +50,7 @@ class SecurityGroupManager(base.ManagerWithFind):
     """DEPRECATED"""
 
     resource_class = SecurityGroup
+    find_options = ('all_tenants',)
 
     @api_versions.deprecated_after('2.35')
     def create(self, name, description):
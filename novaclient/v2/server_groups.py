@@ -44,6 +44,7 @@ class ServerGroupsManager(base.ManagerWithFind):
     Manage :class:`ServerGroup` resources.
     """
     resource_class = ServerGroup
+    cache_lookups = True
 
     def list(self, all_projects=False, limit=None, offset=None):
         """Get a list of all server groups.
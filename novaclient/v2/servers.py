@@ -20,8 +20,12 @@ Server interface.
 """
 
 import base64
+import datetime
+import time
 
 from oslo_utils import encodeutils
+from oslo_utils import timeutils
+from oslo_utils import uuidutils
 import six
 from six.moves.urllib import parse
 
@@ -30,6 +34,7 @@ from novaclient import base
 from novaclient import crypto
 from novaclient import exceptions
 from novaclient.i18n import _
+from novaclient import utils
 from novaclient.v2 import security_groups
 
 
@@ -608,6 +613,13 @@ class NetworkInterface(base.Resource):
 
 class ServerManager(base.BootingManagerWithFind):
     resource_class = Server
+    find_filters = {'name': 'name', 'human_id': 'name', 'display_name': 'name',
+                    'status': 'status', 'tenant_id': 'tenant_id',
+                    'user_id': 'user_id'}
+    find_options = ('all_tenants', 'deleted')
+    # servers waited for with a GET each, more are polled with a single
+    # listing of the changed servers
+    _wait_max_gets = 5
 
     def _boot(self, resource_url, response_key, name, image, flavor,
               meta=None, files=None, userdata=None,
@@ -762,7 +774,7 @@ class ServerManager(base.BootingManagerWithFind):
         return self._get("/servers/%s" % base.getid(server), "server")
 
     def list(self, detailed=True, search_opts=None, marker=None, limit=None,
-             sort_keys=None, sort_dirs=None):
+             sort_keys=None, sort_dirs=None, prefetch=0, compact=False):
         """
         Get a list of servers.
 
@@ -777,6 +789,13 @@ class ServerManager(base.BootingManagerWithFind):
         :param limit: Maximum number of servers to return (optional).
         :param sort_keys: List of sort keys
         :param sort_dirs: List of sort directions
+        :param prefetch: Number of pages to request ahead while the current
+                         page is being processed when all servers are listed
+                         with ``limit=-1``. 0 fetches the pages one after
+                         another (optional).
+        :param compact: Keep the attributes of each server only in its
+                        ``_info`` dictionary, which reduces the memory used
+                        by large listings (optional).
 
         :rtype: list of :class:`Server`
 
@@ -789,7 +808,61 @@ class ServerManager(base.BootingManagerWithFind):
 
         client.servers.list(limit=10) - returns only 10 servers
 
+        client.servers.list(limit=-1, prefetch=2) - returns all servers,
+        keeping the request for the next page in flight while the current
+        one is processed
+
+        """
+        url_for_marker = self._list_url(detailed, search_opts, limit,
+                                        sort_keys, sort_dirs)
+        if limit != -1:
+            return self._list(url_for_marker(marker), "servers",
+                              compact=compact)
+
+        result = base.ListWithMeta([], None)
+        cache_entries = {}
+        for resp, data in self._list_pages(url_for_marker, "servers",
+                                           marker=marker, prefetch=prefetch):
+            servers = self._build_list(resp, data, compact=compact,
+                                       cache_mode="a" if cache_entries
+                                       else "w",
+                                       cache_entries=cache_entries)
+            result.extend(servers)
+            result.append_request_ids(servers.request_ids)
+        return result
+
+    def iter(self, detailed=True, search_opts=None, marker=None, limit=None,
+             sort_keys=None, sort_dirs=None, prefetch=0, compact=False):
+        """
+        Iterate over all servers, fetching them page by page.
+
+        Unlike :meth:`list` with ``limit=-1``, only the page being consumed
+        is kept in memory, so arbitrarily large listings can be processed.
+        The request ids of the fetched pages are collected in the
+        ``request_ids`` attribute of the returned iterator.
+
+        :param detailed: Whether to return detailed server info (optional).
+        :param search_opts: Search options to filter out servers which don't
+            match the search_opts (optional). See :meth:`list`.
+        :param marker: Begin returning servers that appear later in the server
+                       list than that represented by this server id (optional).
+        :param limit: Maximum number of servers to fetch per page (optional).
+        :param sort_keys: List of sort keys
+        :param sort_dirs: List of sort directions
+        :param prefetch: Number of pages to request ahead while the current
+                         page is being consumed (optional).
+        :param compact: Keep the attributes of each server only in its
+                        ``_info`` dictionary (optional). See :meth:`list`.
+
+        :rtype: :class:`novaclient.base.IteratorWithMeta` of :class:`Server`
         """
+        url_for_marker = self._list_url(detailed, search_opts, limit,
+                                        sort_keys, sort_dirs)
+        return self._iter(url_for_marker, "servers", marker=marker,
+                          prefetch=prefetch, compact=compact)
+
+    def _list_url(self, detailed, search_opts, limit, sort_keys, sort_dirs):
+        """Returns a callable building the listing URL for a marker."""
         if search_opts is None:
             search_opts = {}
 
@@ -805,8 +878,7 @@ class ServerManager(base.BootingManagerWithFind):
         if detailed:
             detail = "/detail"
 
-        result = base.ListWithMeta([], None)
-        while True:
+        def _url_for_marker(marker):
             if marker:
                 qparams['marker'] = marker
 
@@ -831,15 +903,134 @@ class ServerManager(base.BootingManagerWithFind):
             else:
                 query_string = ""
 
-            servers = self._list("/servers%s%s" % (detail, query_string),
-                                 "servers")
-            result.extend(servers)
-            result.append_request_ids(servers.request_ids)
+            return "/servers%s%s" % (detail, query_string)
+
+        return _url_for_marker
+
+    def wait_for_status(self, servers, states, timeout=None, poll_period=None,
+                        all_tenants=False, clock_skew=300,
+                        raise_on_error=True):
+        """
+        Wait for servers to reach one of the given states.
+
+        The servers given by ID, or without an update time, are fetched once
+        first, and the ones already in one of the states are yielded right
+        away. The servers still pending are then polled with a GET each when
+        there are a few of them, otherwise together with a single listing of
+        the servers changed since the oldest update time seen
+        ("changes-since"), filtered on the pending servers client side.
+
+        :param servers: The :class:`Server` (or its ID) list to wait for.
+        :param states: The statuses (case insensitive) to wait for, e.g.
+                       ``['ACTIVE', 'SHUTOFF']``. A server which no longer
+                       exists is ``DELETED``.
+        :param timeout: Seconds after which
+                        :class:`novaclient.exceptions.ResourceWaitTimeout` is
+                        raised for the servers still pending (optional).
+        :param poll_period: Seconds between polls. By default the period
+                            starts at one second and backs off while the
+                            servers do not change.
+        :param all_tenants: Whether the servers belong to other projects, which
+                            requires admin rights (optional).
+        :param clock_skew: Seconds subtracted from the local time when the
+                           update time of a server is unknown.
+        :param raise_on_error: If False, the servers going to ERROR or deleted
+                               are yielded too instead of raising, so the
+                               caller can wait for the other servers.
+        :returns: A generator yielding each :class:`Server` as soon as it
+                  reaches one of the states.
+        :raises: :class:`novaclient.exceptions.ResourceInErrorState` if a
+                 server goes to ERROR and
+                 :class:`novaclient.exceptions.InstanceInDeletedState` if a
+                 server is deleted while not waiting for ``DELETED``.
+        """
+        states = [state.lower() for state in states]
+        default_since = (timeutils.utcnow() -
+                         datetime.timedelta(seconds=clock_skew)).isoformat()
+        backoff = utils.Backoff()
+
+        def _check(server):
+            """Returns whether the server is done, updating its marker."""
+            status = (server.status or '').lower()
+            if status in states or (not raise_on_error and
+                                    status in ('error', 'deleted')):
+                del pending[server.id]
+                return True
+            elif status == 'error':
+                raise exceptions.ResourceInErrorState(server)
+            elif status == 'deleted':
+                fault = getattr(server, 'fault', None) or {}
+                raise exceptions.InstanceInDeletedState(fault.get('message'))
+            updated = server.to_dict().get('updated')
+            if updated and updated != pending[server.id]:
+                # the server is progressing, poll sooner
+                pending[server.id] = updated
+                backoff.reset()
+            return False
+
+        pending = {}
+        unknown = []
+        for server in servers:
+            # NOTE: to_dict() is used to read the update time, as getattr()
+            # would lazy load the servers which do not have one.
+            updated = (server.to_dict().get('updated')
+                       if isinstance(server, Server) else None)
+            pending[base.getid(server)] = updated or default_since
+            if not updated:
+                unknown.append(base.getid(server))
+        # NOTE: the servers already in one of the states, or changed before
+        # default_since, would never be returned by a changes-since listing.
+        for server_id in unknown:
+            server = self._get_for_wait(server_id)
+            if _check(server):
+                yield server
+
+        if timeout is not None:
+            deadline = time.time() + timeout
+        while pending:
+            period = poll_period or backoff.next_period()
+            if timeout is not None:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise exceptions.ResourceWaitTimeout(sorted(pending),
+                                                         timeout)
+                period = min(period, remaining)
+            time.sleep(period)
+
+            if len(pending) <= self._wait_max_gets:
+                changed = [self._get_for_wait(server_id)
+                           for server_id in sorted(pending)]
+            else:
+                search_opts = {'changes-since': min(pending.values())}
+                if all_tenants:
+                    search_opts['all_tenants'] = 1
+                # NOTE: the changed servers might not fit in a single page
+                changed = self.list(search_opts=search_opts, limit=-1)
+            for server in changed:
+                if server.id in pending and _check(server):
+                    yield server
+
+    def _get_for_wait(self, server_id):
+        """Gets a server, DELETED if it no longer exists."""
+        try:
+            return self.get(server_id)
+        except exceptions.NotFound:
+            return self.resource_class(self, {'id': server_id,
+                                              'status': 'DELETED'},
+                                       loaded=True)
 
-            if not servers or limit != -1:
-                break
-            marker = result[-1].id
-        return result
+    def wait_for_delete(self, servers, timeout=None, poll_period=None,
+                        all_tenants=False):
+        """
+        Wait for servers to be deleted.
+
+        See :meth:`wait_for_status` for the parameters.
+
+        :returns: A generator yielding each deleted :class:`Server`.
+        """
+        return self.wait_for_status(servers, ['deleted'], timeout=timeout,
+                                    poll_period=poll_period,
+                                    all_tenants=all_tenants)
 
     def add_fixed_ip(self, server, network_id):
         """
@@ -1352,6 +1543,134 @@ class ServerManager(base.BootingManagerWithFind):
         return self._boot(resource_url, response_key, *boot_args,
                           **boot_kwargs)
 
+    def _resolve_boot_resources(self, spec, memo):
+        """Replaces the image, flavor and network names of a create() spec.
+
+        The lookups are memoized in ``memo``, so the resources shared by
+        several specs are only resolved once.
+        """
+        def _memoized(kind, value, find):
+            key = (kind, value)
+            if key not in memo:
+                memo[key] = find(value)
+            return memo[key]
+
+        spec = dict(spec)
+        image = spec.get('image')
+        if (isinstance(image, six.string_types) and
+                not uuidutils.is_uuid_like(image)):
+            spec['image'] = _memoized('image', image,
+                                      self.api.glance.find_image)
+        flavor = spec.get('flavor')
+        if isinstance(flavor, six.string_types):
+            spec['flavor'] = _memoized(
+                'flavor', flavor,
+                lambda f: utils.find_resource(self.api.flavors, f,
+                                              wrap_exception=False))
+        nics = spec.get('nics')
+        if nics and not isinstance(nics, six.string_types):
+            spec['nics'] = []
+            for nic in nics:
+                nic = dict(nic)
+                net_name = nic.pop('net-name', None)
+                if net_name:
+                    network = _memoized('network', net_name,
+                                        self.api.neutron.find_network)
+                    nic['net-id'] = network.id
+                spec['nics'].append(nic)
+        return spec
+
+    def create_many(self, specs, concurrency=1, wait=False, timeout=None,
+                    max_retries=3):
+        """
+        Create (boot) many servers with different parameters.
+
+        The images, flavors and networks given by name are resolved once for
+        all the servers, then the servers are created by up to
+        ``concurrency`` requests at the same time. A request refused because
+        of a rate limit is retried after the delay advertised by the server,
+        unless the client already retries these requests itself (see the
+        ``rate_limit_retries`` argument of :class:`novaclient.client.Client`).
+
+        :param specs: A list of dicts of :meth:`create` arguments, one per
+                      server. ``image`` and ``flavor`` can also be names, and
+                      the ``nics`` can have a ``net-name`` instead of a
+                      ``net-id``.
+        :param concurrency: Number of servers created at the same time
+                            (optional).
+        :param wait: Whether to wait for the servers to be ACTIVE, see
+                     :meth:`wait_for_status` (optional).
+        :param timeout: Seconds to wait for the servers to be ACTIVE
+                        (optional).
+        :param max_retries: Number of retries of a rate limited request
+                            (optional).
+        :returns: The list of created :class:`Server`, in the order of the
+                  specs.
+        :raises: :class:`novaclient.exceptions.CreateManyError` once all the
+                 specs are processed if some servers could not be created,
+                 went to ERROR or were not ACTIVE before the timeout while
+                 waiting for them. The servers which
+                 were created are in its ``servers`` attribute, so that they
+                 can be used or cleaned up.
+        """
+        memo = {}
+        specs = [self._resolve_boot_resources(spec, memo) for spec in specs]
+
+        if getattr(self.api.client, 'rate_limit_retries', 0):
+            # NOTE: the client retries the rate limited requests already
+            max_retries = 0
+
+        def _create(spec):
+            backoff = utils.Backoff()
+            for attempt in range(max_retries + 1):
+                try:
+                    return self.create(**spec), None
+                except (exceptions.OverLimit, exceptions.RateLimit) as e:
+                    # an OverLimit without Retry-After is an exceeded quota,
+                    # which retrying will not fix
+                    if attempt == max_retries or not (
+                            e.retry_after or
+                            isinstance(e, exceptions.RateLimit)):
+                        return None, e
+                    time.sleep(e.retry_after or backoff.next_period())
+                except Exception as e:
+                    return None, e
+
+        servers = []
+        errors = []
+        results = utils.imap_concurrently(_create, specs, parallel=concurrency)
+        for index, (server, error) in enumerate(results):
+            servers.append(server)
+            if error is not None:
+                errors.append((index, error))
+
+        created = [server for server in servers if server is not None]
+        if wait and created:
+            indexes = dict((server.id, index)
+                           for index, server in enumerate(servers)
+                           if server is not None)
+            try:
+                for server in self.wait_for_status(created, ['active'],
+                                                   timeout=timeout,
+                                                   raise_on_error=False):
+                    index = indexes[server.id]
+                    # update the created servers, which keeps the attributes
+                    # only returned by the creation, such as adminPass
+                    servers[index]._add_details(server._info)
+                    if (server.status or '').lower() != 'active':
+                        errors.append(
+                            (index, exceptions.ResourceInErrorState(server)))
+            except exceptions.ResourceWaitTimeout as e:
+                errors.extend(
+                    (indexes[server_id],
+                     exceptions.ResourceWaitTimeout([server_id], e.timeout))
+                    for server_id in e.resources)
+
+        if errors:
+            raise exceptions.CreateManyError(
+                servers, sorted(errors, key=lambda error: error[0]))
+        return servers
+
     @api_versions.wraps("2.0", "2.18")
     def update(self, server, name=None):
         """
@@ -23,6 +23,7 @@ import collections
 import datetime
 import functools
 import getpass
+import itertools
 import locale
 import logging
 import os
@@ -749,10 +750,13 @@ def do_cloudpipe_configure(cs, args):
 
 
 def _poll_for_status(poll_fn, obj_id, action, final_ok_states,
-                     poll_period=5, show_progress=True,
+                     poll_period=None, show_progress=True,
                      status_field="status", silent=False):
     """Block while an action is being performed, periodically printing
     progress.
+
+    Unless a fixed poll_period is given, the polls are spaced out by an
+    exponential backoff, which is reset whenever the progress changes.
     """
     def print_progress(progress):
         if show_progress:
@@ -767,6 +771,10 @@ def _poll_for_status(poll_fn, obj_id, action, final_ok_states,
     if not silent:
         print()
 
+    # NOTE: the shell is waited on interactively, so it polls at least every
+    #       5 seconds rather than up to the default 20 seconds of Backoff.
+    backoff = utils.Backoff(max_period=5) if poll_period is None else None
+    last_progress = None
     while True:
         obj = poll_fn(obj_id)
 
@@ -793,7 +801,37 @@ def _poll_for_status(poll_fn, obj_id, action, final_ok_states,
         if not silent:
             print_progress(progress)
 
-        time.sleep(poll_period)
+        if backoff is None:
+            time.sleep(poll_period)
+        else:
+            if progress != last_progress:
+                backoff.reset()
+                last_progress = progress
+            time.sleep(backoff.next_period())
+
+
+def _poll_for_servers_status(cs, servers, action, final_ok_states):
+    """Block until all the servers reached one of final_ok_states.
+
+    The servers going to ERROR or deleted are reported as they fail, and a
+    single CommandError is raised once all the servers are done.
+    """
+    failure_flag = False
+    for server in cs.servers.wait_for_status(servers, final_ok_states,
+                                             raise_on_error=False):
+        status = (server.status or '').lower()
+        if status in final_ok_states:
+            print(_("Server %(server)s %(action)s finished.") %
+                  {'server': server.id, 'action': action})
+        else:
+            failure_flag = True
+            print(_("Error %(action)s server %(server)s: %(status)s") %
+                  {'action': action, 'server': server.id,
+                   'status': server.status})
+
+    if failure_flag:
+        raise exceptions.CommandError(
+            _("Wait for specified server(s) failed."))
 
 
 def _translate_keys(collection, convert):
@@ -829,15 +867,28 @@ def _translate_extended_states(collection):
             setattr(item, 'task_state', "N/A")
 
 
+def _translate_servers(servers, convert):
+    """Translates the keys and states of servers as they are iterated."""
+    for server in servers:
+        _translate_keys([server], convert)
+        _translate_extended_states([server])
+        yield server
+
+
 def _translate_flavor_keys(collection):
     _translate_keys(collection, [('ram', 'memory_mb')])
 
 
-def _print_flavor_extra_specs(flavor):
-    try:
-        return flavor.get_keys()
-    except exceptions.NotFound:
-        return "N/A"
+def _get_flavors_extra_specs(flavors):
+    """Get the extra specs of flavors, "N/A" for the missing ones.
+
+    They are fetched concurrently before printing, rather than one by one
+    while the table is printed.
+    """
+    extra_specs = {}
+    if flavors:
+        extra_specs = flavors[0].manager.get_extra_specs(flavors)
+    return dict((f.id, extra_specs.get(f.id, "N/A")) for f in flavors)
 
 
 def _print_flavor_list(flavors, show_extra_specs=False):
@@ -856,7 +907,8 @@ def _print_flavor_list(flavors, show_extra_specs=False):
     ]
 
     if show_extra_specs:
-        formatters = {'extra_specs': _print_flavor_extra_specs}
+        extra_specs = _get_flavors_extra_specs(flavors)
+        formatters = {'extra_specs': lambda f: extra_specs[f.id]}
         headers.append('extra_specs')
     else:
         formatters = {}
@@ -1445,7 +1497,8 @@ def _print_flavor(flavor):
     info = flavor.to_dict()
     # ignore links, we don't need to present those
     info.pop('links')
-    info.update({"extra_specs": _print_flavor_extra_specs(flavor)})
+    extra_specs = _get_flavors_extra_specs([flavor])[flavor.id]
+    info.update({"extra_specs": extra_specs})
     utils.print_dict(info)
 
 
@@ -1702,24 +1755,47 @@ def do_list(cs, args):
             raise exceptions.CommandError(_('Invalid changes-since value: %s')
                                           % search_opts['changes-since'])
 
-    servers = cs.servers.list(detailed=detailed,
-                              search_opts=search_opts,
-                              sort_keys=sort_keys,
-                              sort_dirs=sort_dirs,
-                              marker=args.marker,
-                              limit=args.limit)
+    fields = args.fields.split(',') if args.fields else []
+    # the flavors and images are resolved once for all the servers
+    resolve_flavors = not args.minimal and 'flavor' in fields
+    resolve_images = not args.minimal and 'image' in fields
+    list_kwargs = dict(detailed=detailed, search_opts=search_opts,
+                       sort_keys=sort_keys, sort_dirs=sort_dirs,
+                       marker=args.marker)
+    if (args.limit == -1 and
+            getattr(args, 'output_format', 'table') != 'table' and
+            not resolve_flavors and not resolve_images):
+        # the formats other than the table print the servers as their
+        # pages are received
+        servers = cs.servers.iter(**list_kwargs)
+    else:
+        servers = cs.servers.list(limit=args.limit, **list_kwargs)
     convert = [('OS-EXT-SRV-ATTR:host', 'host'),
                ('OS-EXT-STS:task_state', 'task_state'),
                ('OS-EXT-SRV-ATTR:instance_name', 'instance_name'),
                ('OS-EXT-STS:power_state', 'power_state'),
                ('hostId', 'host_id')]
-    _translate_keys(servers, convert)
-    _translate_extended_states(servers)
+    if isinstance(servers, list):
+        _translate_keys(servers, convert)
+        _translate_extended_states(servers)
+        first_servers = servers
+    else:
+        servers = _translate_servers(servers, convert)
+        # the fields are checked against the first server
+        first_servers = list(itertools.islice(servers, 1))
+        servers = itertools.chain(first_servers, servers)
 
     formatters = {}
 
+    if resolve_flavors:
+        flavors = _get_server_flavors(cs, servers)
+        filters['flavor'] = lambda f: _format_server_flavor(f, flavors)
+    if resolve_images:
+        images = _get_server_images(cs, servers)
+        filters['image'] = lambda i: _format_server_image(i, images)
+
     cols, fmts = _get_list_table_columns_and_formatters(
-        args.fields, servers, exclude_fields=('id',), filters=filters)
+        args.fields, first_servers, exclude_fields=('id',), filters=filters)
 
     if args.minimal:
         columns = [
@@ -1836,22 +1912,31 @@ def _get_list_table_columns_and_formatters(fields, objs, exclude_fields=(),
     action="store_true",
     default=False,
     help=_('Poll until reboot is complete.'))
+@utils.arg(
+    '--parallel',
+    metavar='<count>',
+    type=int,
+    default=1,
+    help=_('Number of servers to act on concurrently (Default=1).'))
 def do_reboot(cs, args):
     """Reboot a server."""
-    servers = [_find_server(cs, s) for s in args.server]
+    servers = {}
+
+    def _reboot(name_or_id):
+        server = _find_server(cs, name_or_id)
+        server.reboot(args.reboot_type)
+        servers[name_or_id] = server
+
     utils.do_action_on_many(
-        lambda s: s.reboot(args.reboot_type),
-        servers,
+        _reboot,
+        args.server,
         _("Request to reboot server %s has been accepted."),
-        _("Unable to reboot the specified server(s)."))
+        _("Unable to reboot the specified server(s)."),
+        parallel=args.parallel)
 
     if args.poll:
-        utils.do_action_on_many(
-            lambda s: _poll_for_status(cs.servers.get, s.id, 'rebooting',
-                                       ['active'], show_progress=False),
-            servers,
-            _("Wait for server %s reboot."),
-            _("Wait for specified server(s) failed."))
+        _poll_for_servers_status(cs, [servers[s] for s in args.server],
+                                 'rebooting', ['active'])
 
 
 @utils.arg('server', metavar='<server>', help=_('Name or ID of server.'))
@@ -2050,6 +2135,12 @@ def do_unpause(cs, args):
     'server',
     metavar='<server>', nargs='+',
     help=_('Name or ID of server(s).'))
+@utils.arg(
+    '--parallel',
+    metavar='<count>',
+    type=int,
+    default=1,
+    help=_('Number of servers to act on concurrently (Default=1).'))
 def do_stop(cs, args):
     """Stop the server(s)."""
     find_args = {'all_tenants': args.all_tenants}
@@ -2057,7 +2148,8 @@ def do_stop(cs, args):
         lambda s: _find_server(cs, s, **find_args).stop(),
         args.server,
         _("Request to stop server %s has been accepted."),
-        _("Unable to stop the specified server(s)."))
+        _("Unable to stop the specified server(s)."),
+        parallel=args.parallel)
 
 
 @utils.arg(
@@ -2070,6 +2162,12 @@ def do_stop(cs, args):
     'server',
     metavar='<server>', nargs='+',
     help=_('Name or ID of server(s).'))
+@utils.arg(
+    '--parallel',
+    metavar='<count>',
+    type=int,
+    default=1,
+    help=_('Number of servers to act on concurrently (Default=1).'))
 def do_start(cs, args):
     """Start the server(s)."""
     find_args = {'all_tenants': args.all_tenants}
@@ -2077,7 +2175,8 @@ def do_start(cs, args):
         lambda s: _find_server(cs, s, **find_args).start(),
         args.server,
         _("Request to start server %s has been accepted."),
-        _("Unable to start the specified server(s)."))
+        _("Unable to start the specified server(s)."),
+        parallel=args.parallel)
 
 
 @utils.arg('server', metavar='<server>', help=_('Name or ID of server.'))
@@ -2279,6 +2378,76 @@ def do_meta(cs, args):
         cs.servers.delete_meta(server, sorted(metadata.keys(), reverse=True))
 
 
+def _get_server_flavors(cs, servers):
+    """Get the flavors of servers, keyed by ID.
+
+    The distinct flavors of all the servers are resolved at once, from a
+    single listing rather than with a lookup for each server. The ones
+    which cannot be found are left out.
+    """
+    flavor_ids = set((server.to_dict().get('flavor') or {}).get('id')
+                     for server in servers) - set([None, ''])
+    flavors = {}
+    if len(flavor_ids) > 1:
+        try:
+            flavors = dict((f.id, f) for f in
+                           cs.flavors.list(detailed=True, is_public=None))
+        except Exception:
+            pass
+    for flavor_id in flavor_ids - set(flavors):
+        # deleted flavors are not listed, but can still be shown
+        try:
+            flavors[flavor_id] = _find_flavor(cs, flavor_id)
+        except Exception:
+            pass
+    return flavors
+
+
+def _get_server_images(cs, servers):
+    """Get the images of servers, keyed by ID.
+
+    The distinct images of all the servers are resolved at once, with a
+    single Glance listing filtered by ID rather than with a lookup for each
+    server. If that listing fails, e.g. because the image service does not
+    support the filter, the images are looked up one by one. The ones which
+    cannot be found are left out.
+    """
+    image_ids = set()
+    for server in servers:
+        # servers booted from volume have no image
+        image = server.to_dict().get('image') or {}
+        if image.get('id'):
+            image_ids.add(image['id'])
+    if len(image_ids) > 1:
+        try:
+            return dict((i.id, i) for i in cs.glance.list_by_ids(image_ids))
+        except Exception:
+            pass
+    images = {}
+    for image_id in image_ids:
+        try:
+            images[image_id] = _find_image(cs, image_id)
+        except Exception:
+            pass
+    return images
+
+
+def _format_server_flavor(flavor, flavors):
+    """Format the flavor of a server using the flavors keyed by ID."""
+    flavor_id = flavor.get('id', '')
+    if flavor_id in flavors:
+        return '%s (%s)' % (flavors[flavor_id].name, flavor_id)
+    return '%s (%s)' % (_("Flavor not found"), flavor_id)
+
+
+def _format_server_image(image, images):
+    """Format the image of a server using the images keyed by ID."""
+    image_id = image.get('id', '')
+    if image_id in images:
+        return '%s (%s)' % (images[image_id].name, image_id)
+    return '%s (%s)' % (_("Image not found"), image_id)
+
+
 def _print_server(cs, args, server=None, wrap=0):
     # By default when searching via name we will do a
     # findall(name=blah) and due a REST /details which is not the same
@@ -2300,11 +2469,8 @@ def _print_server(cs, args, server=None, wrap=0):
     if minimal:
         info['flavor'] = flavor_id
     else:
-        try:
-            info['flavor'] = '%s (%s)' % (_find_flavor(cs, flavor_id).name,
-                                          flavor_id)
-        except Exception:
-            info['flavor'] = '%s (%s)' % (_("Flavor not found"), flavor_id)
+        info['flavor'] = _format_server_flavor(
+            flavor, _get_server_flavors(cs, [server]))
 
     if 'security_groups' in info:
         # when we have multiple nics the info will include the
@@ -2319,11 +2485,8 @@ def _print_server(cs, args, server=None, wrap=0):
         if minimal:
             info['image'] = image_id
         else:
-            try:
-                info['image'] = '%s (%s)' % (_find_image(cs, image_id).name,
-                                             image_id)
-            except Exception:
-                info['image'] = '%s (%s)' % (_("Image not found"), image_id)
+            info['image'] = _format_server_image(
+                image, _get_server_images(cs, [server]))
     else:  # Booted from volume
         info['image'] = _("Attempt to boot from volume - no image supplied")
 
@@ -2357,6 +2520,12 @@ def do_show(cs, args):
 @utils.arg(
     'server', metavar='<server>', nargs='+',
     help=_('Name or ID of server(s).'))
+@utils.arg(
+    '--parallel',
+    metavar='<count>',
+    type=int,
+    default=1,
+    help=_('Number of servers to act on concurrently (Default=1).'))
 def do_delete(cs, args):
     """Immediately shut down and delete specified server(s)."""
     find_args = {'all_tenants': args.all_tenants}
@@ -2364,7 +2533,8 @@ def do_delete(cs, args):
         lambda s: _find_server(cs, s, **find_args).delete(),
         args.server,
         _("Request to delete server %s has been accepted."),
-        _("Unable to delete the specified server(s)."))
+        _("Unable to delete the specified server(s)."),
+        parallel=args.parallel)
 
 
 def _find_server(cs, server, raise_if_notfound=True, **find_args):
@@ -5351,6 +5521,72 @@ def do_restore(cs, args):
     utils.find_resource(cs.servers, args.server, deleted=True).restore()
 
 
+def _wait_for_migration(cs, server_uuid, timeout=None):
+    """Block until the server is no longer being migrated.
+
+    Returns the server once its task state is cleared. The polls are spaced
+    out by an exponential backoff; a CommandError is raised if the migration
+    is not over after timeout seconds.
+    """
+    if timeout is not None:
+        deadline = time.time() + timeout
+    backoff = utils.Backoff(max_period=5)
+    while True:
+        server = cs.servers.get(server_uuid)
+        if getattr(server, 'OS-EXT-STS:task_state', None) is None:
+            return server
+        period = backoff.next_period()
+        if timeout is not None:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise exceptions.CommandError(
+                    _("Timed out after %(timeout)s seconds waiting for the "
+                      "migration of server %(server)s.") %
+                    {'timeout': timeout, 'server': server_uuid})
+            period = min(period, remaining)
+        time.sleep(period)
+
+
+def _migrate_host_servers(cs, args, migrate, accepted_field,
+                          max_servers=None):
+    """Migrate the servers of the hypervisors matching args.host.
+
+    Up to args.parallel servers are migrated at the same time. With
+    args.wait, a server keeps its slot until its migration is over and the
+    responses report the final status and host of the servers.
+    """
+    hypervisors = cs.hypervisors.search(args.host, servers=True)
+    servers = [server for hyper in hypervisors
+               for server in getattr(hyper, 'servers', [])]
+    if max_servers is not None:
+        servers = servers[:max_servers]
+
+    def _migrate(server):
+        response = migrate(cs, server, args)
+        if args.wait:
+            response.status = None
+            response.host = None
+            if getattr(response, accepted_field):
+                try:
+                    server = _wait_for_migration(cs, server['uuid'],
+                                                 args.wait_timeout)
+                    response.status = server.status
+                    response.host = getattr(server, 'OS-EXT-SRV-ATTR:host',
+                                            None)
+                except Exception as e:
+                    response.error_message = (
+                        _("Error while waiting for the migration: %s") % e)
+        return response
+
+    return list(utils.imap_concurrently(_migrate, servers, args.parallel))
+
+
+def _print_host_servers_migration(args, response, fields):
+    if args.wait:
+        fields = fields[:-1] + ["Status", "Host"] + fields[-1:]
+    utils.print_list(response, fields)
+
+
 class EvacuateHostResponse(base.Resource):
     pass
 
@@ -5403,18 +5639,34 @@ def _server_evacuate(cs, server, args):
     default=False,
     help=_('Force to not verify the scheduler if a host is provided.'),
     start_version='2.29')
+@utils.arg(
+    '--parallel',
+    metavar='<count>',
+    type=int,
+    default=1,
+    help=_('Maximum number of servers migrated at the same time '
+           '(Default=1).'))
+@utils.arg(
+    '--wait',
+    action='store_true',
+    default=False,
+    help=_('Wait for the migration of a server to be over before migrating '
+           'another one in its place, and report the final status and host '
+           'of the servers.'))
+@utils.arg(
+    '--wait-timeout',
+    metavar='<seconds>',
+    type=int,
+    default=3600,
+    help=_('With --wait, maximum number of seconds to wait for the migration '
+           'of a server (Default=3600).'))
 def do_host_evacuate(cs, args):
     """Evacuate all instances from failed host."""
-
-    hypervisors = cs.hypervisors.search(args.host, servers=True)
-    response = []
-    for hyper in hypervisors:
-        if hasattr(hyper, 'servers'):
-            for server in hyper.servers:
-                response.append(_server_evacuate(cs, server, args))
-
-    utils.print_list(response,
-                     ["Server UUID", "Evacuate Accepted", "Error Message"])
+    response = _migrate_host_servers(cs, args, _server_evacuate,
+                                     'evacuate_accepted')
+    _print_host_servers_migration(
+        args, response,
+        ["Server UUID", "Evacuate Accepted", "Error Message"])
 
 
 def _server_live_migrate(cs, server, args):
@@ -5481,22 +5733,37 @@ def _server_live_migrate(cs, server, args):
     default=False,
     help=_('Force to not verify the scheduler if a host is provided.'),
     start_version='2.30')
+@utils.arg(
+    '--parallel',
+    metavar='<count>',
+    type=int,
+    default=1,
+    help=_('Maximum number of servers migrated at the same time '
+           '(Default=1).'))
+@utils.arg(
+    '--wait',
+    action='store_true',
+    default=False,
+    help=_('Wait for the migration of a server to be over before migrating '
+           'another one in its place, and report the final status and host '
+           'of the servers.'))
+@utils.arg(
+    '--wait-timeout',
+    metavar='<seconds>',
+    type=int,
+    default=3600,
+    help=_('With --wait, maximum number of seconds to wait for the migration '
+           'of a server (Default=3600).'))
 def do_host_evacuate_live(cs, args):
     """Live migrate all instances of the specified host
     to other available hosts.
     """
-    hypervisors = cs.hypervisors.search(args.host, servers=True)
-    response = []
-    migrating = 0
-    for hyper in hypervisors:
-        for server in getattr(hyper, 'servers', []):
-            response.append(_server_live_migrate(cs, server, args))
-            migrating += 1
-            if args.max_servers is not None and migrating >= args.max_servers:
-                break
-
-    utils.print_list(response, ["Server UUID", "Live Migration Accepted",
-                                "Error Message"])
+    response = _migrate_host_servers(cs, args, _server_live_migrate,
+                                     'live_migration_accepted',
+                                     max_servers=args.max_servers)
+    _print_host_servers_migration(
+        args, response,
+        ["Server UUID", "Live Migration Accepted", "Error Message"])
 
 
 class HostServersMigrateResponse(base.Resource):
@@ -5518,20 +5785,37 @@ def _server_migrate(cs, server):
 
 
 @utils.arg('host', metavar='<host>', help='Name of host.')
+@utils.arg(
+    '--parallel',
+    metavar='<count>',
+    type=int,
+    default=1,
+    help=_('Maximum number of servers migrated at the same time '
+           '(Default=1).'))
+@utils.arg(
+    '--wait',
+    action='store_true',
+    default=False,
+    help=_('Wait for the migration of a server to be over before migrating '
+           'another one in its place, and report the final status and host '
+           'of the servers.'))
+@utils.arg(
+    '--wait-timeout',
+    metavar='<seconds>',
+    type=int,
+    default=3600,
+    help=_('With --wait, maximum number of seconds to wait for the migration '
+           'of a server (Default=3600).'))
 def do_host_servers_migrate(cs, args):
     """Cold migrate all instances off the specified host to other available
     hosts.
     """
-
-    hypervisors = cs.hypervisors.search(args.host, servers=True)
-    response = []
-    for hyper in hypervisors:
-        if hasattr(hyper, 'servers'):
-            for server in hyper.servers:
-                response.append(_server_migrate(cs, server))
-
-    utils.print_list(response,
-                     ["Server UUID", "Migration Accepted", "Error Message"])
+    response = _migrate_host_servers(
+        cs, args, lambda cs, server, args: _server_migrate(cs, server),
+        'migration_accepted')
+    _print_host_servers_migration(
+        args, response,
+        ["Server UUID", "Migration Accepted", "Error Message"])
 
 
 @utils.arg(
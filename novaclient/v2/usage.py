@@ -94,6 +94,59 @@ class UsageManager(base.ManagerWithFind):
         url = '/%s%s' % (self.usage_prefix, query_string)
         return self._list(url, 'tenant_usages')
 
+    @api_versions.wraps("2.0", "2.39")
+    def iter(self, start, end, detailed=False):
+        """
+        Iterate over usage for all tenants.
+
+        Usage is not paginated before microversion 2.40, so it is fetched
+        with a single request.
+
+        :param start: :class:`datetime.datetime` Start date in UTC
+        :param end: :class:`datetime.datetime` End date in UTC
+        :param detailed: Whether to include information about each
+                         instance whose usage is part of the report
+        :rtype: :class:`novaclient.base.IteratorWithMeta` of :class:`Usage`.
+        """
+        query_string = self._usage_query(start, end, detailed=detailed)
+        url = '/%s%s' % (self.usage_prefix, query_string)
+        return self._iter(lambda marker: url, 'tenant_usages',
+                          next_marker=lambda data: None)
+
+    @api_versions.wraps("2.40")
+    def iter(self, start, end, detailed=False, marker=None, limit=None,
+             prefetch=0):
+        """
+        Iterate over usage for all tenants, fetching it page by page.
+
+        The usage of a tenant whose instances span several pages is yielded
+        once per page. The next page is located from the instances reported
+        in the current one, so the pages are always requested with the
+        details of the instances, which are then left out of the usage
+        unless ``detailed`` is set.
+
+        :param start: :class:`datetime.datetime` Start date in UTC
+        :param end: :class:`datetime.datetime` End date in UTC
+        :param detailed: Whether to include information about each
+                         instance whose usage is part of the report
+        :param marker: Begin returning usage data for instances that appear
+                       later in the instance list than that represented by
+                       this instance UUID (optional).
+        :param limit: Maximum number of instances to include in the usage of
+                      each page (optional).
+        :param prefetch: Number of pages to request ahead while the current
+                         page is being consumed (optional).
+        :rtype: :class:`novaclient.base.IteratorWithMeta` of :class:`Usage`.
+        """
+        def _url_for_marker(marker):
+            query_string = self._usage_query(start, end, marker, limit,
+                                             detailed=True)
+            return '/%s%s' % (self.usage_prefix, query_string)
+
+        return self._iter(_url_for_marker, 'tenant_usages', marker=marker,
+                          prefetch=prefetch, next_marker=_next_usage_marker,
+                          transform=None if detailed else _strip_usage_details)
+
     @api_versions.wraps("2.0", "2.39")
     def get(self, tenant_id, start, end):
         """
@@ -126,3 +179,16 @@ class UsageManager(base.ManagerWithFind):
         query_string = self._usage_query(start, end, marker, limit)
         url = '/%s/%s%s' % (self.usage_prefix, tenant_id, query_string)
         return self._get(url, 'tenant_usage')
+
+
+def _next_usage_marker(data):
+    # NOTE: usage is paginated by the instances it covers, the listing ends
+    # with a page which does not report any instance.
+    if data and data[-1].get('server_usages'):
+        return data[-1]['server_usages'][-1]['instance_id']
+
+
+def _strip_usage_details(data):
+    return [dict((key, value) for key, value in tenant_usage.items()
+                 if key != 'server_usages')
+            for tenant_usage in data]
@@ -42,6 +42,9 @@ class VersionManager(base.ManagerWithFind):
         # results of this per endpoint and keep the results of it for
         # some reasonable TTL (like 24 hours) to reduce our round trip
         # traffic.
+        # NOTE: the resulting version range is cached per endpoint by
+        # novaclient.api_versions.VersionCache when discovering the version
+        # to use.
         try:
             # Assume that the value of get_endpoint() is something
             # we can get the version of. This is a 404 for Nova <
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Benchmark of the time needed to import novaclient modules.
+
+Each module is imported in fresh interpreters and the best wall-clock time
+is reported. On Python 3.7 and newer the modules taking the most time by
+themselves are listed as well, based on ``python -X importtime``::
+
+    python tools/benchmarks/import_time.py novaclient.v2.shell
+"""
+
+from __future__ import print_function
+
+import argparse
+import subprocess
+import sys
+
+_IMPORT = ("import time; start = time.time(); import %s; "
+           "print(time.time() - start)")
+
+
+def _import_time(module):
+    output = subprocess.check_output([sys.executable, '-c',
+                                      _IMPORT % module])
+    return float(output)
+
+
+def _self_times(module):
+    process = subprocess.Popen(
+        [sys.executable, '-X', 'importtime', '-c', 'import %s' % module],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        universal_newlines=True)
+    _stdout, stderr = process.communicate()
+    times = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        try:
+            times.append((int(fields[0]), fields[2].strip()))
+        except ValueError:
+            # NOTE: the header line
+            continue
+    return sorted(times, reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0])
+    parser.add_argument('modules', nargs='*', default=['novaclient.v2.shell'])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10,
+                        help='Number of novaclient modules to list.')
+    args = parser.parse_args()
+
+    for module in args.modules:
+        best = min(_import_time(module) for _i in range(args.repeat))
+        print('%s: %.3fs' % (module, best))
+        if sys.version_info < (3, 7):
+            continue
+        novaclient_times = [(self_time, name)
+                            for self_time, name in _self_times(module)
+                            if name.startswith('novaclient')]
+        for self_time, name in novaclient_times[:args.top]:
+            print('  %8.1fms %s' % (self_time / 1000.0, name))
+
+
+if __name__ == '__main__':
+    main()
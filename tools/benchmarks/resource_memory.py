@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Benchmark of the memory held by server listings in each resource layout.
+
+Synthetic detailed server dictionaries are turned into ``Server`` objects
+with the default and the compact layout, and the memory allocated on top of
+the raw dictionaries is measured with ``tracemalloc`` (Python 3 only). Each
+layout is measured in a separate interpreter, since the first instances of a
+class influence how much memory CPython preallocates for the next ones::
+
+    python tools/benchmarks/resource_memory.py --servers 50000
+"""
+
+from __future__ import print_function
+
+import argparse
+import gc
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from novaclient.v2 import servers
+
+
+def _make_server(index):
+    server_id = '%08d-0000-0000-0000-000000000000' % index
+    return {
+        'id': server_id,
+        'name': 'server-%d' % index,
+        'status': 'ACTIVE',
+        'tenant_id': 'tenant',
+        'user_id': 'user',
+        'hostId': 'host',
+        'created': '2016-01-01T00:00:00Z',
+        'updated': '2016-01-01T00:00:00Z',
+        'image': {'id': 'image'},
+        'flavor': {'id': 'flavor'},
+        'addresses': {'private': [{'addr': '10.0.0.%d' % (index % 250),
+                                   'version': 4}]},
+        'metadata': {},
+        'links': [],
+        'accessIPv4': '',
+        'accessIPv6': '',
+        'key_name': None,
+        'config_drive': '',
+        'progress': 0,
+        'OS-DCF:diskConfig': 'MANUAL',
+        'OS-EXT-AZ:availability_zone': 'nova',
+        'OS-EXT-STS:task_state': None,
+        'OS-EXT-STS:power_state': 1,
+        'OS-EXT-STS:vm_state': 'active',
+        'os-extended-volumes:volumes_attached': [],
+    }
+
+
+def _measure(data, compact):
+    gc.collect()
+    tracemalloc.start()
+    start = time.time()
+    result = [servers.Server(None, info, loaded=True, compact=compact)
+              for info in data]
+    elapsed = time.time() - start
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--servers', type=int, default=50000)
+    parser.add_argument('--layout', choices=('default', 'compact'),
+                        help='Measure a single layout and print the raw '
+                             'results.')
+    args = parser.parse_args()
+
+    if args.layout:
+        data = [_make_server(i) for i in range(args.servers)]
+        print('%d %f' % _measure(data, args.layout == 'compact'))
+        return
+
+    print('%8s %12s %12s %10s' % ('layout', 'total', 'per server',
+                                  'build'))
+    for layout in ('default', 'compact'):
+        output = subprocess.check_output(
+            [sys.executable, __file__, '--servers', str(args.servers),
+             '--layout', layout])
+        size, elapsed = output.split()
+        size = int(size)
+        print('%8s %10.1fMB %11dB %9.3fs' % (
+            layout, size / 1024.0 / 1024.0, size // args.servers,
+            float(elapsed)))
+
+
+if __name__ == '__main__':
+    main()
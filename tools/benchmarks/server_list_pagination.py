@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Benchmark of ``servers.list(limit=-1)`` against a local fake Nova API.
+
+The fake API serves detailed server pages of a fixed size with an artificial
+latency, so the wall-clock time of serial and prefetched pagination can be
+compared as the number of pages grows::
+
+    python tools/benchmarks/server_list_pagination.py --pages 5 10 20 40
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import threading
+import time
+
+from keystoneauth1 import session as ksession
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+from six.moves.urllib import parse
+
+from novaclient import client
+
+
+def _make_server(index):
+    server_id = '%08d-0000-0000-0000-000000000000' % index
+    return {
+        'id': server_id,
+        'name': 'server-%d' % index,
+        'status': 'ACTIVE',
+        'tenant_id': 'tenant',
+        'user_id': 'user',
+        'hostId': 'host',
+        'image': {'id': 'image'},
+        'flavor': {'id': 'flavor'},
+        'addresses': {'private': [{'addr': '10.0.0.%d' % (index % 250),
+                                   'version': 4}]},
+        'metadata': {'index': str(index)},
+        'links': [],
+        'OS-EXT-STS:task_state': None,
+        'OS-EXT-STS:power_state': 1,
+        'OS-EXT-STS:vm_state': 'active',
+    }
+
+
+class FakeNova(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, pages, page_size, latency):
+        BaseHTTPServer.HTTPServer.__init__(self, ('127.0.0.1', 0),
+                                           FakeNovaHandler)
+        self.latency = latency
+        self.pages = {}
+        marker = None
+        for page in range(pages):
+            servers = [_make_server(page * page_size + i)
+                       for i in range(page_size)]
+            self.pages[marker] = json.dumps({'servers': servers})
+            marker = servers[-1]['id']
+        self.pages[marker] = json.dumps({'servers': []})
+
+    @property
+    def endpoint(self):
+        return 'http://%s:%s/v2.1' % self.server_address
+
+
+class FakeNovaHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        url = parse.urlparse(self.path)
+        marker = parse.parse_qs(url.query).get('marker', [None])[0]
+        time.sleep(self.server.latency)
+        body = self.server.pages[marker].encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _measure(nova, prefetch, repeat):
+    best = None
+    for _i in range(repeat):
+        start = time.time()
+        servers = nova.servers.list(limit=-1, prefetch=prefetch)
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(servers)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', type=int, nargs='+',
+                        default=[1, 5, 10, 20, 40])
+    parser.add_argument('--page-size', type=int, default=1000)
+    parser.add_argument('--latency', type=float, default=0.05,
+                        help='Artificial latency of each API request.')
+    parser.add_argument('--prefetch', type=int, default=2)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print('%6s %8s %10s %10s %8s' % ('pages', 'servers', 'serial',
+                                     'prefetch', 'speedup'))
+    for pages in args.pages:
+        fake = FakeNova(pages, args.page_size, args.latency)
+        thread = threading.Thread(target=fake.serve_forever)
+        thread.daemon = True
+        thread.start()
+        try:
+            nova = client.Client('2.1', session=ksession.Session(),
+                                 endpoint_override=fake.endpoint)
+            serial, count = _measure(nova, 0, args.repeat)
+            prefetched, _count = _measure(nova, args.prefetch, args.repeat)
+        finally:
+            fake.shutdown()
+            fake.server_close()
+        print('%6d %8d %9.3fs %9.3fs %7.2fx' % (pages, count, serial,
+                                                prefetched,
+                                                serial / prefetched))
+
+
+if __name__ == '__main__':
+    main()
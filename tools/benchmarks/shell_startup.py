@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Benchmark of the argument parsing done by the nova shell on startup.
+
+Measures the time needed to build the subcommand parser and parse the
+arguments of a trivial command, which only builds the subparser of that
+command, and of ``bash-completion``, which builds the subparsers of all the
+commands::
+
+    python tools/benchmarks/shell_startup.py list "show fake-server"
+"""
+
+from __future__ import print_function
+
+import argparse
+import timeit
+
+import novaclient
+from novaclient import api_versions
+from novaclient import shell
+
+
+def _parse(version, argv, do_help):
+    nova_shell = shell.OpenStackComputeShell()
+    nova_shell.extensions = []
+    parser = nova_shell.get_subcommand_parser(version, do_help=do_help,
+                                              argv=argv)
+    return parser.parse_args(argv)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0])
+    parser.add_argument('commands', nargs='*', default=['list'])
+    parser.add_argument('--os-compute-api-version',
+                        default=novaclient.API_MAX_VERSION.get_string())
+    parser.add_argument('--number', type=int, default=20)
+    args = parser.parse_args()
+
+    version = api_versions.APIVersion(args.os_compute_api_version)
+    commands = args.commands + ['bash-completion']
+    for command in commands:
+        argv = command.split()
+        elapsed = min(timeit.repeat(
+            lambda: _parse(version, argv, False),
+            number=args.number, repeat=3)) / args.number
+        print('%-20s %8.1fms' % (command, elapsed * 1000))
+
+
+if __name__ == '__main__':
+    main()
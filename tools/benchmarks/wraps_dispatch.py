@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Micro-benchmark of the dispatch overhead of ``api_versions.wraps``.
+
+Compares the cost per call of a plain method, of a method dispatched by
+``api_versions.wraps`` and of resolving the implementation with
+``get_substitutions`` on every call, as the number of versioned variants of
+the method grows::
+
+    python tools/benchmarks/wraps_dispatch.py --variants 1 3 10
+"""
+
+from __future__ import print_function
+
+import argparse
+import timeit
+
+from novaclient import api_versions
+
+
+def _make_class(variants):
+    namespace = {'api_version': api_versions.APIVersion('2.%d' % variants)}
+
+    def plain(self):
+        return None
+    namespace['plain'] = plain
+
+    for minor in range(1, variants + 1):
+        end_version = '2.%d' % minor if minor < variants else None
+
+        def versioned(self):
+            return None
+        versioned.__name__ = 'versioned'
+        namespace['versioned'] = api_versions.wraps(
+            '2.%d' % minor, end_version)(versioned)
+
+    return type('Manager%d' % variants, (object,), namespace)
+
+
+def _per_call(func, number):
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--variants', type=int, nargs='+',
+                        default=[1, 3, 10, 30])
+    parser.add_argument('--number', type=int, default=100000)
+    args = parser.parse_args()
+
+    print('%8s %10s %10s %12s' % ('variants', 'plain', 'wraps', 'unresolved'))
+    for variants in args.variants:
+        obj = _make_class(variants)()
+        name = obj.versioned.__id__
+
+        def unresolved():
+            methods = api_versions.get_substitutions(name, obj.api_version)
+            return methods[-1].func(obj)
+
+        print('%8d %8.0fns %8.0fns %10.0fns' % (
+            variants,
+            _per_call(obj.plain, args.number),
+            _per_call(obj.versioned, args.number),
+            _per_call(unresolved, args.number)))
+
+
+if __name__ == '__main__':
+    main()